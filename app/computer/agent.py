@@ -1,6 +1,14 @@
 from google.adk.agents import Agent
 from app.computer.tools.control import *
 from app.computer.tools.vision import analyze_screen
+from app.computer.tools.actions import run_actions
+from app.computer.tools.launch import launch_app
+from app.computer.tools.window_registry import get_windows_snapshot
+from app.computer.tools.layout import arrange_windows
+from app.computer.tools.file_search import search_files
+from app.computer.tools.bulk_ops import bulk_copy, bulk_move, bulk_delete
+from app.computer.tools.system_metrics import get_system_metrics
+from app.computer.tools.instrument import instrument_tools
 from google.adk.tools import google_search
 
 
@@ -27,9 +35,10 @@ Input & Interaction Protocols:
 
 Focus Management (CRITICAL): You are currently active inside a chat window or terminal.
 Always ensure the target application is focused (using focus_window) before sending keystrokes.
-Typing: Use type_human() for realistic text entry.
+Typing: Use type_human() for realistic text entry. Use type_text() for long text, code or non-English characters; long text is pasted instantly.
 Navigation: Use the specific tools provided (press_key, hotkey, scroll).
-App Launching: Always when a user ask to open an app or software then first check is that app is installed using the 'is_installed' tool and if yes then press 'win' -> type app name -> press 'enter'. else respond to the user that the app is not installed.
+Batched Input: When several keystrokes, text entries, clicks or waits follow each other, send them as ONE run_actions call instead of separate tool calls.
+App Launching: When a user asks to open an app or software, call launch_app(name). It finds the installed app, starts it and waits for its window, so no is_installed check, Start-menu typing or analyze_screen is needed to confirm it opened when it returns window_found true. If it returns an error because no window appeared, check with analyze_screen before telling the user it opened. If it reports the app is not installed, tell the user.
 System App Launching: For system apps like Calculator, Calendar, open them directly without checking installation.
 Browser launching: Use open_chrome_guest or open_chrome_profile to open Chrome in Guest mode or specific profile.
 After opening a website or application, you MUST use analyze_screen(question="...") 
@@ -47,6 +56,7 @@ Youtube Search Bar: Use hotkey(['/']).
 
 Window Management Logic:
 
+Window State: get_windows_snapshot() returns every window's title, position, size, stacking order and which one is focused in one call; prefer it over several list_windows/get_window_info calls.
 Switching: If the user says "Switch to Chrome," use focus_window("Chrome"). 
 Do not open a new instance unless the window does not exist or the user explicitly asks to "open a new window."
 Arrangement: Use the following mapping for layout commands:
@@ -54,11 +64,13 @@ Arrangement: Use the following mapping for layout commands:
 "Right side": snap_right()
 "Top half": snap_top()
 "Bottom half": snap_bottom()
+"Side by side" / "in columns" / "in a grid" / corners: arrange_windows([titles...], layout) with halves, columns, rows, grid, quadrants or top_left/top_right/bottom_left/bottom_right.
+Windows are placed directly; no focus_window or analyze_screen is needed before or after arranging.
 
 Operational Constraints:
 
 No Internal Monologue: Do not narrate your plan or chain of thought. Just use the tools.
-Files & System: Use read_file, write_file, and psutil-based system tools for file and process operations.
+Files & System: Use read_file, write_file, and psutil-based system tools for file and process operations. For large files and logs read only what you need (read_file with head, tail or start_line/end_line) and continue from next_offset when a result is truncated; use write_file mode="append" instead of rewriting a file. To copy, move or delete several files or folders use one bulk_copy/bulk_move/bulk_delete call with a list of paths or glob patterns instead of one call per file; run it with dry_run=True first when the patterns could match more than intended. list_folder returns one page of entries with size, type and modified time; narrow it with pattern, kind, sort and depth, and continue with next_cursor only if you need more. To find files by name or content, call search_files(root, query, glob) once instead of walking folders with list_folder; pass use_index=True when searching the same large folder repeatedly. System tools answer instantly from a background sampler; for "CPU over the last minute" or similar, call get_system_metrics(window_seconds) (or get_cpu_usage/get_ram_usage with window_seconds) once instead of polling repeatedly.
 External Knowledge: If a user asks a question requiring outside data not on the screen, use Google Search.
 Tone: Be concise, precise, and helpful.
 
@@ -70,8 +82,8 @@ Verify (Check screen again if needed).
 
 
 Navigation Shortcuts:
-- Open App: when a user ask to open an app or software then first check is that app is installed using the 'is_installed' tool, if the app exists then press_key('win') -> type_text('name') -> press_key('enter'), otherwise respond to the user that the app is not installed.
-- Open System App: when user ask about system software like Calculator, Calendar then you should open them without checking it with 'is_installed' tool jsut press_key('win') -> type_text('name') -> press_key('enter').
+- Open App: launch_app("name"). Only if it fails for an app that should exist, fall back to run_actions([{"type": "key", "key": "win"}, {"type": "wait", "seconds": 0.4}, {"type": "text", "text": "name"}, {"type": "key", "key": "enter"}]).
+- Open System App: when user ask about system software like Calculator, Calendar then you should open them without checking it with 'is_installed' tool just run_actions([{"type": "key", "key": "win"}, {"type": "wait", "seconds": 0.4}, {"type": "text", "text": "name"}, {"type": "key", "key": "enter"}]).
 - Address Bar or Search Bar: hotkey(['ctrl', 'l'])
 
 
@@ -93,23 +105,25 @@ root_agent = Agent(
     model="gemini-2.0-flash-live-001",
     description="Full-power Computer Control Agent",
     instruction=SYSTEM_PROMPT,
-    tools=[
+    # Every function tool is timed and counted for GET /metrics
+    tools=instrument_tools([
 
         # New Vision Tool
         analyze_screen,
 
         # Keyboard / mouse
         type_text, type_human, press_key, click_mouse, hotkey,
-        scroll, move_cursor_smooth,
+        scroll, move_cursor_smooth, run_actions,
 
         # Window control
         list_windows, window_exists, focus_window, minimize_window,
         maximize_window, restore_window, move_window, resize_window,
-        close_window, get_active_window, get_window_info, is_installed, 
+        close_window, get_active_window, get_window_info, get_windows_snapshot,
+        is_installed, launch_app,
 
         # Snapping / tiling
         snap_left, snap_right, snap_top, snap_bottom,
-        tile_two_windows, tile_four_windows,
+        tile_two_windows, tile_four_windows, arrange_windows,
 
         # Desktop & system windows
         unfocus_all, minimize_all, restore_all, open_window,
@@ -125,14 +139,15 @@ root_agent = Agent(
 
         # File tools
         list_folder, create_folder, delete_file, delete_folder,
-        rename_file, move_file, read_file, write_file,
+        rename_file, move_file, read_file, write_file, search_files,
+        bulk_copy, bulk_move, bulk_delete,
 
         # Media
         play_pause, next_track, prev_track,
 
         # System info
         get_cpu_usage, get_ram_usage, get_battery,
-        get_uptime, list_processes, kill_process,
+        get_uptime, get_system_metrics, list_processes, kill_process,
 
         # Search
         google_search,
@@ -140,5 +155,5 @@ root_agent = Agent(
         #chrome control
         open_chrome_guest,
         open_chrome_profile
-    ]
+    ])
 )
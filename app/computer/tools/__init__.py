@@ -1,3 +1,20 @@
 # app/computer/tools/__init__.py
-from .control import type_text, press_key, click_mouse, hotkey, scroll
-from .vision import analyze_screen
+# Re-exports are imported on first use: control and vision need the Windows desktop
+# stack (pyautogui, win32gui, pywinauto, pycaw), while the pure-Python modules and
+# their fake backends must import on any OS.
+_EXPORTS = {
+    "type_text": "control",
+    "press_key": "control",
+    "click_mouse": "control",
+    "hotkey": "control",
+    "scroll": "control",
+    "analyze_screen": "vision",
+}
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    return getattr(import_module(f".{module}", __name__), name)
@@ -0,0 +1,153 @@
+# app/computer/tools/actions.py
+import time
+from pydantic import BaseModel
+from .control import press_key, hotkey, type_text, type_human, click_mouse, scroll, focus_window
+
+# Steps run on the shared input-device worker, so a wait holds up input tools for every session
+MAX_WAIT_SECONDS = 2.0
+MAX_TOTAL_WAIT_SECONDS = 4.0
+
+
+def _wait(seconds: float) -> dict:
+    time.sleep(seconds)
+    return {"status": "success", "message": f"Waited {seconds}s"}
+
+
+def _key_list(value) -> list[str]:
+    """A list of key names, or a "ctrl+l" style string split on "+"."""
+    if isinstance(value, str):
+        keys = value.split("+")
+    elif isinstance(value, (list, tuple)):
+        keys = [str(k) for k in value]
+    else:
+        raise ValueError(f"expected a list of key names, got {type(value).__name__}")
+    keys = [k.strip().lower() for k in keys]
+    if not keys or not all(keys):
+        raise ValueError("empty key name")
+    return keys
+
+
+# step type -> (tool, {step field: (tool argument, required, converter)})
+STEP_TYPES = {
+    "key": (press_key, {"key": ("key", True, str)}),
+    "hotkey": (hotkey, {"keys": ("keys", True, _key_list)}),
+    "text": (type_text, {"text": ("text", True, str)}),
+    "human_text": (type_human, {"text": ("text", True, str)}),
+    "click": (click_mouse, {
+        "x": ("x", True, int),
+        "y": ("y", True, int),
+        "button": ("button", False, str),
+    }),
+    "scroll": (scroll, {"amount": ("amount", True, int)}),
+    "wait": (_wait, {"seconds": ("seconds", True, lambda v: min(max(float(v), 0.0), MAX_WAIT_SECONDS))}),
+    "focus": (focus_window, {"title": ("title", True, str)}),
+}
+
+STEP_DEFAULTS = {"click": {"button": "left"}}
+
+
+class ActionStep(BaseModel):
+    """
+    One run_actions step. `type` is key, hotkey, text, human_text, click, scroll,
+    wait or focus; only the fields that type uses are read.
+
+    Declared as a model so the tool's function declaration describes each step's
+    properties; Gemini rejects an array of bare objects.
+    """
+
+    type: str
+    key: str = ""
+    keys: list[str] = []
+    text: str = ""
+    x: int = 0
+    y: int = 0
+    button: str = "left"
+    amount: int = 0
+    seconds: float = 0.0
+    title: str = ""
+
+
+def compile_actions(actions: list[ActionStep | dict]) -> list[tuple[str, object, dict]]:
+    """
+    Validates a step list and turns it into (step type, tool, kwargs) triples.
+
+    Raises:
+        ValueError: naming the first invalid step, before any input is sent.
+    """
+    plan = []
+    for index, step in enumerate(actions):
+        if isinstance(step, BaseModel):
+            # Fields left at their defaults count as missing, like absent keys in a dict
+            step = step.model_dump(exclude_unset=True)
+        if not isinstance(step, dict):
+            raise ValueError(f"Step {index}: expected an object, got {type(step).__name__}")
+        kind = step.get("type")
+        if kind not in STEP_TYPES:
+            raise ValueError(f"Step {index}: unknown type {kind!r} (expected one of {sorted(STEP_TYPES)})")
+        func, fields = STEP_TYPES[kind]
+        kwargs = dict(STEP_DEFAULTS.get(kind, {}))
+        for field, (arg, required, convert) in fields.items():
+            if field not in step:
+                if required:
+                    raise ValueError(f"Step {index} ({kind}): missing '{field}'")
+                continue
+            try:
+                kwargs[arg] = convert(step[field])
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Step {index} ({kind}): invalid '{field}': {e}")
+        plan.append((kind, func, kwargs))
+    total_wait = sum(kwargs["seconds"] for kind, _, kwargs in plan if kind == "wait")
+    if total_wait > MAX_TOTAL_WAIT_SECONDS:
+        raise ValueError(f"Waits add up to {total_wait:g}s; at most {MAX_TOTAL_WAIT_SECONDS:g}s per call")
+    return plan
+
+
+def run_actions(actions: list[ActionStep]) -> dict:
+    """
+    Executes a whole sequence of keyboard / mouse steps in one call, stopping at the first failure.
+    Prefer this over separate press_key / type_text / hotkey / click_mouse calls for multi-step input.
+
+    Args:
+        actions: Ordered list of steps. Each step is an object with a "type" and its fields:
+            {"type": "key", "key": "enter"}
+            {"type": "hotkey", "keys": ["ctrl", "l"]}
+            {"type": "text", "text": "hello"}
+            {"type": "human_text", "text": "hello"}
+            {"type": "click", "x": 100, "y": 200, "button": "left"}
+            {"type": "scroll", "amount": -5}
+            {"type": "wait", "seconds": 0.5}   (at most 2s each and 4s per call)
+            {"type": "focus", "title": "Chrome"}
+            Example (launch an app): [{"type": "key", "key": "win"}, {"type": "wait", "seconds": 0.4},
+                                      {"type": "text", "text": "notepad"}, {"type": "key", "key": "enter"}]
+    """
+    try:
+        plan = compile_actions(actions)
+    except ValueError as e:
+        return {"status": "error", "message": str(e), "completed": 0}
+
+    steps = []
+    started = time.perf_counter()
+    for index, (kind, func, kwargs) in enumerate(plan):
+        step_start = time.perf_counter()
+        try:
+            result = func(**kwargs)
+        except Exception as e:
+            result = {"status": "error", "message": str(e)}
+        elapsed = round((time.perf_counter() - step_start) * 1000, 1)
+        steps.append({"step": index, "type": kind, "status": result.get("status"), "ms": elapsed})
+
+        if result.get("status") == "error":
+            return {
+                "status": "error",
+                "message": f"Step {index} ({kind}) failed: {result.get('message')}",
+                "completed": index,
+                "steps": steps,
+                "total_ms": round((time.perf_counter() - started) * 1000, 1),
+            }
+
+    return {
+        "status": "success",
+        "completed": len(plan),
+        "steps": steps,
+        "total_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
@@ -0,0 +1,291 @@
+# app/computer/tools/app_index.py
+import bisect
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from difflib import SequenceMatcher
+
+# Start Menu trees that hold the shortcuts of installed apps
+DEFAULT_ROOTS = [
+    r"C:\ProgramData\Microsoft\Windows\Start Menu\Programs",
+    os.path.expanduser(r"~\AppData\Roaming\Microsoft\Windows\Start Menu\Programs"),
+]
+APP_EXTENSIONS = (".lnk", ".url", ".appref-ms")
+INDEX_VERSION = 1
+FUZZY_CANDIDATES = 32     # trigram-closest names that get the (slower) edit-distance check
+
+
+def normalize_name(name: str) -> str:
+    """Lowercases and collapses whitespace so "Google  Chrome" and "google chrome" share a key."""
+    return " ".join(name.lower().split())
+
+
+def trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class AppIndex:
+    """
+    Index of installed app shortcuts under a set of root directories.
+
+    The trees are walked once; afterwards only the directories' mtimes are checked
+    (at most every `check_interval` seconds) and just the directories whose mtime
+    changed are listed again, since adding, removing or renaming a shortcut changes
+    its parent directory's mtime. The directory listings are saved to `index_path`
+    so a restarted server only re-lists what changed in between.
+
+    Lookups go through a sorted name list (prefix), a sorted word list (word
+    prefix) and a trigram index (substrings and typos), and return matches ranked
+    by score with the shortcut path.
+
+    Args:
+        roots: Directories to index (missing ones are skipped).
+        index_path: JSON file the listings are persisted to; None disables persistence.
+        extensions: Shortcut file extensions that count as apps.
+        check_interval: Minimum seconds between mtime checks.
+    """
+
+    def __init__(
+        self,
+        roots: list[str],
+        index_path: str | None = None,
+        extensions: tuple = APP_EXTENSIONS,
+        check_interval: float = 2.0,
+    ):
+        self.roots = [os.path.normpath(r) for r in roots]
+        self.index_path = index_path
+        self.extensions = tuple(e.lower() for e in extensions)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._dirs = {}              # dir -> [mtime_ns, app file names, subdirectories]
+        self._checked_at = None
+        self._metrics = {"rebuilds": 0, "dirs_listed": 0, "checks": 0, "loaded_from_disk": False}
+        self._entries = []           # (key, display name, path)
+        self._names = []             # sorted (key, entry id)
+        self._words = []             # sorted (word, entry id)
+        self._grams = {}             # trigram -> set of entry ids
+        self._gram_counts = []       # entry id -> number of trigrams in its key
+        self._load()
+
+    # PERSISTENCE
+
+    def _load(self):
+        if not self.index_path or not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION or data.get("roots") != self.roots:
+                return
+            self._dirs = {path: list(record) for path, record in data["dirs"].items()}
+            self._metrics["loaded_from_disk"] = True
+            self._rebuild_lookup()
+        except (OSError, ValueError, KeyError):
+            self._dirs = {}
+
+    def _save(self):
+        if not self.index_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+            tmp = self.index_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_VERSION, "roots": self.roots, "dirs": self._dirs}, f)
+            os.replace(tmp, self.index_path)
+        except OSError:
+            pass
+
+    # REFRESH
+
+    def _list_dir(self, path: str, mtime_ns: int) -> list:
+        files, subdirs = [], []
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.name.lower().endswith(self.extensions):
+                        files.append(entry.name)
+                except OSError:
+                    continue
+        self._metrics["dirs_listed"] += 1
+        return [mtime_ns, sorted(files), sorted(subdirs)]
+
+    def _sync(self, path: str, seen: set) -> bool:
+        """Re-lists `path` if its mtime changed, then its subdirectories; returns whether anything changed."""
+        seen.add(path)
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return self._dirs.pop(path, None) is not None
+
+        record = self._dirs.get(path)
+        changed = False
+        if record is None or record[0] != mtime_ns:
+            try:
+                record = self._list_dir(path, mtime_ns)
+            except OSError:
+                return self._dirs.pop(path, None) is not None
+            self._dirs[path] = record
+            changed = True
+        for subdir in record[2]:
+            changed |= self._sync(subdir, seen)
+        return changed
+
+    def refresh(self, force: bool = False) -> bool:
+        """Brings the index up to date; returns True if the set of shortcuts changed."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._checked_at is not None and now - self._checked_at < self.check_interval:
+                return False
+            self._checked_at = now
+            self._metrics["checks"] += 1
+
+            seen = set()
+            changed = False
+            for root in self.roots:
+                changed |= self._sync(root, seen)
+            # Directories that were removed or moved out of a root
+            for path in [p for p in self._dirs if p not in seen]:
+                del self._dirs[path]
+                changed = True
+
+            if changed or not self._entries and self._dirs:
+                self._rebuild_lookup()
+                self._save()
+            return changed
+
+    def _rebuild_lookup(self):
+        entries, keys = [], set()
+        for root in self.roots:
+            for path in sorted(p for p in self._dirs if p == root or p.startswith(root + os.sep)):
+                for name in self._dirs[path][1]:
+                    display = os.path.splitext(name)[0]
+                    key = normalize_name(display)
+                    if key in keys:
+                        continue
+                    keys.add(key)
+                    entries.append((key, display, os.path.join(path, name)))
+
+        names, words, grams, gram_counts = [], [], {}, []
+        for entry_id, (key, _, _) in enumerate(entries):
+            names.append((key, entry_id))
+            for word in set(re.split(r"[\s\-_.]+", key)):
+                if word:
+                    words.append((word, entry_id))
+            key_grams = trigrams(key)
+            gram_counts.append(len(key_grams))
+            for gram in key_grams:
+                grams.setdefault(gram, set()).add(entry_id)
+        names.sort()
+        words.sort()
+
+        # Swap in whole structures so concurrent lookups see a consistent index
+        self._entries, self._names, self._words = entries, names, words
+        self._grams, self._gram_counts = grams, gram_counts
+        self._metrics["rebuilds"] += 1
+
+    # LOOKUP
+
+    @staticmethod
+    def _prefixed(sorted_pairs: list, prefix: str) -> set:
+        ids = set()
+        i = bisect.bisect_left(sorted_pairs, (prefix, -1))
+        while i < len(sorted_pairs) and sorted_pairs[i][0].startswith(prefix):
+            ids.add(sorted_pairs[i][1])
+            i += 1
+        return ids
+
+    @staticmethod
+    def _exact_score(query: str, key: str) -> float | None:
+        if key == query:
+            return 1.0
+        coverage = len(query) / len(key)
+        if key.startswith(query):
+            return 0.9 + 0.09 * coverage
+        if f" {query}" in f" {key}":
+            return 0.8 + 0.09 * coverage
+        if query in key:
+            return 0.7 + 0.09 * coverage
+        return None
+
+    def search(self, query: str, limit: int = 5, min_score: float = 0.45) -> list[dict]:
+        """Ranked shortcuts matching `query`: [{"name", "path", "score"}], best first."""
+        self.refresh()
+        query = normalize_name(os.path.splitext(query)[0] if query.lower().endswith(self.extensions) else query)
+        if not query:
+            return []
+        entries, grams, gram_counts = self._entries, self._grams, self._gram_counts
+
+        # Prefix and word-prefix hits, then names sharing trigrams with the query
+        scores = {}
+        for entry_id in self._prefixed(self._names, query) | self._prefixed(self._words, query):
+            scores[entry_id] = self._exact_score(query, entries[entry_id][0])
+        query_grams = trigrams(query)
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(grams.get(gram, ()))
+
+        fuzzy = []
+        for entry_id, count in shared.items():
+            if entry_id in scores:
+                continue
+            score = self._exact_score(query, entries[entry_id][0])
+            if score is not None:
+                scores[entry_id] = score
+            else:
+                fuzzy.append((2 * count / (len(query_grams) + gram_counts[entry_id]), entry_id))
+
+        # Typos: trigram similarity, refined by edit-distance ratio for the closest few
+        fuzzy.sort(reverse=True)
+        for dice, entry_id in fuzzy[:FUZZY_CANDIDATES]:
+            ratio = SequenceMatcher(None, query, entries[entry_id][0]).ratio()
+            scores[entry_id] = 0.75 * max(dice, ratio)
+
+        ranked = sorted(
+            ((score, entries[entry_id][1], entries[entry_id][2]) for entry_id, score in scores.items() if score >= min_score),
+            key=lambda item: (-item[0], len(item[1])),
+        )
+        return [{"name": display, "path": path, "score": round(score, 3)} for score, display, path in ranked[:limit]]
+
+    def names(self) -> list[str]:
+        self.refresh()
+        return [key for key, _, _ in self._entries]
+
+    def stats(self) -> dict:
+        return {"apps": len(self._entries), "dirs": len(self._dirs), **self._metrics}
+
+
+def roots_from_env() -> list[str]:
+    """APP_INDEX_ROOTS (os.pathsep separated) or the Windows Start Menu trees."""
+    configured = os.environ.get("APP_INDEX_ROOTS", "")
+    return [r for r in configured.split(os.pathsep) if r] or DEFAULT_ROOTS
+
+
+def default_index_path() -> str | None:
+    """APP_INDEX_FILE; empty disables persistence. Defaults to the user's local app data."""
+    configured = os.environ.get("APP_INDEX_FILE")
+    if configured is not None:
+        return configured or None
+    base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "computer-use-agent", "app_index.json")
+
+
+_app_index = None
+_app_index_lock = threading.Lock()
+
+
+def get_app_index() -> AppIndex:
+    global _app_index
+    with _app_index_lock:
+        if _app_index is None:
+            _app_index = AppIndex(
+                roots_from_env(),
+                index_path=default_index_path(),
+                check_interval=float(os.environ.get("APP_INDEX_CHECK_INTERVAL", "2.0")),
+            )
+        return _app_index
@@ -0,0 +1,332 @@
+# app/computer/tools/bulk_ops.py
+import glob
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+logger = logging.getLogger(__name__)
+
+BULK_WORKERS = int(os.environ.get("BULK_WORKERS", "4"))
+MAX_REPORTED = 50
+
+COPY, MOVE, DELETE = "copy", "move", "delete"
+
+
+class Item:
+    """One planned operation; `method` says how it will be (or was) carried out."""
+
+    __slots__ = ("op", "src", "dst", "method", "error", "bytes")
+
+    def __init__(self, op: str, src: str, dst: str | None = None):
+        self.op = op
+        self.src = src
+        self.dst = dst
+        self.method = None
+        self.error = None
+        self.bytes = 0
+
+    def to_dict(self) -> dict:
+        result = {"op": self.op, "src": self.src}
+        if self.dst is not None:
+            result["dst"] = self.dst
+        if self.method:
+            result["method"] = self.method
+        if self.error:
+            result["error"] = self.error
+        return result
+
+
+# PLANNING
+
+def _base_dir(pattern: str) -> str:
+    """The folder a glob pattern starts from: its path before the first wildcard component."""
+    base = pattern
+    while glob.has_magic(base):
+        base = os.path.dirname(base)
+    return base or os.curdir
+
+
+def expand(sources: list[str]) -> list[str]:
+    """
+    Paths for a list of paths and glob patterns ("**" matches any depth), with
+    paths inside another selected folder dropped since that folder covers them.
+    """
+    paths = []
+    for source in sources:
+        if glob.has_magic(source):
+            # "dir/**" also matches "dir/" itself, which would select the folder instead of its contents
+            base = os.path.normcase(os.path.abspath(_base_dir(source)))
+            paths.extend(p for p in glob.glob(source, recursive=True) if os.path.normcase(os.path.abspath(p)) != base)
+        else:
+            paths.append(source)
+    # Keyed by normcase so the same path in different case (Windows) is one item
+    unique = {}
+    for path in map(os.path.abspath, paths):
+        unique.setdefault(os.path.normcase(path), path)
+    kept, kept_keys = [], set()
+    # Sorted, a folder comes before everything inside it, though not always right before
+    for key in sorted(unique):
+        if any(ancestor in kept_keys for ancestor in _ancestors(key)):
+            continue
+        kept_keys.add(key)
+        kept.append(unique[key])
+    return kept
+
+
+def _ancestors(path: str):
+    parent = os.path.dirname(path)
+    while parent != path:
+        yield parent
+        path, parent = parent, os.path.dirname(parent)
+
+
+def _is_within(path: str, folder: str) -> bool:
+    """Whether `path` is `folder` or inside it, ignoring case where the OS does."""
+    path, folder = os.path.normcase(path), os.path.normcase(folder)
+    try:
+        return os.path.commonpath([path, folder]) == folder
+    except ValueError:
+        # Different drives
+        return False
+
+
+def _same_device(src: str, dst_dir: str) -> bool:
+    try:
+        return os.stat(src).st_dev == os.stat(dst_dir).st_dev
+    except OSError:
+        return False
+
+
+def _size(path: str) -> int:
+    if not os.path.isdir(path) or os.path.islink(path):
+        return os.path.getsize(path)
+    total = 0
+    for dirpath, _, names in os.walk(path):
+        for name in names:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, name))
+            except OSError:
+                pass
+    return total
+
+
+def plan(op: str, sources: list[str], destination: str = "", overwrite: bool = False) -> list[Item]:
+    """
+    Resolves sources into items and decides each item's method without touching
+    anything. Items that cannot run (missing source, existing target without
+    overwrite, two sources with the same name, a folder into itself, a target that
+    is, holds or sits inside another source) carry an error.
+    """
+    if op not in (COPY, MOVE, DELETE):
+        raise ValueError(f"Unknown operation '{op}'. Use copy, move or delete")
+    if op != DELETE and not destination:
+        raise ValueError(f"{op} needs a destination folder")
+    if destination and os.path.exists(destination) and not os.path.isdir(destination):
+        raise NotADirectoryError(f"Destination is not a folder: {destination}")
+
+    destination = os.path.abspath(destination) if destination else ""
+    # Device of the nearest existing ancestor, since the destination may not exist yet
+    anchor = destination
+    while anchor and not os.path.exists(anchor):
+        anchor = os.path.dirname(anchor)
+
+    items, targets = [], set()
+    for src in expand(sources):
+        item = Item(op, src, os.path.join(destination, os.path.basename(src)) if op != DELETE else None)
+        items.append(item)
+        if not os.path.lexists(src):
+            item.error = "Source does not exist"
+        elif op == DELETE:
+            item.method = "rmtree" if os.path.isdir(src) and not os.path.islink(src) else "remove"
+        elif os.path.normcase(item.dst) == os.path.normcase(src):
+            item.error = "Source is already in the destination folder"
+        elif _is_within(destination, src):
+            item.error = "Cannot copy or move a folder into itself"
+        elif os.path.normcase(item.dst) in targets:
+            item.error = "Another source has the same name"
+        elif os.path.lexists(item.dst) and not overwrite:
+            item.error = "Target exists (pass overwrite=True to replace it)"
+        else:
+            targets.add(os.path.normcase(item.dst))
+            if op == MOVE and _same_device(src, anchor):
+                item.method = "rename"
+            else:
+                item.method = "copytree" if os.path.isdir(src) and not os.path.islink(src) else "copy"
+                if op == MOVE:
+                    item.method += "+delete"
+    if op != DELETE:
+        _reject_overlaps(items)
+    return items
+
+
+def _reject_overlaps(items: list[Item]):
+    """
+    Errors items whose target is or holds another item's source (replacing it would
+    destroy that source) or sits inside a source that is itself being moved or copied.
+    """
+    runnable = [item for item in items if item.error is None]
+    sources = {os.path.normcase(item.src) for item in items}
+    moving = {os.path.normcase(item.src) for item in runnable}
+    by_target = {os.path.normcase(item.dst): item for item in runnable}
+    overlapping = set()
+    for source in sources:
+        for key in (source, *_ancestors(source)):
+            item = by_target.get(key)
+            if item is not None and os.path.normcase(item.src) != source:
+                overlapping.add(id(item))
+    for item in runnable:
+        if id(item) in overlapping or any(key in moving for key in _ancestors(os.path.normcase(item.dst))):
+            item.error = "Target overlaps another source"
+            item.method = None
+
+
+# EXECUTION
+
+def _remove(path: str):
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    else:
+        os.remove(path)
+
+
+def _run_item(item: Item, overwrite: bool):
+    if item.method in ("remove", "rmtree"):
+        item.bytes = _size(item.src)
+        _remove(item.src)
+        return
+    if overwrite and os.path.lexists(item.dst) and item.method != "rename":
+        _remove(item.dst)
+    if item.method == "rename":
+        # os.replace overwrites a file but fails on a non-empty folder, which is then removed first
+        if overwrite and os.path.isdir(item.dst) and not os.path.islink(item.dst):
+            shutil.rmtree(item.dst)
+        item.bytes = _size(item.src)
+        os.replace(item.src, item.dst)
+        return
+    if item.method.startswith("copytree"):
+        shutil.copytree(item.src, item.dst, symlinks=True)
+    else:
+        shutil.copy2(item.src, item.dst, follow_symlinks=False)
+    item.bytes = _size(item.dst)
+    if item.method.endswith("+delete"):
+        _remove(item.src)
+
+
+def execute(items: list[Item], destination: str = "", overwrite: bool = False, workers: int = BULK_WORKERS, progress=None) -> list[Item]:
+    """
+    Runs the items without errors on a pool of `workers` threads; failures are
+    recorded on the item. `progress(done, total)` is called after each item.
+    """
+    runnable = [item for item in items if item.error is None]
+    if destination and runnable:
+        os.makedirs(destination, exist_ok=True)
+
+    def run(item: Item) -> Item:
+        try:
+            _run_item(item, overwrite)
+        except Exception as e:
+            item.error = str(e)
+        return item
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="bulk-ops") as pool:
+        for done, _ in enumerate(as_completed([pool.submit(run, item) for item in runnable]), start=1):
+            if progress is not None:
+                progress(done, len(runnable))
+    return items
+
+
+def summarize(items: list[Item], dry_run: bool, elapsed: float) -> dict:
+    failed = [item for item in items if item.error]
+    methods = {}
+    for item in items:
+        if not item.error:
+            methods[item.method] = methods.get(item.method, 0) + 1
+    result = {
+        "dry_run": dry_run,
+        "planned": len(items),
+        "succeeded": 0 if dry_run else len(items) - len(failed),
+        "failed": len(failed),
+        "methods": methods,
+        "bytes": sum(item.bytes for item in items),
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "errors": [item.to_dict() for item in failed[:MAX_REPORTED]],
+    }
+    if dry_run:
+        result["items"] = [item.to_dict() for item in items[:MAX_REPORTED]]
+    if len(failed) > MAX_REPORTED or (dry_run and len(items) > MAX_REPORTED):
+        result["truncated"] = True
+    return result
+
+
+def bulk(op: str, sources: list[str], destination: str = "", overwrite: bool = False, dry_run: bool = False, workers: int = BULK_WORKERS) -> dict:
+    start = time.perf_counter()
+    items = plan(op, sources, destination, overwrite)
+    if not dry_run:
+        step = max(1, len(items) // 10)
+
+        def progress(done: int, total: int):
+            if done % step == 0 or done == total:
+                logger.info("bulk %s: %d/%d", op, done, total)
+
+        execute(items, destination, overwrite, workers, progress)
+    return summarize(items, dry_run, time.perf_counter() - start)
+
+
+# TOOLS
+
+def bulk_copy(sources: list[str], destination: str, overwrite: bool = False, dry_run: bool = False) -> dict:
+    """
+    Copies many files or folders into one folder in a single call.
+
+    Args:
+        sources: Paths and/or glob patterns, e.g. ["C:/Downloads/*.pdf", "C:/notes.txt"]; "**" matches any depth.
+        destination: Folder to copy into (created if missing).
+        overwrite: Replace items that already exist in the destination.
+        dry_run: Only report what would be done.
+
+    Returns:
+        Counts of planned, succeeded and failed items, the methods used, and per-item errors.
+    """
+    try:
+        return {"status": "success", **bulk(COPY, sources, destination, overwrite, dry_run)}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
+def bulk_move(sources: list[str], destination: str, overwrite: bool = False, dry_run: bool = False) -> dict:
+    """
+    Moves many files or folders into one folder in a single call. Moves on the same
+    drive are renames; across drives items are copied and then deleted.
+
+    Args:
+        sources: Paths and/or glob patterns; "**" matches any depth.
+        destination: Folder to move into (created if missing).
+        overwrite: Replace items that already exist in the destination.
+        dry_run: Only report what would be done.
+
+    Returns:
+        Counts of planned, succeeded and failed items, the methods used, and per-item errors.
+    """
+    try:
+        return {"status": "success", **bulk(MOVE, sources, destination, overwrite, dry_run)}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
+def bulk_delete(sources: list[str], dry_run: bool = False) -> dict:
+    """
+    Deletes many files or folders (folders with their contents) in a single call.
+
+    Args:
+        sources: Paths and/or glob patterns; "**" matches any depth.
+        dry_run: Only report what would be deleted.
+
+    Returns:
+        Counts of planned, succeeded and failed items and per-item errors.
+    """
+    try:
+        return {"status": "success", **bulk(DELETE, sources, dry_run=dry_run)}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
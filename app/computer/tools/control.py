@@ -15,26 +15,45 @@ from ctypes import cast, POINTER
 from comtypes import CLSCTX_ALL
 from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
 import ctypes
+from .app_index import get_app_index
+from .window_registry import get_window_registry
+from .layout import arrange
+from .text_entry import get_text_entry, HUMAN_TYPING_BUDGET
+from .file_io import read_range, write_range, READ_LIMIT
+from .listing import get_directory_lister, LIST_PAGE_SIZE
+from .system_metrics import get_metrics_sampler
 
 pyautogui.FAILSAFE = True
 
 # KEYBOARD / MOUSE BASICS
 
-def type_text(text: str) -> dict:
+def type_text(text: str, mode: str = "auto") -> dict:
+    """
+    Types text into the focused window.
+
+    Args:
+        text: Text to type; any Unicode characters are supported.
+        mode: "auto" (default) pastes long text via the clipboard and types short text
+              as key events; "paste" or "keys" force one of them.
+    """
     try:
-        pyautogui.typewrite(text)
-        return {"status": "success", "message": f"Typed: {text}"}
+        result = get_text_entry().enter(text, mode=mode)
+        return {"status": "success", "message": f"Typed: {text}", **result}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 
-def type_human(text: str) -> dict:
+def type_human(text: str, max_seconds: float = HUMAN_TYPING_BUDGET) -> dict:
+    """
+    Types text with human-like bursts and pauses.
+
+    Args:
+        text: Text to type.
+        max_seconds: Total time budget for the whole text.
+    """
     try:
-        import random
-        for c in text:
-            pyautogui.typewrite(c)
-            time.sleep(random.uniform(0.03, 0.12))
-        return {"status": "success", "message": "Typed like a human"}
+        result = get_text_entry().enter(text, mode="human", budget=max_seconds)
+        return {"status": "success", "message": "Typed like a human", **result}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -87,7 +106,7 @@ def move_cursor_smooth(x: int, y: int, steps: int = 50) -> dict:
 
 def list_windows() -> dict:
     try:
-        titles = [w.title for w in gw.getAllWindows() if w.title.strip()]
+        titles = [w.title for w in get_window_registry().snapshot()]
         return {"status": "success", "windows": titles}
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -95,22 +114,26 @@ def list_windows() -> dict:
 
 def window_exists(title: str) -> dict:
     try:
-        return {"status": "success", "exists": len(gw.getWindowsWithTitle(title)) > 0}
+        return {"status": "success", "exists": get_window_registry().exists(title)}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 
 def _get_window(title: str):
-    wins = gw.getWindowsWithTitle(title)
-    if not wins:
-        raise Exception(f"No window matches '{title}'")
-    return wins[0]
+    # One cached enumeration serves every lookup; raises if nothing matches.
+    # Substring matching only, as with pygetwindow: these windows get closed, moved and resized
+    return gw.Win32Window(get_window_registry().find(title, fuzzy=False).handle)
+
+
+def _window_changed():
+    get_window_registry().invalidate()
 
 
 def focus_window(title: str) -> dict:
     try:
         win = _get_window(title)
         win.activate()
+        _window_changed()
         time.sleep(0.2)
         return {"status": "success", "message": f"Focused {win.title}"}
     except Exception as e:
@@ -121,6 +144,7 @@ def minimize_window(title: str):
     try:
         win = _get_window(title)
         win.minimize()
+        _window_changed()
         return {"status": "success", "message": f"Minimized {title}"}
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -130,6 +154,7 @@ def maximize_window(title: str):
     try:
         win = _get_window(title)
         win.maximize()
+        _window_changed()
         return {"status": "success", "message": f"Maximized {title}"}
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -139,6 +164,7 @@ def restore_window(title: str):
     try:
         win = _get_window(title)
         win.restore()
+        _window_changed()
         return {"status": "success", "message": f"Restored {title}"}
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -148,6 +174,7 @@ def move_window(title: str, x: int, y: int):
     try:
         win = _get_window(title)
         win.moveTo(x, y)
+        _window_changed()
         return {"status": "success", "message": f"Moved {title}"}
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -157,6 +184,7 @@ def resize_window(title: str, width: int, height: int):
     try:
         win = _get_window(title)
         win.resizeTo(width, height)
+        _window_changed()
         return {"status": "success", "message": f"Resized {title}"}
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -168,6 +196,7 @@ def close_window(title: str):
         hwnd = win._hWnd
         app = Application().connect(handle=hwnd)
         app.window(handle=hwnd).close()
+        _window_changed()
         return {"status": "success", "message": f"Closed {title}"}
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -182,59 +211,49 @@ def open_window(path: str):
 
 
 # Snap layout
+# Windows are placed by geometry in one batched move/resize, without focusing
+# them or sending Win+arrow hotkeys.
 
-def snap_left(title: str):
+def _snap(title: str, layout: str, message: str) -> dict:
     try:
-        focus_window(title)
-        pyautogui.hotkey('win', 'left')
-        return {"status": "success", "message": "Snapped left"}
+        result = arrange([title], layout)
+        result["message"] = message
+        return result
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 
+def snap_left(title: str):
+    return _snap(title, "left", "Snapped left")
+
+
 def snap_right(title: str):
-    try:
-        focus_window(title)
-        pyautogui.hotkey('win', 'right')
-        return {"status": "success", "message": "Snapped right"}
-    except Exception as e:
-        return {"status": "error", "message": str(e)}
+    return _snap(title, "right", "Snapped right")
 
 
 def snap_top(title: str):
-    try:
-        focus_window(title)
-        pyautogui.hotkey('win', 'up')
-        return {"status": "success", "message": "Snapped top"}
-    except Exception as e:
-        return {"status": "error", "message": str(e)}
+    return _snap(title, "top", "Snapped top")
 
 
 def snap_bottom(title: str):
-    try:
-        focus_window(title)
-        pyautogui.hotkey('win', 'down')
-        return {"status": "success", "message": "Snapped bottom"}
-    except Exception as e:
-        return {"status": "error", "message": str(e)}
-    
+    return _snap(title, "bottom", "Snapped bottom")
+
+
 def tile_two_windows(left_title: str, right_title: str) -> dict:
     try:
-        snap_left(left_title)
-        time.sleep(0.2)
-        snap_right(right_title)
-        return {"status": "success", "message": "Tiled two windows"}
+        result = arrange([left_title, right_title], "halves")
+        result["message"] = "Tiled two windows"
+        return result
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 
 def tile_four_windows(a: str, b: str, c: str, d: str) -> dict:
     try:
-        snap_left(a); pyautogui.hotkey('win', 'up')
-        snap_left(b); pyautogui.hotkey('win', 'down')
-        snap_right(c); pyautogui.hotkey('win', 'up')
-        snap_right(d); pyautogui.hotkey('win', 'down')
-        return {"status": "success", "message": "Tiled four windows"}
+        # a, b on the left (top, bottom); c, d on the right (top, bottom)
+        result = arrange([a, c, b, d], "quadrants")
+        result["message"] = "Tiled four windows"
+        return result
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -275,13 +294,18 @@ def get_active_window():
 
 def get_window_info(title: str):
     try:
-        win = _get_window(title)
+        win = get_window_registry().find(title)
         return {
             "status": "success",
-            "x": win.left,
-            "y": win.top,
+            "title": win.title,
+            "handle": win.handle,
+            "x": win.x,
+            "y": win.y,
             "width": win.width,
             "height": win.height,
+            "minimized": win.minimized,
+            "maximized": win.maximized,
+            "focused": win.focused,
         }
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -414,9 +438,38 @@ def paste_text():
 
 # FILE SYSTEM
 
-def list_folder(path: str):
-    try:
-        return {"status": "success", "items": os.listdir(path)}
+def list_folder(
+    path: str,
+    depth: int = 0,
+    pattern: str = "*",
+    kind: str = "all",
+    include_hidden: bool = True,
+    sort: str = "name",
+    descending: bool = False,
+    limit: int = LIST_PAGE_SIZE,
+    cursor: str = "",
+):
+    """
+    Lists a folder's files and subfolders with their type, size and modification time.
+
+    Args:
+        path: Folder path.
+        depth: Levels of subfolders to include (0 = only this folder).
+        pattern: File name pattern such as "*.pdf" (default: everything).
+        kind: all, file or dir.
+        include_hidden: Include hidden and dot files.
+        sort: name, size, modified or type.
+        descending: Reverse the order (e.g. newest or largest first).
+        limit: Most entries returned in one page (1 to LIST_PAGE_MAX).
+        cursor: next_cursor from the previous page, to continue the listing.
+
+    Returns:
+        entries (path relative to the folder, type, size, modified), total matching,
+        and next_cursor when more pages follow.
+    """
+    try:
+        result = get_directory_lister().list(path, depth, pattern, kind, include_hidden, sort, descending, limit, cursor)
+        return {"status": "success", **result}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -461,19 +514,52 @@ def move_file(src: str, dst: str):
         return {"status": "error", "message": str(e)}
 
 
-def read_file(path: str):
+def read_file(
+    path: str,
+    head: int = 0,
+    tail: int = 0,
+    start_line: int = 0,
+    end_line: int = 0,
+    offset: int = 0,
+    length: int = -1,
+    max_bytes: int = READ_LIMIT,
+):
+    """
+    Reads a text file, or only part of it, without loading the whole file.
+
+    Args:
+        path: File path.
+        head: Return only the first N lines.
+        tail: Return only the last N lines (e.g. the end of a log).
+        start_line: First line to return (1-based); with end_line (inclusive, 0 = to the end).
+        offset: Byte offset to start at (e.g. a previous result's next_offset).
+        length: Bytes to read from offset (-1 = to the end).
+        max_bytes: Most bytes returned; larger selections come back truncated.
+
+    Returns:
+        content, the file size, the byte range returned, truncated and next_offset.
+    """
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return {"status": "success", "content": f.read()}
+        result = read_range(path, offset, length, start_line, end_line, head, tail, max_bytes)
+        return {"status": "success", **result}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 
-def write_file(path: str, content: str):
+def write_file(path: str, content: str, mode: str = "overwrite", offset: int = -1, length: int = -1):
+    """
+    Writes text to a file.
+
+    Args:
+        path: File path.
+        content: Text to write.
+        mode: "overwrite" (default) replaces the file, "append" adds to its end, "patch"
+              replaces `length` bytes at byte `offset` (length -1 = same size as content).
+              overwrite and append write the system line ending (CRLF on Windows); patch writes content as-is.
+    """
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(content)
-        return {"status": "success", "message": "File written"}
+        result = write_range(path, content, mode, offset, length)
+        return {"status": "success", "message": "File written", **result}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -506,28 +592,61 @@ def prev_track():
 
 # SYSTEM INFO
 
-def get_cpu_usage():
+def get_cpu_usage(window_seconds: int = 0):
+    """
+    CPU usage from the background metrics sampler (answers instantly).
+
+    Args:
+        window_seconds: Also return average, min, max and trend over this many recent seconds.
+    """
     try:
-        return {"status": "success", "cpu": psutil.cpu_percent(interval=1)}
+        sampler = get_metrics_sampler()
+        latest = sampler.latest()
+        result = {"status": "success", "cpu": latest["cpu"], "per_core": latest["cpu_per_core"], "age": latest["age"]}
+        if window_seconds > 0:
+            result["window"] = sampler.summary(window_seconds, ("cpu",))
+        return result
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 
-def get_ram_usage():
+def get_ram_usage(window_seconds: int = 0):
+    """
+    Memory usage from the background metrics sampler.
+
+    Args:
+        window_seconds: Also return average, min, max and trend over this many recent seconds.
+    """
     try:
-        ram = psutil.virtual_memory()
-        return {"status": "success", "ram_percent": ram.percent}
+        sampler = get_metrics_sampler()
+        latest = sampler.latest()
+        result = {
+            "status": "success",
+            "ram_percent": latest["memory_percent"],
+            "used_gb": round(latest["memory_used"] / 1024 ** 3, 2),
+            "total_gb": round(latest["memory_total"] / 1024 ** 3, 2),
+        }
+        if window_seconds > 0:
+            result["window"] = sampler.summary(window_seconds, ("memory_percent",))
+        return result
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 
 def get_battery():
     try:
-        batt = psutil.sensors_battery()
+        sampler = get_metrics_sampler()
+        latest = sampler.latest()
+        if latest["battery_percent"] is None:
+            return {"status": "error", "message": "No battery found"}
+        # Change per minute over the last 5 minutes, when the sampler has that much history
+        trend = sampler.summary(300, ("battery_percent",)).get("battery_percent", {}).get("trend_per_min")
         return {
             "status": "success",
-            "percent": batt.percent,
-            "plugged": batt.power_plugged,
+            "percent": latest["battery_percent"],
+            "plugged": latest["battery_plugged"],
+            "secs_left": latest["battery_secs_left"],
+            "trend_per_min": trend,
         }
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -535,7 +654,7 @@ def get_battery():
 
 def get_uptime():
     try:
-        return {"status": "success", "uptime_seconds": time.time() - psutil.boot_time()}
+        return {"status": "success", "uptime_seconds": time.time() - get_metrics_sampler().boot_time()}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -562,31 +681,30 @@ def kill_process(name: str):
 
 def list_installed_apps():
     try:
-        paths = [
-            r"C:\ProgramData\Microsoft\Windows\Start Menu\Programs",
-            os.path.expanduser(r"~\AppData\Roaming\Microsoft\Windows\Start Menu\Programs"),
-        ]
-
-        apps = set()
-
-        for path in paths:
-            if os.path.exists(path):
-                for root, dirs, files in os.walk(path):
-                    for f in files:
-                        if f.endswith(".lnk"):
-                            apps.add(os.path.splitext(f)[0].lower())
-
-        return {"status": "success", "apps": list(apps)}
+        return {"status": "success", "apps": get_app_index().names()}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 
 def is_installed(app_name: str):
+    """
+    Checks whether an app is installed using the Start Menu shortcut index.
+
+    Args:
+        app_name: App name; partial names and small typos are matched.
+
+    Returns:
+        installed flag, the best match's shortcut path and up to 5 ranked matches.
+    """
     try:
-        installed = list_installed_apps()["apps"]
-        app_name = app_name.lower()
-        exists = any(app_name in a for a in installed)
-        return {"status": "success", "installed": exists}
+        matches = get_app_index().search(app_name, limit=5)
+        exists = bool(matches) and matches[0]["score"] >= 0.65
+        return {
+            "status": "success",
+            "installed": exists,
+            "path": matches[0]["path"] if exists else None,
+            "matches": matches,
+        }
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -0,0 +1,186 @@
+# app/computer/tools/file_io.py
+import mmap
+import os
+import shutil
+import tempfile
+
+READ_LIMIT = int(os.environ.get("FILE_READ_LIMIT", str(64 * 1024)))
+READ_MAX = int(os.environ.get("FILE_READ_MAX", str(1024 * 1024)))
+BLOCK_SIZE = 1 << 20
+
+
+class _Source:
+    """A file opened for ranged reads: memory-mapped, or a plain handle for empty files."""
+
+    def __init__(self, path: str):
+        self.file = open(path, "rb")
+        self.size = os.fstat(self.file.fileno()).st_size
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self.map is not None:
+            self.map.close()
+        self.file.close()
+
+    def read(self, start: int, end: int) -> bytes:
+        return self.map[start:end] if self.map is not None else b""
+
+    def forward_lines(self, start: int, count: int) -> int:
+        """Offset just past the `count`-th newline after `start` (or the file size)."""
+        mm, pos = self.map, start
+        while count > 0 and pos < self.size:
+            end = min(pos + BLOCK_SIZE, self.size)
+            found = mm[pos:end].count(b"\n")
+            if found < count:
+                count -= found
+                pos = end
+                continue
+            for _ in range(count):
+                pos = mm.find(b"\n", pos, end) + 1
+            count = 0
+        return min(pos, self.size)
+
+    def backward_lines(self, count: int) -> int:
+        """Offset of the start of the last `count` lines."""
+        mm = self.map
+        if mm is None:
+            return 0
+        # A trailing newline ends the last line rather than starting an empty one
+        pos = self.size - 1 if mm[self.size - 1:self.size] == b"\n" else self.size
+        for _ in range(count):
+            newline = mm.rfind(b"\n", 0, pos)
+            if newline < 0:
+                return 0
+            pos = newline
+        return pos + 1
+
+
+def _trim_partial_char(data: bytes) -> bytes:
+    """Drops a UTF-8 character cut in half at the end of a truncated read."""
+    i = len(data) - 1
+    while i >= 0 and len(data) - i < 4 and data[i] & 0xC0 == 0x80:
+        i -= 1
+    if i < 0 or data[i] < 0x80:
+        return data
+    lead = data[i]
+    needed = 2 if lead < 0xE0 else 3 if lead < 0xF0 else 4
+    return data if i + needed <= len(data) else data[:i]
+
+
+def read_range(
+    path: str,
+    offset: int = 0,
+    length: int = -1,
+    start_line: int = 0,
+    end_line: int = 0,
+    head: int = 0,
+    tail: int = 0,
+    max_bytes: int = READ_LIMIT,
+) -> dict:
+    """
+    Reads part of a file without loading the rest of it.
+
+    Exactly one selection applies, in this order: head (first N lines), tail
+    (last N lines), start_line/end_line (1-based, inclusive; end_line 0 means
+    to the end), else the byte range offset/length (-1 means to the end). At most
+    `max_bytes` (capped at FILE_READ_MAX) are returned; `truncated` and
+    `next_offset` say where to continue.
+    """
+    max_bytes = max(1, min(max_bytes, READ_MAX))
+    with _Source(path) as source:
+        size = source.size
+        result = {"size": size}
+        if head > 0:
+            start, end = 0, source.forward_lines(0, head)
+            result["lines"] = [1, head]
+        elif tail > 0:
+            start, end = source.backward_lines(tail), size
+            result["lines_from_end"] = tail
+        elif start_line > 0:
+            start = source.forward_lines(0, start_line - 1)
+            end = source.forward_lines(start, end_line - start_line + 1) if end_line >= start_line else size
+            result["lines"] = [start_line, end_line if end_line >= start_line else None]
+        else:
+            start = min(max(offset, 0), size)
+            end = size if length < 0 else min(size, start + length)
+
+        truncated = end - start > max_bytes
+        data = source.read(start, start + max_bytes if truncated else end)
+        if truncated:
+            data = _trim_partial_char(data)
+        stop = start + len(data)
+        content = data.decode("utf-8", errors="replace")
+
+    result.update({
+        "content": content,
+        "range": [start, stop],
+        "truncated": truncated,
+        "next_offset": stop if stop < size else None,
+    })
+    return result
+
+
+def _copy_range(src, dst, start: int, end: int):
+    src.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        chunk = src.read(min(BLOCK_SIZE, remaining))
+        if not chunk:
+            break
+        dst.write(chunk)
+        remaining -= len(chunk)
+
+
+def write_range(path: str, content: str, mode: str = "overwrite", offset: int = -1, length: int = -1) -> dict:
+    """
+    Writes text to a file without rewriting what is not changed.
+
+    Modes:
+        overwrite: replace the whole file (the previous behaviour).
+        append: add to the end.
+        patch: replace `length` bytes at byte `offset` (-1: as many bytes as the new
+               text, in place). A different length streams the rest of the file into
+               a temporary copy that atomically replaces the original.
+
+    overwrite and append translate "\n" to the platform line ending like a text-mode
+    write; patch writes the text as-is so byte offsets and lengths stay exact.
+    """
+    if mode in ("overwrite", "append"):
+        # Same bytes as open(path, "w", encoding="utf-8"), counted exactly
+        content = content.replace("\n", os.linesep)
+    data = content.encode("utf-8")
+    if mode == "overwrite":
+        with open(path, "wb") as f:
+            f.write(data)
+    elif mode == "append":
+        with open(path, "ab") as f:
+            f.write(data)
+    elif mode == "patch":
+        size = os.path.getsize(path)
+        if not 0 <= offset <= size:
+            raise ValueError(f"Patch offset must be between 0 and the file size ({size})")
+        length = len(data) if length < 0 else length
+        if length == len(data):
+            with open(path, "r+b") as f:
+                f.seek(offset)
+                f.write(data)
+        else:
+            directory = os.path.dirname(os.path.abspath(path))
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".patch-")
+            try:
+                with open(path, "rb") as src, os.fdopen(fd, "wb") as dst:
+                    _copy_range(src, dst, 0, offset)
+                    dst.write(data)
+                    _copy_range(src, dst, min(offset + length, size), size)
+                shutil.copymode(path, tmp)
+                os.replace(tmp, path)
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+    else:
+        raise ValueError(f"Unknown write mode '{mode}'. Use overwrite, append or patch")
+    return {"bytes_written": len(data), "size": os.path.getsize(path), "mode": mode}
@@ -0,0 +1,381 @@
+# app/computer/tools/file_search.py
+import fnmatch
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+
+SEARCH_WORKERS = int(os.environ.get("FILE_SEARCH_WORKERS", "8"))
+MAX_SEARCH_FILE_SIZE = int(os.environ.get("FILE_SEARCH_MAX_FILE_SIZE", str(2 * 1024 * 1024)))
+MAX_WALK_FILES = int(os.environ.get("FILE_SEARCH_MAX_FILES", "200000"))
+SKIP_DIRS = {".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv", "$recycle.bin", "system volume information"}
+MAX_LINES_PER_FILE = 5
+INDEX_VERSION = "2"
+
+
+def _trigram_hashes(data: bytes) -> np.ndarray:
+    """Distinct 32-bit multiplicative hashes of the byte trigrams in `data`."""
+    if len(data) < 3:
+        return np.empty(0, dtype=np.uint32)
+    b = np.frombuffer(data, dtype=np.uint8).astype(np.uint32)
+    grams = (b[:-2] << 16) | (b[1:-1] << 8) | b[2:]
+    return np.unique(grams * np.uint32(0x9E3779B1))
+
+
+def _filter_bits(count: int) -> int:
+    """Bloom filter size for `count` trigrams: about 4 bits each, between 1 Ki and 64 Ki bits."""
+    bits = 1024
+    while bits < count * 4 and bits < 65536:
+        bits *= 2
+    return bits
+
+
+def _bloom(hashes: np.ndarray, bits: int) -> int:
+    """Filter with one bit per trigram, taken from the top bits of its hash."""
+    bitmap = np.zeros(bits, dtype=np.uint8)
+    bitmap[hashes >> np.uint32(32 - bits.bit_length() + 1)] = 1
+    return int.from_bytes(np.packbits(bitmap, bitorder="little").tobytes(), "little")
+
+
+def _map_batched(pool: ThreadPoolExecutor, func, items: list, batch: int = 256) -> list:
+    """pool.map in batches, so 100k small files are not 100k futures."""
+    chunks = pool.map(lambda chunk: [func(item) for item in chunk], [items[i:i + batch] for i in range(0, len(items), batch)])
+    return [result for chunk in chunks for result in chunk]
+
+
+def _read_text(path: str, size: int) -> bytes | None:
+    """File contents for searching, or None for binary or oversized files."""
+    if size > MAX_SEARCH_FILE_SIZE:
+        return None
+    with open(path, "rb") as f:
+        data = f.read()
+    return None if b"\0" in data[:8192] else data
+
+
+def _lowered(data: bytes) -> tuple[bytes | str, bytes | str]:
+    """
+    File contents and their lowercase form for case-insensitive search. ASCII
+    stays bytes (the fast path); anything else is decoded as UTF-8 first, since
+    bytes.lower() only folds ASCII letters.
+    """
+    if data.isascii():
+        return data, data.lower()
+    text = data.decode("utf-8", errors="replace")
+    lowered = text.lower()
+    # A few characters change length when lowercased; positions only line up in the lowered text then
+    return (text if len(lowered) == len(text) else lowered), lowered
+
+
+class TrigramIndex:
+    """
+    Persistent per-file trigram Bloom filters for one root directory.
+
+    Each text file gets a bitmap of its lowercased content's trigrams (SQLite on
+    disk, Python ints in memory). A query only reads files whose bitmap holds all
+    of its trigrams. `update` re-indexes just the files whose mtime or size changed
+    since the last walk and forgets files that disappeared.
+
+    Args:
+        db_path: SQLite file the filters are stored in.
+    """
+
+    def __init__(self, db_path: str):
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.db_path = db_path
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, bits INTEGER, filter BLOB)"
+        )
+        version = self._db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if version is None or version[0] != INDEX_VERSION:
+            self._db.execute("DELETE FROM files")
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (INDEX_VERSION,))
+            self._db.commit()
+        self._files = {
+            path: (mtime_ns, size, bits, int.from_bytes(blob, "little") if blob else 0)
+            for path, mtime_ns, size, bits, blob in self._db.execute("SELECT * FROM files")
+        }
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _build(path: str, size: int) -> tuple[int, int] | None:
+        """(bits, filter) for a file, (0, 0) for binary or oversized files and None if it could not be read."""
+        try:
+            data = _read_text(path, size)
+        except OSError:
+            return None
+        if data is None:
+            return 0, 0
+        lowered = _lowered(data)[1]
+        if isinstance(lowered, str):
+            lowered = lowered.encode("utf-8")
+        hashes = _trigram_hashes(lowered)
+        bits = _filter_bits(len(hashes))
+        return bits, _bloom(hashes, bits)
+
+    def update(self, files: list[tuple[str, int, int]], pool: ThreadPoolExecutor) -> dict:
+        """Brings the index in line with a full walk of its root: [(path, size, mtime_ns)]."""
+        with self._lock:
+            seen = set()
+            changed = []
+            for path, size, mtime_ns in files:
+                seen.add(path)
+                known = self._files.get(path)
+                if known is None or known[0] != mtime_ns or known[1] != size:
+                    changed.append((path, size, mtime_ns))
+            removed = [path for path in self._files if path not in seen]
+
+            built = _map_batched(pool, lambda item: self._build(item[0], item[1]), changed)
+            rows, failed = [], []
+            for (path, size, mtime_ns), result in zip(changed, built):
+                if result is None:
+                    # Not stored, so the next update retries it (e.g. a file locked by another program)
+                    failed.append(path)
+                    continue
+                bits, bloom = result
+                self._files[path] = (mtime_ns, size, bits, bloom)
+                rows.append((path, mtime_ns, size, bits, bloom.to_bytes(bits // 8, "little") if bits else b""))
+            removed += [path for path in failed if path in self._files]
+            for path in removed:
+                del self._files[path]
+
+            if rows or removed:
+                self._db.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", rows)
+                self._db.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in removed])
+                self._db.commit()
+            return {"indexed": len(rows), "failed": len(failed), "removed": len(removed), "files": len(self._files)}
+
+    def candidates(self, needle: bytes, paths: list[str]) -> list[str]:
+        """The paths whose content may contain `needle` (lowercased UTF-8), including files not indexed yet."""
+        hashes = _trigram_hashes(needle)
+        masks = {}
+        result = []
+        for path in paths:
+            entry = self._files.get(path)
+            if entry is None:
+                result.append(path)
+                continue
+            if not entry[2]:
+                continue
+            bits, bloom = entry[2], entry[3]
+            mask = masks.get(bits)
+            if mask is None:
+                mask = masks[bits] = _bloom(hashes, bits)
+            if bloom & mask == mask:
+                result.append(path)
+        return result
+
+    def close(self):
+        self._db.close()
+
+
+class FileSearcher:
+    """
+    Finds files under a root whose name or content contains a query.
+
+    Directories are listed with os.scandir on a thread pool, each finished
+    directory queuing its subdirectories, and candidate files are read and
+    searched on the same pool. With an index, only files whose trigram filter
+    matches the query are read.
+
+    Args:
+        workers: Thread pool size.
+        max_files: Stop walking after this many files.
+    """
+
+    def __init__(self, workers: int = SEARCH_WORKERS, max_files: int = MAX_WALK_FILES):
+        self.max_files = max_files
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="file-search")
+
+    @staticmethod
+    def _scan(path: str) -> tuple[list, list]:
+        files, subdirs = [], []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name.lower() not in SKIP_DIRS:
+                                subdirs.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            stat = entry.stat(follow_symlinks=False)
+                            files.append((entry.path, stat.st_size, stat.st_mtime_ns))
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return files, subdirs
+
+    def walk(self, root: str) -> tuple[list[tuple[str, int, int]], bool]:
+        """All files under root as (path, size, mtime_ns), and whether max_files cut the walk short."""
+        files = []
+        pending = {self._pool.submit(self._scan, root)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                found, subdirs = future.result()
+                files.extend(found)
+                if len(files) < self.max_files:
+                    pending.update(self._pool.submit(self._scan, d) for d in subdirs)
+        truncated = len(files) >= self.max_files
+        return files[:self.max_files], truncated
+
+    @staticmethod
+    def matches_glob(root: str, path: str, pattern: str) -> bool:
+        if pattern in ("", "*"):
+            return True
+        if "/" in pattern or "\\" in pattern:
+            # Relative path match; "*" crosses folders, and "**/" may also match no folder at all
+            target = os.path.relpath(path, root).replace("\\", "/").lower()
+            pattern = pattern.replace("\\", "/").lower()
+            return fnmatch.fnmatchcase(target, pattern) or fnmatch.fnmatchcase(target, pattern.replace("**/", ""))
+        return fnmatch.fnmatchcase(os.path.basename(path).lower(), pattern.lower())
+
+    @staticmethod
+    def _grep(path: str, size: int, query: str, max_lines: int) -> tuple[int, list]:
+        """Occurrences of `query` (lowercased) in the file and the first `max_lines` matching lines."""
+        try:
+            data = _read_text(path, size)
+        except OSError:
+            return 0, []
+        if data is None:
+            return 0, []
+        haystack, lowered = _lowered(data)
+        if isinstance(lowered, bytes):
+            if not query.isascii():
+                return 0, []
+            needle, newline = query.encode("ascii"), b"\n"
+        else:
+            needle, newline = query, "\n"
+        position = lowered.find(needle)
+        count, lines = 0, []
+        line_number, counted_to = 1, 0
+        while position >= 0:
+            count += 1
+            if len(lines) < max_lines:
+                line_number += lowered.count(newline, counted_to, position)
+                counted_to = position
+                start = lowered.rfind(newline, 0, position) + 1
+                end = lowered.find(newline, position)
+                text = haystack[start:end if end >= 0 else len(haystack)]
+                if isinstance(text, bytes):
+                    text = text.decode("utf-8", errors="replace")
+                lines.append({"line": line_number, "text": text.strip()[:200]})
+            position = lowered.find(needle, position + len(needle))
+        return count, lines
+
+    def search(self, root: str, query: str, glob: str = "*", max_results: int = 50, index: TrigramIndex | None = None) -> dict:
+        start = time.perf_counter()
+        root = os.path.abspath(root)
+        if not os.path.isdir(root):
+            raise FileNotFoundError(f"Not a directory: {root}")
+        query_lower = query.lower()
+        needle = query_lower.encode("utf-8")
+        if not needle:
+            raise ValueError("Query must not be empty")
+
+        files, walk_truncated = self.walk(root)
+        walk_ms = (time.perf_counter() - start) * 1000
+        index_stats = index.update(files, self._pool) if index is not None else None
+
+        selected = [f for f in files if self.matches_glob(root, f[0], glob)]
+        sizes = {path: size for path, size, _ in selected}
+        mtimes = {path: mtime_ns for path, _, mtime_ns in selected}
+        name_hits = {path for path in sizes if query_lower in os.path.basename(path).lower()}
+
+        if index is not None and len(needle) >= 3:
+            to_read = index.candidates(needle, list(sizes))
+        else:
+            to_read = [path for path, size in sizes.items() if size <= MAX_SEARCH_FILE_SIZE]
+        grepped = _map_batched(self._pool, lambda p: (p, self._grep(p, sizes[p], query_lower, MAX_LINES_PER_FILE)), to_read)
+
+        hits = {}
+        for path, (count, lines) in grepped:
+            if count:
+                hits[path] = (count, lines)
+        ranked = []
+        for path in name_hits | set(hits):
+            count, lines = hits.get(path, (0, []))
+            name_match = path in name_hits
+            # Name matches first, then files with more matching lines, then newer files
+            score = (10.0 if name_match else 0.0) + min(count, 20) / 2
+            ranked.append((score, mtimes[path], path, name_match, count, lines))
+        ranked.sort(key=lambda item: (-item[0], -item[1]))
+
+        results = [
+            {"path": path, "score": score, "name_match": name_match, "match_count": count, "matches": lines}
+            for score, _, path, name_match, count, lines in ranked[:max_results]
+        ]
+        stats = {
+            "files_walked": len(files),
+            "files_matching_glob": len(selected),
+            "files_read": len(to_read),
+            "walk_ms": round(walk_ms, 1),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+        if index_stats is not None:
+            stats["index"] = index_stats
+        return {
+            "results": results,
+            "total_matches": len(ranked),
+            "truncated": len(ranked) > max_results,
+            "walk_truncated": walk_truncated,
+            "stats": stats,
+        }
+
+
+def default_index_path(root: str) -> str:
+    """FILE_SEARCH_INDEX_DIR (default: local app data) / one SQLite file per root."""
+    base = os.environ.get("FILE_SEARCH_INDEX_DIR") or os.path.join(
+        os.environ.get("LOCALAPPDATA") or os.path.expanduser("~/.cache"), "computer-use-agent", "search-index"
+    )
+    digest = hashlib.sha1(os.path.normcase(os.path.abspath(root)).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(base, f"{digest}.sqlite")
+
+
+_searcher = None
+_indexes = {}
+_search_lock = threading.Lock()
+
+
+def get_file_searcher() -> FileSearcher:
+    global _searcher
+    with _search_lock:
+        if _searcher is None:
+            _searcher = FileSearcher()
+        return _searcher
+
+
+def get_trigram_index(root: str) -> TrigramIndex:
+    path = default_index_path(root)
+    with _search_lock:
+        if path not in _indexes:
+            _indexes[path] = TrigramIndex(path)
+        return _indexes[path]
+
+
+def search_files(root: str, query: str, glob: str = "*", max_results: int = 50, use_index: bool = False) -> dict:
+    """
+    Finds files under a folder whose name or text content contains `query` (case-insensitive).
+
+    Args:
+        root: Folder to search recursively.
+        query: Text to look for in file names and contents.
+        glob: File name pattern such as "*.py" or "*.txt" (default: all files).
+        max_results: Most files returned, best matches first.
+        use_index: Keep a persistent index for this folder so repeated searches only
+                   read files that can contain the query (worth it for large folders).
+
+    Returns:
+        Ranked files with matching line numbers and text, and walk/read statistics.
+    """
+    try:
+        index = get_trigram_index(root) if use_index else None
+        result = get_file_searcher().search(root, query, glob, max_results, index)
+        return {"status": "success", **result}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
@@ -0,0 +1,128 @@
+# app/computer/tools/instrument.py
+import functools
+import inspect
+import threading
+import time
+
+# Latency histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class ToolMetrics:
+    """
+    Thread-safe per-tool call counters and latency histograms.
+
+    A call counts as an error when the tool raises or returns a dict with
+    `"status": "error"` or an `"error"` key, since the tools report failures
+    in their result instead of raising.
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._tools = {}
+
+    def _entry(self, name: str) -> dict:
+        entry = self._tools.get(name)
+        if entry is None:
+            entry = {"calls": 0, "errors": 0, "sum": 0.0, "counts": [0] * (len(self.buckets) + 1)}
+            self._tools[name] = entry
+        return entry
+
+    def observe(self, name: str, seconds: float, error: bool):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                index = i
+                break
+        with self._lock:
+            entry = self._entry(name)
+            entry["calls"] += 1
+            entry["errors"] += error
+            entry["sum"] += seconds
+            entry["counts"][index] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {name: {**entry, "counts": list(entry["counts"])} for name, entry in self._tools.items()}
+
+    def reset(self):
+        with self._lock:
+            self._tools.clear()
+
+    def render_prometheus(self) -> str:
+        """Renders the counters and histograms in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP tool_calls_total Tool calls by tool.",
+            "# TYPE tool_calls_total counter",
+        ]
+        for name, entry in sorted(snapshot.items()):
+            lines.append(f'tool_calls_total{{tool="{_label(name)}"}} {entry["calls"]}')
+
+        lines += [
+            "# HELP tool_errors_total Tool calls that raised or returned an error.",
+            "# TYPE tool_errors_total counter",
+        ]
+        for name, entry in sorted(snapshot.items()):
+            lines.append(f'tool_errors_total{{tool="{_label(name)}"}} {entry["errors"]}')
+
+        lines += [
+            "# HELP tool_duration_seconds Tool call latency.",
+            "# TYPE tool_duration_seconds histogram",
+        ]
+        for name, entry in sorted(snapshot.items()):
+            label = _label(name)
+            cumulative = 0
+            for bound, count in zip(self.buckets, entry["counts"]):
+                cumulative += count
+                lines.append(f'tool_duration_seconds_bucket{{tool="{label}",le="{bound:g}"}} {cumulative}')
+            lines.append(f'tool_duration_seconds_bucket{{tool="{label}",le="+Inf"}} {entry["calls"]}')
+            lines.append(f'tool_duration_seconds_sum{{tool="{label}"}} {entry["sum"]:.6f}')
+            lines.append(f'tool_duration_seconds_count{{tool="{label}"}} {entry["calls"]}')
+        return "\n".join(lines) + "\n"
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _is_error(result) -> bool:
+    return isinstance(result, dict) and (result.get("status") == "error" or "error" in result)
+
+
+tool_metrics = ToolMetrics()
+
+
+def instrument(func, metrics: ToolMetrics = tool_metrics):
+    """
+    Wraps a plain function tool so each call is timed and counted under its name.
+
+    functools.wraps keeps the name, docstring and signature the agent uses to build
+    the tool declaration.
+    """
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            metrics.observe(name, time.perf_counter() - start, True)
+            raise
+        metrics.observe(name, time.perf_counter() - start, _is_error(result))
+        return result
+
+    wrapper.__instrumented__ = True
+    return wrapper
+
+
+def instrument_tools(tools: list, metrics: ToolMetrics = tool_metrics) -> list:
+    """Instruments every plain function in an agent's tool list; tool objects pass through unchanged."""
+    return [
+        instrument(t, metrics)
+        if inspect.isfunction(t) and not getattr(t, "__instrumented__", False)
+        else t
+        for t in tools
+    ]
@@ -0,0 +1,222 @@
+# app/computer/tools/launch.py
+import os
+import re
+import subprocess
+import threading
+import time
+from .app_index import get_app_index, normalize_name
+from .window_registry import get_window_registry
+
+LAUNCH_TIMEOUT = float(os.environ.get("LAUNCH_TIMEOUT", "15"))
+MIN_MATCH_SCORE = 0.65
+
+
+# PROCESS BACKENDS
+# A process backend exposes `spawn(path) -> pid | None` and `related_pids(pid) -> set`
+# (the process and its descendants, since many launchers hand off to a child).
+
+class ShellProcessBackend:
+    """Starts shortcuts and executables through the Windows shell (ShellExecuteEx)."""
+
+    def __init__(self):
+        from win32com.shell import shell, shellcon
+        import win32api
+        import win32process
+        self._shell = shell
+        self._shellcon = shellcon
+        self._win32api = win32api
+        self._win32process = win32process
+
+    def spawn(self, path: str) -> int | None:
+        info = self._shell.ShellExecuteEx(
+            fMask=self._shellcon.SEE_MASK_NOCLOSEPROCESS,
+            lpVerb="open",
+            lpFile=path,
+            nShow=1,
+        )
+        handle = info.get("hProcess")
+        if not handle:
+            return None
+        try:
+            return self._win32process.GetProcessId(handle)
+        finally:
+            # Only the pid is needed; an open handle would pin the process object after exit
+            self._win32api.CloseHandle(handle)
+
+    def related_pids(self, pid: int | None) -> set:
+        return _process_tree(pid)
+
+
+class SubprocessBackend:
+    """Runs the path as a command with subprocess (non-Windows hosts and fake apps)."""
+
+    # Shared by all instances (default_backends makes one per launch): children are
+    # kept until they exit and reaped on the next spawn, so they do not linger as zombies
+    _children = []
+    _lock = threading.Lock()
+
+    def spawn(self, path: str) -> int | None:
+        # Own session, so the app outlives the server and its Ctrl+C (ignored on Windows)
+        process = subprocess.Popen([path], start_new_session=True)
+        with self._lock:
+            self._children[:] = [child for child in self._children if child.poll() is None]
+            self._children.append(process)
+        return process.pid
+
+    def related_pids(self, pid: int | None) -> set:
+        return _process_tree(pid)
+
+
+def _process_tree(pid: int | None) -> set:
+    if pid is None:
+        return set()
+    try:
+        import psutil
+        return {pid} | {child.pid for child in psutil.Process(pid).children(recursive=True)}
+    except Exception:
+        return {pid}
+
+
+# WINDOW BACKENDS
+# A window backend exposes `list_windows() -> [(handle, title, pid), ...]` for the
+# visible top-level windows; on Windows this is the shared window registry.
+
+def default_backends():
+    """Returns (process backend, window backend) for this host."""
+    try:
+        return ShellProcessBackend(), get_window_registry()
+    except ImportError:
+        return SubprocessBackend(), None
+
+
+# WAITING FOR THE WINDOW
+
+def _title_words(name: str) -> list[str]:
+    return [w for w in re.split(r"[\s\-_.+]+", normalize_name(name)) if len(w) > 1]
+
+
+def _title_matches(title: str, name: str) -> bool:
+    """True when the window title contains the app name or all of its words."""
+    title = normalize_name(title)
+    key = normalize_name(name)
+    if key in title:
+        return True
+    words = _title_words(name)
+    return bool(words) and all(word in title for word in words)
+
+
+def wait_for_window(
+    window_backend,
+    process_backend,
+    pid: int | None,
+    name: str,
+    before: set,
+    timeout: float = LAUNCH_TIMEOUT,
+    initial_delay: float = 0.05,
+    max_delay: float = 0.5,
+) -> tuple[tuple | None, int]:
+    """
+    Polls the window list with exponential backoff until the launched app's window shows.
+
+    A new window (not in `before`) owned by the spawned process or one of its
+    children wins; otherwise a new window whose title matches the app name.
+
+    Returns:
+        ((handle, title, pid) or None, polls)
+    """
+    deadline = time.monotonic() + timeout
+    delay = initial_delay
+    polls = 0
+    while True:
+        polls += 1
+        windows = [w for w in window_backend.list_windows() if w[0] not in before]
+        if windows:
+            owned = process_backend.related_pids(pid)
+            for window in windows:
+                if window[2] in owned:
+                    return window, polls
+            for window in windows:
+                if _title_matches(window[1], name):
+                    return window, polls
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None, polls
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 1.5, max_delay)
+
+
+# TOOL
+
+def start_app(name: str, process_backend, window_backend, timeout: float = LAUNCH_TIMEOUT) -> dict:
+    """
+    Resolves `name` through the app index, spawns it and waits for its window.
+    When no new or already open window shows up in time the result is an error
+    with window_found False, since the app may have failed to start.
+
+    Args:
+        name: App name or a path to an executable.
+        process_backend: Spawns the resolved path (see the process backends above).
+        window_backend: Lists windows, or None to skip waiting for a window.
+        timeout: Maximum seconds to wait for the window.
+    """
+    if os.path.isfile(name):
+        path, display, score = name, os.path.splitext(os.path.basename(name))[0], 1.0
+    else:
+        matches = get_app_index().search(name, limit=3)
+        if not matches or matches[0]["score"] < MIN_MATCH_SCORE:
+            return {"status": "error", "message": f"'{name}' is not installed", "matches": matches}
+        path, display, score = matches[0]["path"], matches[0]["name"], matches[0]["score"]
+
+    before = {w[0] for w in window_backend.list_windows()} if window_backend else set()
+    start = time.monotonic()
+    pid = process_backend.spawn(path)
+    result = {"status": "success", "app": display, "path": path, "match_score": score, "pid": pid}
+    if window_backend is None:
+        result["window_found"] = None
+        result["message"] = f"Started {display}; window tracking is unavailable"
+        return result
+
+    window, polls = wait_for_window(window_backend, process_backend, pid, display, before, timeout)
+    elapsed_ms = round((time.monotonic() - start) * 1000, 1)
+    result["polls"] = polls
+    if window is None:
+        # Single-instance apps hand off to an already open window instead of creating one
+        existing = [w for w in window_backend.list_windows() if _title_matches(w[1], display)]
+        if not existing:
+            result.update({
+                "status": "error",
+                "window_found": False,
+                "window": None,
+                "message": f"Started {display} but no window appeared within {timeout}s",
+            })
+            return result
+        result["window_found"] = True
+        result["window"] = {"handle": existing[0][0], "title": existing[0][1], "new": False}
+        result["message"] = f"Started {display}; no new window within {timeout}s, using its open window"
+        return result
+
+    result["window_found"] = True
+    result["window"] = {"handle": window[0], "title": window[1], "new": True}
+    result["time_to_window_ms"] = elapsed_ms
+    result["message"] = f"Opened {display}"
+    return result
+
+
+def launch_app(name: str, timeout: float = LAUNCH_TIMEOUT) -> dict:
+    """
+    Starts an installed app directly from its Start Menu shortcut and waits for its window.
+
+    Args:
+        name: App name (partial names and small typos are matched) or a path to an executable.
+        timeout: Maximum seconds to wait for the app's window.
+
+    Returns:
+        The resolved shortcut, process id, window_found, the window handle and title,
+        and time_to_window_ms (from spawn until the window was listed). An error
+        when the app started but no window appeared.
+    """
+    try:
+        process_backend, window_backend = default_backends()
+        return start_app(name, process_backend, window_backend, timeout)
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
@@ -0,0 +1,296 @@
+# app/computer/tools/layout.py
+import math
+from dataclasses import dataclass, asdict
+from .window_registry import get_window_registry
+
+
+@dataclass(frozen=True)
+class Rect:
+    x: int
+    y: int
+    width: int
+    height: int
+
+    def center(self) -> tuple[int, int]:
+        return self.x + self.width // 2, self.y + self.height // 2
+
+    def contains(self, point: tuple[int, int]) -> bool:
+        px, py = point
+        return self.x <= px < self.x + self.width and self.y <= py < self.y + self.height
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+# LAYOUT MATH
+
+def _split(start: int, total: int, parts: int, gap: int) -> list[tuple[int, int]]:
+    """Splits a span into `parts` cells separated (and surrounded) by `gap`, sizes differing by at most 1."""
+    usable = total - gap * (parts + 1)
+    base, extra = divmod(usable, parts)
+    cells, offset = [], start + gap
+    for i in range(parts):
+        size = base + (1 if i < extra else 0)
+        cells.append((offset, size))
+        offset += size + gap
+    return cells
+
+
+def grid(area: Rect, columns: int, rows: int, count: int | None = None, gap: int = 0) -> list[Rect]:
+    """
+    Cells of a columns x rows grid in reading order. With `count` < columns * rows
+    the cells of the last row are widened to fill it.
+    """
+    count = columns * rows if count is None else count
+    row_cells = _split(area.y, area.height, rows, gap)
+    rects = []
+    for row, (y, height) in enumerate(row_cells):
+        in_row = min(columns, count - row * columns)
+        if in_row <= 0:
+            break
+        for x, width in _split(area.x, area.width, in_row, gap):
+            rects.append(Rect(x, y, width, height))
+    return rects
+
+
+def _grid_of(area: Rect, count: int, gap: int) -> list[Rect]:
+    """Near-square grid for `count` windows: ceil(sqrt(n)) columns, as many rows as needed."""
+    count = max(count, 1)
+    columns = math.ceil(math.sqrt(count))
+    return grid(area, columns, math.ceil(count / columns), count, gap)
+
+
+# name -> function(area, count, gap) -> rectangles, one per window in order
+LAYOUTS = {
+    "full": lambda a, n, g: grid(a, 1, 1, gap=g),
+    "left": lambda a, n, g: grid(a, 2, 1, gap=g)[:1],
+    "right": lambda a, n, g: grid(a, 2, 1, gap=g)[1:],
+    "top": lambda a, n, g: grid(a, 1, 2, gap=g)[:1],
+    "bottom": lambda a, n, g: grid(a, 1, 2, gap=g)[1:],
+    "top_left": lambda a, n, g: grid(a, 2, 2, gap=g)[0:1],
+    "top_right": lambda a, n, g: grid(a, 2, 2, gap=g)[1:2],
+    "bottom_left": lambda a, n, g: grid(a, 2, 2, gap=g)[2:3],
+    "bottom_right": lambda a, n, g: grid(a, 2, 2, gap=g)[3:4],
+    "halves": lambda a, n, g: grid(a, 2, 1, gap=g),
+    "stacked": lambda a, n, g: grid(a, 1, 2, gap=g),
+    "quadrants": lambda a, n, g: grid(a, 2, 2, gap=g),
+    "columns": lambda a, n, g: grid(a, max(n, 1), 1, gap=g),
+    "rows": lambda a, n, g: grid(a, 1, max(n, 1), gap=g),
+    "grid": lambda a, n, g: _grid_of(a, n, g),
+}
+
+
+def layout_rects(layout: str, area: Rect, count: int, gap: int = 0) -> list[Rect]:
+    """
+    Target rectangles for `count` windows in a named layout inside a monitor work area.
+
+    Raises:
+        ValueError: for an unknown layout or more windows than the layout has cells.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}'. Use one of: {', '.join(LAYOUTS)}")
+    rects = LAYOUTS[layout](area, count, gap)
+    if count > len(rects):
+        raise ValueError(f"Layout '{layout}' has {len(rects)} cell(s) for {count} window(s)")
+    return rects[:count]
+
+
+# WINDOW MANAGERS
+# A window manager exposes `monitors() -> [Rect, ...]` (work areas, primary first),
+# `geometry(handle) -> Rect` (visible bounds) and `apply([(handle, Rect), ...])`,
+# which moves and resizes all windows in one batch.
+
+class Win32WindowManager:
+    """Moves windows with one DeferWindowPos batch, compensating for invisible DWM borders."""
+
+    SW_RESTORE = 9
+    SWP_NOZORDER = 0x0004
+    SWP_NOACTIVATE = 0x0010
+    DWMWA_EXTENDED_FRAME_BOUNDS = 9
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+        import win32api
+        self._ctypes = ctypes
+        self._wintypes = wintypes
+        self._win32api = win32api
+        user32 = ctypes.windll.user32
+        user32.BeginDeferWindowPos.restype = ctypes.c_void_p
+        user32.DeferWindowPos.restype = ctypes.c_void_p
+        user32.DeferWindowPos.argtypes = [
+            ctypes.c_void_p, wintypes.HWND, wintypes.HWND,
+            ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_uint,
+        ]
+        user32.EndDeferWindowPos.argtypes = [ctypes.c_void_p]
+        self._user32 = user32
+        self._dwmapi = ctypes.windll.dwmapi
+
+    def monitors(self) -> list[Rect]:
+        areas = []
+        for hmon, _, _ in self._win32api.EnumDisplayMonitors():
+            info = self._win32api.GetMonitorInfo(hmon)
+            left, top, right, bottom = info["Work"]
+            areas.append((not info["Flags"] & 1, Rect(left, top, right - left, bottom - top)))
+        return [rect for _, rect in sorted(areas, key=lambda item: item[0])]
+
+    def _window_rect(self, handle: int) -> Rect:
+        rect = self._wintypes.RECT()
+        self._user32.GetWindowRect(handle, self._ctypes.byref(rect))
+        return Rect(rect.left, rect.top, rect.right - rect.left, rect.bottom - rect.top)
+
+    def geometry(self, handle: int) -> Rect:
+        rect = self._wintypes.RECT()
+        result = self._dwmapi.DwmGetWindowAttribute(
+            self._wintypes.HWND(handle), self.DWMWA_EXTENDED_FRAME_BOUNDS,
+            self._ctypes.byref(rect), self._ctypes.sizeof(rect),
+        )
+        if result != 0:
+            return self._window_rect(handle)
+        return Rect(rect.left, rect.top, rect.right - rect.left, rect.bottom - rect.top)
+
+    def apply(self, placements: list[tuple[int, Rect]]):
+        user32 = self._user32
+        for handle, _ in placements:
+            if user32.IsIconic(handle) or user32.IsZoomed(handle):
+                user32.ShowWindow(handle, self.SW_RESTORE)
+
+        hdwp = user32.BeginDeferWindowPos(len(placements))
+        for handle, target in placements:
+            # The window rect includes invisible resize borders around the visible frame
+            outer, visible = self._window_rect(handle), self.geometry(handle)
+            left, top = visible.x - outer.x, visible.y - outer.y
+            right = (outer.x + outer.width) - (visible.x + visible.width)
+            bottom = (outer.y + outer.height) - (visible.y + visible.height)
+            hdwp = user32.DeferWindowPos(
+                hdwp, handle, None,
+                target.x - left, target.y - top,
+                target.width + left + right, target.height + top + bottom,
+                self.SWP_NOZORDER | self.SWP_NOACTIVATE,
+            )
+            if not hdwp:
+                raise OSError(f"DeferWindowPos failed for window {handle}")
+        if not user32.EndDeferWindowPos(hdwp):
+            raise OSError("EndDeferWindowPos failed")
+
+
+class InMemoryWindowManager:
+    """
+    Window manager over plain rectangles, for running layouts without a desktop.
+
+    Windows may have a minimum size, as real windows do, so achieved geometry can
+    differ from the target.
+    """
+
+    def __init__(self, monitors: list[Rect], windows: dict, min_sizes: dict | None = None):
+        self._monitors = monitors
+        self.windows = dict(windows)
+        self.min_sizes = min_sizes or {}
+        self.batches = 0
+
+    def monitors(self) -> list[Rect]:
+        return list(self._monitors)
+
+    def geometry(self, handle: int) -> Rect:
+        return self.windows[handle]
+
+    def apply(self, placements: list[tuple[int, Rect]]):
+        self.batches += 1
+        for handle, target in placements:
+            min_width, min_height = self.min_sizes.get(handle, (0, 0))
+            self.windows[handle] = Rect(target.x, target.y, max(target.width, min_width), max(target.height, min_height))
+
+
+# ENGINE
+
+def monitor_of(manager, handle: int) -> int:
+    """Index of the monitor whose work area contains the window's center (primary if none)."""
+    center = manager.geometry(handle).center()
+    for index, area in enumerate(manager.monitors()):
+        if area.contains(center):
+            return index
+    return 0
+
+
+def apply_layout(manager, handles: list[int], layout: str, monitor: int | None = None, gap: int = 0) -> list[dict]:
+    """
+    Places windows in a named layout with one batched move/resize.
+
+    Args:
+        manager: Window manager (see above).
+        handles: Windows in the layout's cell order.
+        layout: Name from LAYOUTS.
+        monitor: Monitor index; None uses the monitor of the first window.
+        gap: Pixels between windows and around the edges.
+
+    Returns:
+        Per window: handle, target and achieved rectangles, and whether they match.
+    """
+    if not handles:
+        raise ValueError("No windows to arrange")
+    monitors = manager.monitors()
+    if monitor is None or monitor < 0:
+        monitor = monitor_of(manager, handles[0])
+    if monitor >= len(monitors):
+        raise ValueError(f"Monitor {monitor} does not exist ({len(monitors)} connected)")
+
+    targets = layout_rects(layout, monitors[monitor], len(handles), gap)
+    manager.apply(list(zip(handles, targets)))
+
+    placed = []
+    for handle, target in zip(handles, targets):
+        achieved = manager.geometry(handle)
+        placed.append({
+            "handle": handle,
+            "target": target.to_dict(),
+            "achieved": achieved.to_dict(),
+            "exact": achieved == target,
+        })
+    return placed
+
+
+_window_manager = None
+
+
+def get_window_manager():
+    global _window_manager
+    if _window_manager is None:
+        _window_manager = Win32WindowManager()
+    return _window_manager
+
+
+def arrange(titles: list[str], layout: str, monitor: int | None = None, gap: int = 0, manager=None) -> dict:
+    """Resolves window titles through the window registry and applies a layout to them."""
+    if not titles:
+        raise ValueError("Pass at least one window title")
+    registry = get_window_registry()
+    windows = registry.find_all(titles)
+    handles = [w.handle for w in windows]
+    if len(set(handles)) != len(handles):
+        raise ValueError("Two of the titles match the same window")
+    placed = apply_layout(manager or get_window_manager(), handles, layout, monitor, gap)
+    registry.invalidate()
+    for window, result in zip(windows, placed):
+        result["title"] = window.title
+    return {"status": "success", "layout": layout, "windows": placed}
+
+
+def arrange_windows(titles: list[str], layout: str = "grid", monitor: int = -1, gap: int = 0) -> dict:
+    """
+    Arranges windows side by side without focusing them.
+
+    Args:
+        titles: Window titles (partial titles match), in cell order: left to right, top to bottom.
+        layout: One of full, left, right, top, bottom, top_left, top_right, bottom_left,
+                bottom_right (one window); halves, stacked (two); quadrants (four);
+                columns, rows, grid (any number).
+        monitor: Monitor index (0 is the primary); -1 uses the first window's monitor.
+        gap: Pixels between windows.
+
+    Returns:
+        Each window's target and achieved position and size.
+    """
+    try:
+        return arrange(titles, layout, monitor, gap)
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
@@ -0,0 +1,211 @@
+# app/computer/tools/listing.py
+import base64
+import bisect
+import fnmatch
+import json
+import os
+import stat as stat_module
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+LIST_PAGE_SIZE = int(os.environ.get("LIST_PAGE_SIZE", "100"))
+LIST_PAGE_MAX = int(os.environ.get("LIST_PAGE_MAX", "1000"))
+LIST_MAX_ENTRIES = int(os.environ.get("LIST_MAX_ENTRIES", "50000"))
+LISTING_CACHE_TTL = float(os.environ.get("LISTING_CACHE_TTL", "5.0"))
+LISTING_CACHE_DIRS = int(os.environ.get("LISTING_CACHE_DIRS", "256"))
+
+FILE, DIR, LINK, OTHER = "file", "dir", "link", "other"
+SORT_KEYS = {
+    "name": lambda e: (e.rel.lower(), e.rel),
+    "size": lambda e: (e.size if e.size is not None else -1, e.rel),
+    "modified": lambda e: (e.mtime_ns, e.rel),
+    "type": lambda e: (e.type, e.rel.lower(), e.rel),
+}
+
+
+class _Entry:
+    __slots__ = ("rel", "type", "size", "mtime_ns", "hidden", "depth")
+
+    def __init__(self, rel: str, type: str, size: int | None, mtime_ns: int, hidden: bool, depth: int):
+        self.rel = rel
+        self.type = type
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.hidden = hidden
+        self.depth = depth
+
+    def to_dict(self) -> dict:
+        result = {"path": self.rel, "type": self.type}
+        if self.size is not None:
+            result["size"] = self.size
+        result["modified"] = datetime.fromtimestamp(self.mtime_ns / 1e9).isoformat(timespec="seconds")
+        return result
+
+
+def _encode_cursor(sort: str, descending: bool, key: tuple) -> str:
+    return base64.urlsafe_b64encode(json.dumps([sort, descending, list(key)]).encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str, sort: str, descending: bool) -> tuple:
+    try:
+        cursor_sort, cursor_descending, key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor; pass next_cursor from a previous result")
+    if cursor_sort != sort or cursor_descending != descending:
+        raise ValueError("Cursor was made with a different sort order")
+    return tuple(key)
+
+
+class DirectoryLister:
+    """
+    Lists folders with one os.scandir pass per directory.
+
+    Each directory's entries (type, size, mtime) are cached and reused while the
+    directory's own mtime is unchanged and the listing is younger than `ttl`
+    seconds; the mtime catches added, removed and renamed entries, the TTL bounds
+    how stale a file's size or mtime can be. Pages are keyed on the last entry's
+    sort key, so files appearing or disappearing between calls neither repeat nor
+    skip entries.
+
+    Args:
+        ttl: Max age of a cached directory listing, in seconds.
+        cache_dirs: Directories kept in the LRU cache.
+        max_entries: Stop a recursive walk after this many entries.
+    """
+
+    def __init__(self, ttl: float = LISTING_CACHE_TTL, cache_dirs: int = LISTING_CACHE_DIRS, max_entries: int = LIST_MAX_ENTRIES):
+        self.ttl = ttl
+        self.cache_dirs = cache_dirs
+        self.max_entries = max_entries
+        self._cache = OrderedDict()   # normalized path -> (dir mtime_ns, scanned at, [(name, type, size, mtime_ns, hidden)])
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _scan(path: str) -> list[tuple]:
+        rows = []
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if entry.is_symlink():
+                    kind = LINK
+                elif stat_module.S_ISDIR(st.st_mode):
+                    kind = DIR
+                elif stat_module.S_ISREG(st.st_mode):
+                    kind = FILE
+                else:
+                    kind = OTHER
+                # st_file_attributes exists on Windows only
+                hidden = entry.name.startswith(".") or bool(getattr(st, "st_file_attributes", 0) & 0x2)
+                rows.append((entry.name, kind, st.st_size if kind == FILE else None, st.st_mtime_ns, hidden))
+        return rows
+
+    def scan(self, path: str) -> list[tuple]:
+        """One directory's entries, from the cache while it is still valid."""
+        key = os.path.normcase(os.path.abspath(path))
+        mtime_ns = os.stat(path).st_mtime_ns
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == mtime_ns and now - cached[1] < self.ttl:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached[2]
+        rows = self._scan(path)
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = (mtime_ns, now, rows)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_dirs:
+                self._cache.popitem(last=False)
+        return rows
+
+    def walk(self, root: str, depth: int) -> tuple[list[_Entry], bool]:
+        """Entries under root down to `depth` levels of subfolders, and whether max_entries cut it short."""
+        entries = []
+        queue = [("", 0)]
+        for rel_dir, level in queue:
+            try:
+                rows = self.scan(os.path.join(root, rel_dir) if rel_dir else root)
+            except OSError:
+                if not rel_dir:
+                    raise
+                continue
+            for name, kind, size, mtime_ns, hidden in rows:
+                rel = os.path.join(rel_dir, name) if rel_dir else name
+                entries.append(_Entry(rel, kind, size, mtime_ns, hidden, level))
+                if len(entries) >= self.max_entries:
+                    return entries, True
+                if kind == DIR and level < depth:
+                    queue.append((rel, level + 1))
+        return entries, False
+
+    def list(
+        self,
+        path: str,
+        depth: int = 0,
+        pattern: str = "*",
+        kind: str = "all",
+        include_hidden: bool = True,
+        sort: str = "name",
+        descending: bool = False,
+        limit: int = LIST_PAGE_SIZE,
+        cursor: str = "",
+    ) -> dict:
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort '{sort}'. Use one of: {', '.join(SORT_KEYS)}")
+        if kind not in ("all", FILE, DIR):
+            raise ValueError("kind must be all, file or dir")
+        if not os.path.isdir(path):
+            raise NotADirectoryError(f"Not a folder: {path}")
+        limit = max(1, min(limit, LIST_PAGE_MAX))
+
+        entries, truncated = self.walk(path, max(depth, 0))
+        pattern = pattern.lower()
+        entries = [
+            e for e in entries
+            if (kind == "all" or e.type == kind)
+            and (include_hidden or not e.hidden)
+            and (pattern in ("", "*") or fnmatch.fnmatchcase(os.path.basename(e.rel).lower(), pattern))
+        ]
+
+        sort_key = SORT_KEYS[sort]
+        entries.sort(key=sort_key)
+        keys = [sort_key(e) for e in entries]
+        if descending:
+            end = bisect.bisect_left(keys, _decode_cursor(cursor, sort, descending)) if cursor else len(entries)
+            page = entries[max(end - limit, 0):end][::-1]
+            more = end - limit > 0
+        else:
+            start = bisect.bisect_right(keys, _decode_cursor(cursor, sort, descending)) if cursor else 0
+            page = entries[start:start + limit]
+            more = start + limit < len(entries)
+
+        return {
+            "path": os.path.abspath(path),
+            "entries": [e.to_dict() for e in page],
+            "count": len(page),
+            "total": len(entries),
+            "next_cursor": _encode_cursor(sort, descending, sort_key(page[-1])) if more and page else None,
+            "truncated": truncated,
+        }
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"cached_dirs": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+
+_lister = None
+
+
+def get_directory_lister() -> DirectoryLister:
+    global _lister
+    if _lister is None:
+        _lister = DirectoryLister()
+    return _lister
@@ -0,0 +1,104 @@
+# app/computer/tools/screen_cache.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from PIL import Image
+
+
+def dhash(image: Image.Image, hash_size: int = 16) -> int:
+    """
+    Difference hash of an image.
+
+    The image is shrunk to (hash_size + 1) x hash_size grayscale pixels and each bit
+    records whether a pixel is brighter than its right-hand neighbour, so small
+    rendering noise leaves the hash unchanged while real UI changes flip bits.
+    """
+    small = image.convert("L").resize((hash_size + 1, hash_size), Image.Resampling.BILINEAR)
+    pixels = small.tobytes()
+    width = hash_size + 1
+    bits = 0
+    for row in range(hash_size):
+        offset = row * width
+        for col in range(hash_size):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return bits
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def screen_digest(image: Image.Image) -> str:
+    """Exact digest of an image's pixels: any changed pixel gives a different key."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{image.mode}:{image.size[0]}x{image.size[1]}".encode("ascii"))
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def normalize_question(question: str) -> str:
+    return " ".join(question.lower().split()).rstrip("?.! ")
+
+
+class VisionCache:
+    """
+    LRU + TTL cache of vision answers keyed by (screen digest, normalized question).
+
+    The digest is exact (see screen_digest) rather than a perceptual hash: the
+    checks made after acting (a small dialog appeared, text was typed, a box was
+    ticked) move a difference hash by a few bits or none, and a near match would
+    answer them from the screen before the change.
+
+    Args:
+        max_entries: Maximum number of cached answers before LRU eviction.
+        ttl: Seconds a cached answer stays valid.
+    """
+
+    def __init__(self, max_entries: int = 64, ttl: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, screen_key: str, question: str) -> str | None:
+        key = (screen_key, normalize_question(question))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[1] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, screen_key: str, question: str, description: str):
+        key = (screen_key, normalize_question(question))
+        with self._lock:
+            self._entries[key] = (description, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
@@ -0,0 +1,105 @@
+# app/computer/tools/screen_diff.py
+import threading
+import numpy as np
+from PIL import Image
+
+
+class ScreenDiff:
+    """
+    Tracks the last frame sent to the vision model in full and finds what changed since.
+
+    Frames are compared in grayscale on a grid of square tiles. A tile is dirty when
+    more than `tile_ratio` of its pixels moved by more than `pixel_threshold` grey
+    levels; the bounding box of all dirty tiles (plus `padding`) is the changed region.
+
+    Args:
+        tile_size: Edge length of a comparison tile in pixels.
+        pixel_threshold: Grey-level delta above which a pixel counts as changed.
+        tile_ratio: Fraction of changed pixels that marks a tile dirty.
+        max_region_fraction: Largest changed area (as a fraction of the screen)
+                             that is still sent as a cropped region.
+        padding: Pixels added around the changed region for context.
+    """
+
+    def __init__(
+        self,
+        tile_size: int = 32,
+        pixel_threshold: int = 24,
+        tile_ratio: float = 0.02,
+        max_region_fraction: float = 0.25,
+        padding: int = 16,
+    ):
+        self.tile_size = tile_size
+        self.pixel_threshold = pixel_threshold
+        self.tile_ratio = tile_ratio
+        self.max_region_fraction = max_region_fraction
+        self.padding = padding
+        self._lock = threading.Lock()
+        self._frame = None
+        self._question = None
+        self._description = None
+
+    @staticmethod
+    def _gray(image: Image.Image) -> np.ndarray:
+        return np.asarray(image.convert("L"), dtype=np.int16)
+
+    def dirty_tiles(self, previous: np.ndarray, current: np.ndarray) -> np.ndarray:
+        """Returns a boolean (rows, cols) mask of tiles that changed between two frames."""
+        ts = self.tile_size
+        changed = np.abs(current - previous) > self.pixel_threshold
+        h, w = changed.shape
+        rows, cols = -(-h // ts), -(-w // ts)
+        padded = np.zeros((rows * ts, cols * ts), dtype=bool)
+        padded[:h, :w] = changed
+        per_tile = padded.reshape(rows, ts, cols, ts).mean(axis=(1, 3))
+        return per_tile > self.tile_ratio
+
+    def changed_region(self, image: Image.Image) -> tuple[int, int, int, int] | None:
+        """
+        Returns the (left, top, right, bottom) box that changed since the baseline frame,
+        or None when a full-frame analysis is needed (no baseline, size change,
+        nothing changed, or too much changed).
+        """
+        with self._lock:
+            previous = self._frame
+        if previous is None:
+            return None
+        current = self._gray(image)
+        if current.shape != previous.shape:
+            return None
+
+        mask = self.dirty_tiles(previous, current)
+        if not mask.any():
+            return None
+
+        ys, xs = np.nonzero(mask)
+        ts = self.tile_size
+        h, w = current.shape
+        left = max(0, xs.min() * ts - self.padding)
+        top = max(0, ys.min() * ts - self.padding)
+        right = min(w, (xs.max() + 1) * ts + self.padding)
+        bottom = min(h, (ys.max() + 1) * ts + self.padding)
+
+        if (right - left) * (bottom - top) > self.max_region_fraction * w * h:
+            return None
+        return int(left), int(top), int(right), int(bottom)
+
+    def context(self) -> tuple[str, str] | None:
+        """Returns the (question, description) of the baseline frame, if any."""
+        with self._lock:
+            if self._description is None:
+                return None
+            return self._question, self._description
+
+    def set_baseline(self, image: Image.Image, question: str, description: str):
+        frame = self._gray(image)
+        with self._lock:
+            self._frame = frame
+            self._question = question
+            self._description = description
+
+    def reset(self):
+        with self._lock:
+            self._frame = None
+            self._question = None
+            self._description = None
@@ -0,0 +1,101 @@
+# app/computer/tools/screen_encode.py
+import io
+import os
+from dataclasses import dataclass, replace
+from PIL import Image
+
+RESAMPLE_FILTERS = {
+    "nearest": Image.Resampling.NEAREST,
+    "bilinear": Image.Resampling.BILINEAR,
+    "bicubic": Image.Resampling.BICUBIC,
+    "lanczos": Image.Resampling.LANCZOS,
+}
+
+MIME_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp", "PNG": "image/png"}
+
+
+@dataclass(frozen=True)
+class EncodeSettings:
+    """
+    How a screenshot is downscaled and encoded before upload.
+
+    Args:
+        format: "JPEG", "WEBP", "PNG", or "ADAPTIVE" to pick the cheapest
+                encoding from ADAPTIVE_LADDER that fits `byte_budget`.
+        quality: Lossy quality (1-95), ignored for PNG.
+        resample: Resize filter name (nearest, bilinear, bicubic, lanczos).
+        max_dimension: Longest edge after downscaling.
+        byte_budget: Target payload size for ADAPTIVE mode.
+    """
+    format: str = "JPEG"
+    quality: int = 80
+    resample: str = "bilinear"
+    max_dimension: int = 1024
+    byte_budget: int = 150_000
+
+
+# Ordered cheapest-to-encode first; the first rung under the budget wins.
+ADAPTIVE_LADDER = (
+    ("JPEG", 85),
+    ("JPEG", 70),
+    ("JPEG", 55),
+    ("WEBP", 60),
+    ("JPEG", 40),
+    ("WEBP", 40),
+)
+
+
+def settings_from_env() -> EncodeSettings:
+    defaults = EncodeSettings()
+    return EncodeSettings(
+        format=os.environ.get("VISION_IMAGE_FORMAT", defaults.format).upper(),
+        quality=int(os.environ.get("VISION_IMAGE_QUALITY", defaults.quality)),
+        resample=os.environ.get("VISION_IMAGE_RESAMPLE", defaults.resample).lower(),
+        max_dimension=int(os.environ.get("VISION_MAX_DIMENSION", defaults.max_dimension)),
+        byte_budget=int(os.environ.get("VISION_IMAGE_BUDGET", defaults.byte_budget)),
+    )
+
+
+def downscale(image: Image.Image, settings: EncodeSettings) -> Image.Image:
+    """Shrinks the image in place so its longest edge is at most max_dimension."""
+    size = settings.max_dimension
+    if image.width > size or image.height > size:
+        # reducing_gap lets Pillow do a cheap integer reduce before the real filter
+        image.thumbnail((size, size), RESAMPLE_FILTERS[settings.resample], reducing_gap=2.0)
+    return image
+
+
+def _encode_once(image: Image.Image, fmt: str, quality: int) -> bytes:
+    if fmt in ("JPEG", "WEBP") and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    buf = io.BytesIO()
+    if fmt == "PNG":
+        image.save(buf, format="PNG", compress_level=1)
+    elif fmt == "WEBP":
+        image.save(buf, format="WEBP", quality=quality, method=0)
+    else:
+        image.save(buf, format="JPEG", quality=quality, optimize=False)
+    return buf.getvalue()
+
+
+def encode(image: Image.Image, settings: EncodeSettings) -> tuple[bytes, str, EncodeSettings]:
+    """
+    Encodes an already downscaled image.
+
+    Returns:
+        (payload, mime_type, settings actually used) — in ADAPTIVE mode the returned
+        settings name the rung that was chosen.
+    """
+    if settings.format != "ADAPTIVE":
+        data = _encode_once(image, settings.format, settings.quality)
+        return data, MIME_TYPES[settings.format], settings
+
+    smallest = None
+    for fmt, quality in ADAPTIVE_LADDER:
+        data = _encode_once(image, fmt, quality)
+        chosen = replace(settings, format=fmt, quality=quality)
+        if len(data) <= settings.byte_budget:
+            return data, MIME_TYPES[fmt], chosen
+        if smallest is None or len(data) < len(smallest[0]):
+            smallest = (data, MIME_TYPES[fmt], chosen)
+    return smallest
@@ -0,0 +1,381 @@
+# app/computer/tools/screen_sampler.py
+import logging
+import os
+import threading
+import time
+from PIL import Image, ImageDraw
+from .screen_cache import dhash, hamming
+
+logger = logging.getLogger(__name__)
+
+
+# CAPTURE SOURCES
+# A source exposes `size()` and `grab_into(buffer)`, which fills a preallocated
+# RGB image of that size with the current screen contents.
+
+class GdiSource:
+    """
+    Captures the primary screen with a GDI BitBlt into one DIB section created up
+    front (and again only when the resolution changes). Each frame is decoded from
+    that memory straight into the ring buffer's image, so no image is allocated
+    per frame.
+    """
+
+    SRCCOPY = 0x00CC0020
+    CAPTUREBLT = 0x40000000
+    SM_CXSCREEN = 0
+    SM_CYSCREEN = 1
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+
+        class BITMAPINFOHEADER(ctypes.Structure):
+            _fields_ = [("biSize", wintypes.DWORD), ("biWidth", wintypes.LONG), ("biHeight", wintypes.LONG),
+                        ("biPlanes", wintypes.WORD), ("biBitCount", wintypes.WORD), ("biCompression", wintypes.DWORD),
+                        ("biSizeImage", wintypes.DWORD), ("biXPelsPerMeter", wintypes.LONG),
+                        ("biYPelsPerMeter", wintypes.LONG), ("biClrUsed", wintypes.DWORD),
+                        ("biClrImportant", wintypes.DWORD)]
+
+        self._ctypes = ctypes
+        self._BITMAPINFOHEADER = BITMAPINFOHEADER
+        user32, gdi32 = ctypes.windll.user32, ctypes.windll.gdi32
+        # Handles are pointer-sized; the default int return type would truncate them on 64-bit
+        user32.GetDC.restype = ctypes.c_void_p
+        user32.ReleaseDC.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+        gdi32.CreateCompatibleDC.restype = ctypes.c_void_p
+        gdi32.CreateCompatibleDC.argtypes = [ctypes.c_void_p]
+        gdi32.CreateDIBSection.restype = ctypes.c_void_p
+        gdi32.CreateDIBSection.argtypes = [ctypes.c_void_p, ctypes.c_void_p, wintypes.UINT,
+                                           ctypes.POINTER(ctypes.c_void_p), ctypes.c_void_p, wintypes.DWORD]
+        gdi32.SelectObject.restype = ctypes.c_void_p
+        gdi32.SelectObject.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+        gdi32.BitBlt.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+                                 ctypes.c_void_p, ctypes.c_int, ctypes.c_int, wintypes.DWORD]
+        gdi32.DeleteObject.argtypes = [ctypes.c_void_p]
+        gdi32.DeleteDC.argtypes = [ctypes.c_void_p]
+        self._user32 = user32
+        self._gdi32 = gdi32
+        self._screen_dc = self._mem_dc = self._bitmap = None
+        self._pixels = None
+        self._allocated = (0, 0)
+
+    def size(self) -> tuple[int, int]:
+        return self._user32.GetSystemMetrics(self.SM_CXSCREEN), self._user32.GetSystemMetrics(self.SM_CYSCREEN)
+
+    def _allocate(self, size: tuple[int, int]):
+        self.close()
+        ctypes = self._ctypes
+        width, height = size
+        # Negative height: a top-down bitmap, rows in the same order as the PIL image
+        header = self._BITMAPINFOHEADER(biSize=ctypes.sizeof(self._BITMAPINFOHEADER), biWidth=width,
+                                        biHeight=-height, biPlanes=1, biBitCount=32, biCompression=0)
+        bits = ctypes.c_void_p()
+        self._screen_dc = self._user32.GetDC(None)
+        self._mem_dc = self._gdi32.CreateCompatibleDC(self._screen_dc)
+        self._bitmap = self._gdi32.CreateDIBSection(self._mem_dc, ctypes.byref(header), 0, ctypes.byref(bits), None, 0)
+        if not self._bitmap:
+            self.close()
+            raise OSError("CreateDIBSection failed")
+        self._gdi32.SelectObject(self._mem_dc, self._bitmap)
+        self._pixels = (ctypes.c_char * (width * height * 4)).from_address(bits.value)
+        self._allocated = size
+
+    def grab_into(self, buffer: Image.Image):
+        if buffer.size != self._allocated:
+            self._allocate(buffer.size)
+        width, height = buffer.size
+        if not self._gdi32.BitBlt(self._mem_dc, 0, 0, width, height, self._screen_dc, 0, 0,
+                                  self.SRCCOPY | self.CAPTUREBLT):
+            raise OSError("BitBlt failed")
+        buffer.frombytes(self._pixels, "raw", "BGRX")
+
+    def close(self):
+        if self._bitmap:
+            self._gdi32.DeleteObject(self._bitmap)
+        if self._mem_dc:
+            self._gdi32.DeleteDC(self._mem_dc)
+        if self._screen_dc:
+            self._user32.ReleaseDC(None, self._screen_dc)
+        self._screen_dc = self._mem_dc = self._bitmap = None
+        self._pixels = None
+        self._allocated = (0, 0)
+
+
+class PyAutoGuiSource:
+    """
+    Captures the primary screen with pyautogui. pyautogui cannot capture into an
+    existing image, so every frame allocates a screenshot that is then pasted into
+    the ring buffer; GdiSource avoids that where GDI is available.
+    """
+
+    def __init__(self):
+        import pyautogui
+        self._pyautogui = pyautogui
+
+    def size(self) -> tuple[int, int]:
+        return tuple(self._pyautogui.size())
+
+    def grab_into(self, buffer: Image.Image):
+        buffer.paste(self._pyautogui.screenshot())
+
+
+class SyntheticSource:
+    """
+    Fake frame generator for headless runs.
+
+    Draws a static desktop with a box that moves every `change_every` frames, or
+    delegates to `draw(buffer, index)` when given.
+    """
+
+    def __init__(self, size: tuple[int, int] = (1280, 720), change_every: int = 0, draw=None):
+        self._size = size
+        self.change_every = change_every
+        self.draw = draw
+        self.index = 0
+
+    def size(self) -> tuple[int, int]:
+        return self._size
+
+    def grab_into(self, buffer: Image.Image):
+        index = self.index
+        self.index += 1
+        if self.draw is not None:
+            self.draw(buffer, index)
+            return
+        step = index // self.change_every if self.change_every else 0
+        canvas = ImageDraw.Draw(buffer)
+        canvas.rectangle((0, 0, *self._size), fill=(32, 64, 128))
+        x = (step * 97) % max(1, self._size[0] - 200)
+        canvas.rectangle((x, 100, x + 200, 250), fill=(240, 240, 240))
+
+
+class ScreenSampler:
+    """
+    Background thread that keeps the most recent screen frames in a ring buffer.
+
+    The ring is a fixed set of preallocated images that are overwritten in turn, so
+    steady-state sampling allocates no new frame buffers. Each slot also keeps its
+    capture time and difference hash for cheap "has the screen settled" checks.
+
+    Args:
+        source: Capture source (see PyAutoGuiSource / SyntheticSource).
+        fps: Frames captured per second.
+        capacity: Number of frames kept (at least 2).
+    """
+
+    def __init__(self, source, fps: float = 4.0, capacity: int = 8):
+        self.source = source
+        self.fps = fps
+        self.capacity = max(2, capacity)
+        self._lock = threading.Lock()
+        self._new_frame = threading.Condition(self._lock)
+        self._stop = threading.Event()
+        self._thread = None
+        self._close_source = False
+        self._source_closed = False
+        self._close_lock = threading.Lock()
+        self._allocate(source.size())
+        self.frames_captured = 0
+        self.errors = 0
+
+    def _allocate(self, size: tuple[int, int]):
+        self._size = size
+        self._buffers = [Image.new("RGB", size) for _ in range(self.capacity)]
+        self._timestamps = [0.0] * self.capacity
+        self._hashes = [0] * self.capacity
+        self._head = -1
+        self._count = 0
+
+    # LIFECYCLE
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="screen-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0, close_source: bool = False):
+        """
+        Stops the capture thread. With `close_source` the source is closed too, but
+        only once the thread has exited: a thread still capturing after `timeout`
+        closes it itself on its way out.
+        """
+        self._close_source = close_source
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+        if close_source and (thread is None or not thread.is_alive()):
+            self._close()
+
+    def _close(self):
+        with self._close_lock:
+            if self._source_closed:
+                return
+            self._source_closed = True
+        close = getattr(self.source, "close", None)
+        if close is not None:
+            close()
+
+    def _run(self):
+        interval = 1.0 / self.fps
+        try:
+            while not self._stop.is_set():
+                started = time.monotonic()
+                try:
+                    self.capture_once()
+                except Exception as e:
+                    self.errors += 1
+                    logger.warning("Screen sampler error: %s", e)
+                self._stop.wait(max(0.0, interval - (time.monotonic() - started)))
+        finally:
+            if self._close_source:
+                self._close()
+
+    def capture_once(self):
+        """Captures one frame into the next ring slot."""
+        size = self.source.size()
+        if size != self._size:
+            with self._lock:
+                self._allocate(size)
+
+        # The writer never touches the head slot, so readers can copy it under the lock
+        slot = (self._head + 1) % self.capacity
+        buffer = self._buffers[slot]
+        self.source.grab_into(buffer)
+        frame_hash = dhash(buffer)
+
+        with self._new_frame:
+            self._timestamps[slot] = time.monotonic()
+            self._hashes[slot] = frame_hash
+            self._head = slot
+            self._count = min(self._count + 1, self.capacity)
+            self.frames_captured += 1
+            self._new_frame.notify_all()
+
+    # READERS
+
+    def latest(self, max_age: float | None = None) -> tuple[Image.Image, float] | None:
+        """
+        Returns (copy of the newest frame, its age in seconds), or None when the
+        buffer is empty or the newest frame is older than `max_age`.
+        """
+        with self._lock:
+            if self._head < 0:
+                return None
+            age = time.monotonic() - self._timestamps[self._head]
+            if max_age is not None and age > max_age:
+                return None
+            return self._buffers[self._head].copy(), age
+
+    def history(self) -> list[tuple[float, int]]:
+        """Returns (timestamp, hash) pairs for the buffered frames, oldest first."""
+        with self._lock:
+            slots = [(self._head - i) % self.capacity for i in range(self._count)]
+            return [(self._timestamps[s], self._hashes[s]) for s in reversed(slots)]
+
+    def wait_for_frame(self, after: float, timeout: float) -> bool:
+        """Blocks until a frame newer than `after` (monotonic time) is captured."""
+        deadline = time.monotonic() + timeout
+        with self._new_frame:
+            while self._head < 0 or self._timestamps[self._head] <= after:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._new_frame.wait(remaining)
+            return True
+
+    def wait_until_settled(self, quiet: float = 0.5, timeout: float = 5.0, tolerance: int = 2) -> dict:
+        """
+        Waits until the buffered frames have stayed visually identical for `quiet`
+        seconds, or `timeout` elapses.
+
+        Returns:
+            {"settled": bool, "settle_ms": time waited, "frames": frames inspected}
+        """
+        start = time.monotonic()
+        deadline = start + timeout
+        frames = 0
+        while True:
+            history = self.history()
+            if history:
+                frames = len(history)
+                newest_ts, newest_hash = history[-1]
+                stable_since = newest_ts
+                for ts, frame_hash in reversed(history[:-1]):
+                    if hamming(frame_hash, newest_hash) > tolerance:
+                        break
+                    stable_since = ts
+                if newest_ts - stable_since >= quiet:
+                    return {"settled": True, "settle_ms": round((time.monotonic() - start) * 1000, 1), "frames": frames}
+            now = time.monotonic()
+            if now >= deadline:
+                return {"settled": False, "settle_ms": round((now - start) * 1000, 1), "frames": frames}
+            self.wait_for_frame(history[-1][0] if history else 0.0, deadline - now)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "running": self.running,
+                "fps": self.fps,
+                "capacity": self.capacity,
+                "buffered": self._count,
+                "frames_captured": self.frames_captured,
+                "errors": self.errors,
+            }
+
+
+_screen_sampler = None
+
+
+def get_screen_sampler() -> ScreenSampler | None:
+    """Returns the process-wide sampler if one was started."""
+    return _screen_sampler
+
+
+def start_screen_sampler(source=None) -> ScreenSampler | None:
+    """
+    Starts the background sampler when SCREEN_SAMPLER_FPS > 0 (or a source is given).
+
+    Environment:
+        SCREEN_SAMPLER_FPS (default 0, disabled), SCREEN_SAMPLER_FRAMES (default 8),
+        SCREEN_SAMPLER_SOURCE ("gdi", "pyautogui" or "synthetic"; gdi falls back to
+        pyautogui where it is unavailable).
+    """
+    global _screen_sampler
+    fps = float(os.environ.get("SCREEN_SAMPLER_FPS", "0"))
+    if source is None:
+        if fps <= 0:
+            return None
+        kind = os.environ.get("SCREEN_SAMPLER_SOURCE", "gdi")
+        if kind == "synthetic":
+            source = SyntheticSource()
+        elif kind == "pyautogui":
+            source = PyAutoGuiSource()
+        else:
+            try:
+                source = GdiSource()
+            except (ImportError, AttributeError, OSError):
+                source = PyAutoGuiSource()
+    stop_screen_sampler()
+    _screen_sampler = ScreenSampler(
+        source,
+        fps=fps if fps > 0 else 4.0,
+        capacity=int(os.environ.get("SCREEN_SAMPLER_FRAMES", "8")),
+    )
+    _screen_sampler.start()
+    return _screen_sampler
+
+
+def stop_screen_sampler():
+    global _screen_sampler
+    if _screen_sampler is not None:
+        _screen_sampler.stop(close_source=True)
+    _screen_sampler = None
@@ -0,0 +1,130 @@
+# app/computer/tools/settle.py
+import os
+import time
+from .screen_cache import dhash, hamming
+from .screen_sampler import get_screen_sampler
+
+SETTLE_TIMEOUT = float(os.environ.get("SETTLE_TIMEOUT", "2.0"))
+SETTLE_QUIET = float(os.environ.get("SETTLE_QUIET", "0.2"))
+SETTLE_REACT = float(os.environ.get("SETTLE_REACT", "0.3"))
+
+
+def default_frame_source(since: float | None = None):
+    """
+    Returns (grab, poll_interval): the background sampler's newest frame when it is
+    running, otherwise a direct pyautogui capture. Sampler frames captured before
+    `since` (monotonic time) are skipped: grab returns None until a newer one exists.
+    """
+    sampler = get_screen_sampler()
+    if sampler is not None and sampler.running:
+        def grab():
+            frame = sampler.latest()
+            if frame is None:
+                return None
+            image, age = frame
+            if since is not None and time.monotonic() - age < since:
+                return None
+            return image
+        return grab, 1.0 / sampler.fps
+
+    import pyautogui
+    return pyautogui.screenshot, 0.05
+
+
+def default_window_source():
+    """Returns a callable giving the foreground window handle, or None if unavailable."""
+    try:
+        import win32gui
+    except ImportError:
+        return None
+    return win32gui.GetForegroundWindow
+
+
+def wait_for_settle(
+    frame_source=None,
+    window_source=None,
+    timeout: float = SETTLE_TIMEOUT,
+    quiet: float = SETTLE_QUIET,
+    poll_interval: float | None = None,
+    tolerance: int = 2,
+    react_within: float = SETTLE_REACT,
+    expect_change: bool = False,
+    since: float | None = None,
+) -> dict:
+    """
+    Waits until the UI stops reacting to an input action.
+
+    Only frames captured after `since` count, and the first of them is the
+    baseline. Once the screen (or the foreground window) has changed, it is
+    settled after `quiet` seconds without further change. If nothing has changed,
+    the quiet window only counts once `react_within` seconds have passed since the
+    action, so a UI that is slow to start reacting is not declared settled; with
+    `expect_change` a change is required. Gives up after `timeout` seconds.
+
+    Args:
+        frame_source: Callable returning the current screen as a PIL image, or None
+                      while no frame captured after `since` is available.
+        window_source: Callable returning the foreground window handle.
+        timeout: Maximum seconds to wait.
+        quiet: Seconds without change required to call the screen settled.
+        poll_interval: Seconds between samples (defaults to the source's rate).
+        tolerance: Hash bits that may differ between frames counted as identical.
+        react_within: Seconds to wait for a first change before an unchanged screen counts as settled.
+        expect_change: Only settle after the screen or foreground window changed.
+        since: Monotonic time the action ended (default: now).
+
+    Returns:
+        {"settled", "settle_ms", "screen_changed", "window_changed"}
+    """
+    start = time.monotonic()
+    since = start if since is None else since
+    if frame_source is None:
+        frame_source, default_interval = default_frame_source(since)
+    else:
+        default_interval = 0.05
+    if window_source is None:
+        window_source = default_window_source()
+    interval = poll_interval if poll_interval is not None else default_interval
+
+    deadline = start + timeout
+    frame = frame_source()
+    previous_hash = dhash(frame) if frame is not None else None
+    previous_window = window_source() if window_source else None
+    stable_since = start
+    screen_changed = window_changed = False
+
+    while True:
+        time.sleep(interval)
+        now = time.monotonic()
+
+        frame = frame_source()
+        if frame is not None:
+            frame_hash = dhash(frame)
+            if previous_hash is None:
+                # First frame captured after the action: the quiet window starts here
+                stable_since = now
+            elif hamming(frame_hash, previous_hash) > tolerance:
+                screen_changed = True
+                stable_since = now
+            previous_hash = frame_hash
+
+        if window_source:
+            window = window_source()
+            if window != previous_window:
+                window_changed = True
+                stable_since = now
+                previous_window = window
+
+        changed = screen_changed or window_changed
+        settled = (
+            previous_hash is not None
+            and now - stable_since >= quiet
+            and (changed or (not expect_change and now - since >= react_within))
+        )
+        if settled or now >= deadline:
+            return {
+                "settled": settled,
+                "settle_ms": round((now - start) * 1000, 1),
+                "screen_changed": screen_changed,
+                "window_changed": window_changed,
+            }
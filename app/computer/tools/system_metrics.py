@@ -0,0 +1,303 @@
+# app/computer/tools/system_metrics.py
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+METRICS_INTERVAL = float(os.environ.get("METRICS_INTERVAL", "1.0"))
+METRICS_HISTORY = int(os.environ.get("METRICS_HISTORY", "300"))
+
+# Metrics that window summaries are computed for
+SUMMARY_METRICS = ("cpu", "memory_percent", "disk_read_bps", "disk_write_bps", "net_sent_bps", "net_recv_bps", "battery_percent")
+
+
+# METRIC SOURCES
+# A source exposes `read() -> dict` returning instantaneous values and cumulative
+# counters: cpu_per_core (percent since the previous read on the same thread), memory_percent,
+# memory_used, memory_total, disk_read_bytes, disk_write_bytes, net_sent_bytes,
+# net_recv_bytes, battery_percent, battery_plugged, battery_secs_left (None when
+# unknown); and `boot_time() -> float` (epoch seconds).
+
+class PsutilSource:
+    """Reads system counters with psutil; every call is non-blocking."""
+
+    def __init__(self):
+        import psutil
+        self._psutil = psutil
+        self._boot_time = psutil.boot_time()
+
+    def read(self) -> dict:
+        psutil = self._psutil
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_io_counters()
+        net = psutil.net_io_counters()
+        battery = psutil.sensors_battery()
+        secs_left = battery.secsleft if battery is not None and battery.secsleft >= 0 else None
+        return {
+            "cpu_per_core": psutil.cpu_percent(percpu=True),
+            "memory_percent": memory.percent,
+            "memory_used": memory.used,
+            "memory_total": memory.total,
+            "disk_read_bytes": disk.read_bytes if disk else None,
+            "disk_write_bytes": disk.write_bytes if disk else None,
+            "net_sent_bytes": net.bytes_sent if net else None,
+            "net_recv_bytes": net.bytes_recv if net else None,
+            "battery_percent": battery.percent if battery is not None else None,
+            "battery_plugged": battery.power_plugged if battery is not None else None,
+            "battery_secs_left": secs_left,
+        }
+
+    def boot_time(self) -> float:
+        return self._boot_time
+
+
+def _rate(current, previous, key: str, elapsed: float):
+    if previous is None or elapsed <= 0 or current[key] is None or previous[key] is None:
+        return None
+    # Counters can wrap or reset (e.g. a network adapter reconnecting)
+    return round(max(0.0, (current[key] - previous[key]) / elapsed), 1)
+
+
+def _trend(points: list[tuple[float, float]]) -> float | None:
+    """Least-squares slope of (time, value) points, per minute."""
+    if len(points) < 2:
+        return None
+    n = len(points)
+    mean_t = sum(t for t, _ in points) / n
+    mean_v = sum(v for _, v in points) / n
+    var = sum((t - mean_t) ** 2 for t, _ in points)
+    if var == 0:
+        return None
+    return sum((t - mean_t) * (v - mean_v) for t, v in points) / var * 60
+
+
+class MetricsSampler:
+    """
+    Background thread that polls system metrics into a ring buffer of samples.
+
+    Tools read the newest sample instead of probing psutil (or sleeping a second
+    for CPU usage) on every call, and can summarise the buffered history over a
+    window: average, min, max and trend.
+
+    Args:
+        source: Metric source (see PsutilSource).
+        interval: Seconds between samples.
+        capacity: Samples kept; capacity * interval is the longest window available.
+    """
+
+    def __init__(self, source, interval: float = METRICS_INTERVAL, capacity: int = METRICS_HISTORY):
+        self.source = source
+        self.interval = interval
+        self.capacity = max(2, capacity)
+        self._samples = deque(maxlen=self.capacity)
+        self._previous = None      # (monotonic time, raw counters) of the last read
+        self._lock = threading.Lock()
+        self._new_sample = threading.Condition(self._lock)
+        self._stop = threading.Event()
+        self._thread = None
+        self.samples_taken = 0
+        self.errors = 0
+
+    # LIFECYCLE
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        # CPU usage is measured since the previous read, and psutil keeps that baseline
+        # per thread, so a first read on this thread only sets the baselines; the
+        # first sample then covers a full interval
+        try:
+            with self._lock:
+                self._previous = (time.monotonic(), self.source.read())
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Metrics sampler error: %s", e)
+        next_at = time.monotonic() + self.interval
+        while not self._stop.wait(max(0.0, next_at - time.monotonic())):
+            try:
+                self.sample_once()
+            except Exception as e:
+                self.errors += 1
+                logger.warning("Metrics sampler error: %s", e)
+            next_at = max(next_at + self.interval, time.monotonic())
+
+    def sample_once(self) -> dict:
+        """
+        Reads the source once, derives rates from the previous read and appends the
+        sample. Called from the sampler thread only: CPU usage is measured since the
+        previous read, so reads from other threads would shorten the interval.
+        """
+        raw = self.source.read()
+        now = time.monotonic()
+        with self._lock:
+            previous_time, previous = self._previous or (now, None)
+        elapsed = now - previous_time
+        cores = raw["cpu_per_core"]
+        sample = {
+            "t": now,
+            "time": round(time.time(), 3),
+            "cpu": round(sum(cores) / len(cores), 1) if cores else None,
+            "cpu_per_core": cores,
+            "memory_percent": raw["memory_percent"],
+            "memory_used": raw["memory_used"],
+            "memory_total": raw["memory_total"],
+            "disk_read_bps": _rate(raw, previous, "disk_read_bytes", elapsed),
+            "disk_write_bps": _rate(raw, previous, "disk_write_bytes", elapsed),
+            "net_sent_bps": _rate(raw, previous, "net_sent_bytes", elapsed),
+            "net_recv_bps": _rate(raw, previous, "net_recv_bytes", elapsed),
+            "battery_percent": raw["battery_percent"],
+            "battery_plugged": raw["battery_plugged"],
+            "battery_secs_left": raw["battery_secs_left"],
+        }
+        with self._new_sample:
+            self._previous = (now, raw)
+            self._samples.append(sample)
+            self.samples_taken += 1
+            self._new_sample.notify_all()
+        return sample
+
+    # READERS
+
+    def latest(self, timeout: float = 0.0) -> dict:
+        """
+        The newest sample with its age in seconds. Right after start the buffer is
+        empty until the first full interval has been measured; this waits up to
+        `timeout` seconds for it. The metric tools run inline on the event loop, so
+        they never wait and report the missing sample instead.
+
+        Raises:
+            RuntimeError: when no sample arrives in time.
+        """
+        with self._new_sample:
+            if not self._samples and self.running and timeout > 0:
+                self._new_sample.wait_for(lambda: bool(self._samples), timeout)
+            if not self._samples:
+                raise RuntimeError("No system metrics sampled yet; try again in a moment")
+            sample = self._samples[-1]
+        return {**sample, "age": round(time.monotonic() - sample["t"], 2)}
+
+    def window(self, seconds: float) -> list[dict]:
+        """Samples from the last `seconds`, oldest first."""
+        cutoff = time.monotonic() - seconds
+        with self._lock:
+            return [s for s in self._samples if s["t"] >= cutoff]
+
+    def summary(self, seconds: float, metrics: tuple = SUMMARY_METRICS) -> dict:
+        """
+        Per metric over the last `seconds`: avg, min, max and trend (change per minute).
+
+        Returns:
+            {"window_seconds": span actually covered, "samples": n, <metric>: {...}}
+        """
+        samples = self.window(seconds)
+        result = {
+            "window_seconds": round(samples[-1]["t"] - samples[0]["t"], 1) if samples else 0.0,
+            "samples": len(samples),
+        }
+        for metric in metrics:
+            points = [(s["t"], s[metric]) for s in samples if s[metric] is not None]
+            if not points:
+                continue
+            values = [v for _, v in points]
+            trend = _trend(points)
+            result[metric] = {
+                "avg": round(sum(values) / len(values), 1),
+                "min": round(min(values), 1),
+                "max": round(max(values), 1),
+                "trend_per_min": round(trend, 1) if trend is not None else None,
+            }
+        return result
+
+    def boot_time(self) -> float:
+        return self.source.boot_time()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "running": self.running,
+                "interval": self.interval,
+                "capacity": self.capacity,
+                "buffered": len(self._samples),
+                "samples_taken": self.samples_taken,
+                "errors": self.errors,
+            }
+
+
+_metrics_sampler = None
+_sampler_stopped = False
+_sampler_lock = threading.Lock()
+
+
+def get_metrics_sampler() -> MetricsSampler:
+    """Returns the process-wide sampler, starting it on first use (but not after stop_metrics_sampler)."""
+    global _metrics_sampler
+    with _sampler_lock:
+        if _sampler_stopped:
+            raise RuntimeError("Metrics sampler is stopped")
+        if _metrics_sampler is None:
+            _metrics_sampler = MetricsSampler(PsutilSource())
+            _metrics_sampler.start()
+        return _metrics_sampler
+
+
+def start_metrics_sampler(source=None) -> MetricsSampler:
+    """
+    Starts the background sampler (replacing a running one).
+
+    Environment:
+        METRICS_INTERVAL (seconds between samples, default 1.0),
+        METRICS_HISTORY (samples kept, default 300).
+    """
+    global _metrics_sampler, _sampler_stopped
+    with _sampler_lock:
+        if _metrics_sampler is not None:
+            _metrics_sampler.stop()
+        _sampler_stopped = False
+        _metrics_sampler = MetricsSampler(source or PsutilSource())
+        _metrics_sampler.start()
+        return _metrics_sampler
+
+
+def stop_metrics_sampler():
+    """Stops the sampler for shutdown; tools then report an error instead of starting a new one."""
+    global _metrics_sampler, _sampler_stopped
+    with _sampler_lock:
+        if _metrics_sampler is not None:
+            _metrics_sampler.stop()
+        _metrics_sampler = None
+        _sampler_stopped = True
+
+
+def get_system_metrics(window_seconds: int = 60) -> dict:
+    """
+    Current CPU, memory, disk, network and battery readings plus their average,
+    min, max and trend over the last `window_seconds` (up to the sampler's history).
+
+    Returns:
+        latest: newest sample (CPU per core, rates in bytes/second); window: summaries.
+    """
+    try:
+        sampler = get_metrics_sampler()
+        latest = sampler.latest()
+        latest.pop("t")
+        return {"status": "success", "latest": latest, "window": sampler.summary(window_seconds)}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
@@ -0,0 +1,272 @@
+# app/computer/tools/text_entry.py
+import os
+import random
+import time
+
+PASTE_THRESHOLD = int(os.environ.get("TYPING_PASTE_THRESHOLD", "200"))
+HUMAN_TYPING_BUDGET = float(os.environ.get("HUMAN_TYPING_BUDGET", "4.0"))
+
+PASTE = "paste"
+KEYS = "keys"
+HUMAN = "human"
+
+
+# KEY BACKENDS
+# A key backend exposes `send_text(text)` (emits the characters as key events, as
+# fast as the OS accepts them), `supports(text)`, `hotkey(*keys)` and the clipboard
+# as `get_clipboard()` / `set_clipboard(text)`.
+
+class SendInputBackend:
+    """
+    Windows SendInput with KEYEVENTF_UNICODE: a whole chunk of text becomes one
+    SendInput call, and any Unicode character can be typed regardless of layout.
+    """
+
+    KEYEVENTF_KEYUP = 0x0002
+    KEYEVENTF_UNICODE = 0x0004
+    INPUT_KEYBOARD = 1
+    VK_RETURN = 0x0D
+    VK_TAB = 0x09
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+        import pyautogui
+        import pyperclip
+
+        class MOUSEINPUT(ctypes.Structure):
+            _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG), ("mouseData", wintypes.DWORD),
+                        ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+
+        class KEYBDINPUT(ctypes.Structure):
+            _fields_ = [("wVk", wintypes.WORD), ("wScan", wintypes.WORD), ("dwFlags", wintypes.DWORD),
+                        ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+
+        class _INPUTUNION(ctypes.Union):
+            _fields_ = [("mi", MOUSEINPUT), ("ki", KEYBDINPUT)]
+
+        class INPUT(ctypes.Structure):
+            _fields_ = [("type", wintypes.DWORD), ("union", _INPUTUNION)]
+
+        self._ctypes = ctypes
+        self._KEYBDINPUT = KEYBDINPUT
+        self._INPUT = INPUT
+        self._user32 = ctypes.windll.user32
+        self._pyautogui = pyautogui
+        self._pyperclip = pyperclip
+
+    def _key(self, vk: int, scan: int, flags: int):
+        ki = self._KEYBDINPUT(wVk=vk, wScan=scan, dwFlags=flags, time=0, dwExtraInfo=0)
+        event = self._INPUT(type=self.INPUT_KEYBOARD)
+        event.union.ki = ki
+        return event
+
+    def _events(self, text: str) -> list:
+        events = []
+        for char in text.replace("\r\n", "\n"):
+            if char in "\n\t":
+                vk = self.VK_RETURN if char == "\n" else self.VK_TAB
+                events += [self._key(vk, 0, 0), self._key(vk, 0, self.KEYEVENTF_KEYUP)]
+                continue
+            encoded = char.encode("utf-16-le")
+            # Characters outside the BMP are sent as their two surrogate code units
+            for i in range(0, len(encoded), 2):
+                unit = int.from_bytes(encoded[i:i + 2], "little")
+                events += [
+                    self._key(0, unit, self.KEYEVENTF_UNICODE),
+                    self._key(0, unit, self.KEYEVENTF_UNICODE | self.KEYEVENTF_KEYUP),
+                ]
+        return events
+
+    def send_text(self, text: str):
+        events = self._events(text)
+        if not events:
+            return
+        array = (self._INPUT * len(events))(*events)
+        sent = self._user32.SendInput(len(events), array, self._ctypes.sizeof(self._INPUT))
+        if sent != len(events):
+            raise OSError(f"SendInput delivered {sent} of {len(events)} key events (blocked by a higher-integrity window?)")
+
+    def supports(self, text: str) -> bool:
+        return True
+
+    def hotkey(self, *keys: str):
+        self._pyautogui.hotkey(*keys)
+
+    def get_clipboard(self) -> str:
+        return self._pyperclip.paste()
+
+    def set_clipboard(self, text: str):
+        self._pyperclip.copy(text)
+
+
+class PyAutoGuiBackend:
+    """pyautogui.typewrite in one call per chunk; only characters on a US keyboard can be typed."""
+
+    def __init__(self):
+        import pyautogui
+        import pyperclip
+        self._pyautogui = pyautogui
+        self._pyperclip = pyperclip
+
+    def send_text(self, text: str):
+        self._pyautogui.typewrite(text, interval=0)
+
+    def supports(self, text: str) -> bool:
+        return all(" " <= c <= "~" or c in "\n\t" for c in text)
+
+    def hotkey(self, *keys: str):
+        self._pyautogui.hotkey(*keys)
+
+    def get_clipboard(self) -> str:
+        return self._pyperclip.paste()
+
+    def set_clipboard(self, text: str):
+        self._pyperclip.copy(text)
+
+
+class RecordingBackend:
+    """Records what would be typed, with timestamps, instead of sending input."""
+
+    def __init__(self, clipboard: str = "", ascii_only: bool = False):
+        self.clipboard = clipboard
+        self.ascii_only = ascii_only
+        self.events = []         # (monotonic time, kind, payload)
+
+    def send_text(self, text: str):
+        self.events.append((time.monotonic(), "text", text))
+
+    def supports(self, text: str) -> bool:
+        return not self.ascii_only or text.isascii()
+
+    def hotkey(self, *keys: str):
+        self.events.append((time.monotonic(), "hotkey", keys))
+        if keys == ("ctrl", "v"):
+            self.events.append((time.monotonic(), "pasted", self.clipboard))
+
+    def get_clipboard(self) -> str:
+        return self.clipboard
+
+    def set_clipboard(self, text: str):
+        self.clipboard = text
+
+    def typed(self) -> str:
+        return "".join(payload for _, kind, payload in self.events if kind in ("text", "pasted"))
+
+
+def default_backend():
+    try:
+        return SendInputBackend()
+    except (ImportError, AttributeError, OSError):
+        return PyAutoGuiBackend()
+
+
+# ENGINE
+
+class TextEntry:
+    """
+    Types text in the cheapest mode that suits it.
+
+    - paste: puts the text on the clipboard, sends Ctrl+V and restores the previous
+      clipboard contents afterwards. Used for long text and for characters the
+      backend cannot type.
+    - keys: sends the text as key events in chunks of `chunk_size` characters.
+    - human: key events in short bursts with random pauses, spread over a total
+      time budget instead of a fixed per-character delay.
+
+    Args:
+        backend: Key backend (see above).
+        paste_threshold: Length from which "auto" pastes instead of typing.
+        chunk_size: Characters per batch of key events.
+        restore_delay: Seconds to wait after Ctrl+V before restoring the clipboard,
+                       since the target app reads it asynchronously.
+        sleep: Sleep function (swappable to run without waiting).
+    """
+
+    def __init__(
+        self,
+        backend,
+        paste_threshold: int = PASTE_THRESHOLD,
+        chunk_size: int = 32,
+        restore_delay: float = 0.15,
+        sleep=time.sleep,
+    ):
+        self.backend = backend
+        self.paste_threshold = paste_threshold
+        self.chunk_size = chunk_size
+        self.restore_delay = restore_delay
+        self.sleep = sleep
+
+    def choose_mode(self, text: str, mode: str = "auto") -> str:
+        if mode not in ("auto", PASTE, KEYS, HUMAN):
+            raise ValueError(f"Unknown typing mode '{mode}'. Use auto, paste, keys or human")
+        # Characters the backend cannot type would be dropped, so they are always pasted
+        if mode == PASTE or not self.backend.supports(text):
+            return PASTE
+        if mode == "auto":
+            return PASTE if len(text) >= self.paste_threshold else KEYS
+        return mode
+
+    def _paste(self, text: str):
+        try:
+            previous = self.backend.get_clipboard()
+        except Exception:
+            previous = None
+        self.backend.set_clipboard(text)
+        try:
+            self.backend.hotkey("ctrl", "v")
+            self.sleep(self.restore_delay)
+        finally:
+            if previous is not None:
+                self.backend.set_clipboard(previous)
+
+    def _keys(self, text: str):
+        for i in range(0, len(text), self.chunk_size):
+            self.backend.send_text(text[i:i + self.chunk_size])
+
+    def _human(self, text: str, budget: float, rng: random.Random):
+        # Bursts of 1-4 characters; longer pauses after spaces and punctuation
+        bursts, i = [], 0
+        while i < len(text):
+            n = rng.randint(1, 4)
+            bursts.append(text[i:i + n])
+            i += n
+        weights = [rng.uniform(0.6, 1.4) * (2.5 if burst[-1] in " .,;:!?\n" else 1.0) for burst in bursts]
+        scale = budget / sum(weights) if weights else 0.0
+        for burst, weight in zip(bursts, weights):
+            self.backend.send_text(burst)
+            self.sleep(weight * scale)
+
+    def enter(self, text: str, mode: str = "auto", budget: float = HUMAN_TYPING_BUDGET, seed: int | None = None) -> dict:
+        """
+        Types `text` and reports the mode used and the achieved speed.
+
+        Args:
+            mode: auto, paste, keys or human.
+            budget: Total seconds a human-mode entry may take (capped at 60 ms per character).
+        """
+        chosen = self.choose_mode(text, mode)
+        start = time.perf_counter()
+        if chosen == PASTE:
+            self._paste(text)
+        elif chosen == KEYS:
+            self._keys(text)
+        else:
+            self._human(text, min(budget, 0.06 * len(text)), random.Random(seed))
+        elapsed = time.perf_counter() - start
+        return {
+            "mode": chosen,
+            "chars": len(text),
+            "elapsed_ms": round(elapsed * 1000, 1),
+            "chars_per_sec": round(len(text) / elapsed, 1) if elapsed > 0 else None,
+        }
+
+
+_text_entry = None
+
+
+def get_text_entry() -> TextEntry:
+    global _text_entry
+    if _text_entry is None:
+        _text_entry = TextEntry(default_backend())
+    return _text_entry
@@ -1,14 +1,73 @@
 # app/computer/tools/vision.py
+import logging
 import os
-import io
 import pyautogui
-from PIL import Image
-from google.genai import Client, types
-from dotenv import load_dotenv
+from google.genai import types
+from .vision_client import get_vision_client
+from .screen_cache import VisionCache, normalize_question, screen_digest
+from .screen_diff import ScreenDiff
+from .screen_encode import settings_from_env, downscale, encode
+from .screen_sampler import get_screen_sampler
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-def analyze_screen(question: str = "Describe the visible content on the screen in detail.") -> dict:
+# Answers for a pixel-identical screen and the same question are reused
+vision_cache = VisionCache(
+    max_entries=int(os.environ.get("VISION_CACHE_SIZE", "64")),
+    ttl=float(os.environ.get("VISION_CACHE_TTL", "30")),
+)
+
+# When only a small part of the screen changed since the last full look, only that part is sent
+screen_diff = ScreenDiff(
+    max_region_fraction=float(os.environ.get("VISION_DIFF_MAX_REGION", "0.25")),
+)
+VISION_DIFF_ENABLED = os.environ.get("VISION_DIFF", "1") != "0"
+
+# Format, quality, resize filter and size cap for uploaded screenshots
+encode_settings = settings_from_env()
+
+DEFAULT_QUESTION = "Describe the visible content on the screen in detail."
+
+
+def _capture():
+    """Newest frame from the background sampler when it is fresh, else a direct capture."""
+    sampler = get_screen_sampler()
+    if sampler is not None and sampler.running:
+        frame = sampler.latest(max_age=2.0 / sampler.fps)
+        if frame is not None:
+            return frame[0]
+    return pyautogui.screenshot()
+
+
+def _diff_context(question: str) -> tuple | None:
+    """
+    The baseline's (question, answer) when a changed region plus that answer can
+    stand for the whole screen: the baseline asked the same question or described
+    the full screen. An answer to another question says nothing about the parts of
+    the screen it did not mention, so those questions need the full frame.
+    """
+    context = screen_diff.context()
+    if context is None:
+        return None
+    prior = normalize_question(context[0])
+    if prior in (normalize_question(question), normalize_question(DEFAULT_QUESTION)):
+        return context
+    return None
+
+
+def _region_prompt(question: str, region: tuple, size: tuple, context: tuple) -> str:
+    prior_question, prior_description = context
+    left, top, right, bottom = region
+    return (
+        f"Earlier the full {size[0]}x{size[1]} screen was analyzed. "
+        f"Question: \"{prior_question}\" Answer: \"{prior_description}\"\n"
+        f"Since then only the region from ({left}, {top}) to ({right}, {bottom}) has changed. "
+        f"The image shows just that region. Using it together with the earlier answer, "
+        f"answer about the whole current screen: {question}"
+    )
+
+
+def analyze_screen(question: str = DEFAULT_QUESTION) -> dict:
     """
     Captures the current screen and asks a vision AI model to describe it or answer a question about it.
     Use this when you need to 'see' or know what is on the user's screen.
@@ -19,46 +78,52 @@ def analyze_screen(question: str = "Describe the visible content on the screen i
     """
     try:
         # 1. Capture Screen
-        screenshot = pyautogui.screenshot()
+        screenshot = _capture()
         
-        # Resize if necessary to speed up upload/processing (optional, keeping it efficient)
-        max_dimension = 1024
-        if screenshot.width > max_dimension or screenshot.height > max_dimension:
-            screenshot.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+        # Resize to speed up upload/processing
+        downscale(screenshot, encode_settings)
+
+        # Skip the model entirely if this screen was already answered
+        screen_key = screen_digest(screenshot)
+        cached = vision_cache.get(screen_key, question)
+        if cached is not None:
+            return {"status": "success", "description": cached, "cached": True}
+
+        # Send only the dirty region when the rest of the screen is unchanged and already described
+        context = _diff_context(question) if VISION_DIFF_ENABLED else None
+        region = screen_diff.changed_region(screenshot) if context is not None else None
+        if region is not None:
+            image = screenshot.crop(region)
+            prompt = _region_prompt(question, region, screenshot.size, context)
+        else:
+            region = None
+            image = screenshot
+            prompt = question
 
         # Convert to Bytes
-        img_byte_arr = io.BytesIO()
-        screenshot.save(img_byte_arr, format='PNG')
-        png_bytes = img_byte_arr.getvalue()
-
-        # 2. Initialize Client (Stateless call to vision model)
-        api_key = os.environ.get("GOOGLE_API_KEY")
-        if not api_key:
-            return {"status": "error", "message": "GOOGLE_API_KEY not found in environment."}
-        
-        client = Client(api_key=api_key)
+        image_bytes, mime_type, _ = encode(image, encode_settings)
+
+        # 2. Reuse the shared, pooled vision client
+        client = get_vision_client()
 
         # 3. Call the Vision Model (The "Image Agent")
-        # Using the Flash model for speed
-        response = client.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=[
-                types.Content(
-                    role="user",
-                    parts=[
-                        types.Part.from_bytes(data=png_bytes, mime_type="image/png"),
-                        types.Part.from_text(text=question)
-                    ]
-                )
-            ]
-        )
+        description, _ = client.generate([
+            types.Part.from_bytes(data=image_bytes, mime_type=mime_type),
+            types.Part.from_text(text=prompt)
+        ])
+        vision_cache.put(screen_key, question, description)
+        if region is None:
+            screen_diff.set_baseline(screenshot, question, description)
         
         # 4. Return the description
-        return {
+        result = {
             "status": "success", 
-            "description": response.text
+            "description": description
         }
+        if region is not None:
+            result["region"] = list(region)
+        return result
 
     except Exception as e:
-        print(f"Vision tool error: {e}")
+        logger.exception("Vision tool error: %s", e)
         return {"status": "error", "message": str(e)}
@@ -0,0 +1,235 @@
+# app/computer/tools/vision_client.py
+import logging
+import os
+import threading
+import time
+import httpx
+from google.genai import Client, types
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+
+class VisionClient:
+    """
+    Process-wide Gemini client used by analyze_screen.
+
+    One underlying HTTP client is kept for the lifetime of the process so its
+    keep-alive connection pool is reused between screen looks. In-flight requests
+    are capped by a semaphore and every call records how long it spent waiting,
+    connecting, uploading the screenshot and waiting on the model.
+
+    Args:
+        api_key: Gemini API key.
+        model: Vision model name.
+        base_url: Optional endpoint override (e.g. a local stand-in HTTP server).
+        max_concurrency: Maximum number of vision requests in flight at once.
+        pool_size: Maximum number of pooled keep-alive connections.
+        keepalive_expiry: Seconds an idle pooled connection is kept open.
+        timeout_ms: Optional per-request timeout in milliseconds.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = DEFAULT_MODEL,
+        base_url: str | None = None,
+        max_concurrency: int = 4,
+        pool_size: int = 8,
+        keepalive_expiry: float = 60.0,
+        timeout_ms: int | None = None,
+    ):
+        self.api_key = api_key
+        self.model = model
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.pool_size = pool_size
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout_ms = timeout_ms
+
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "calls": 0,
+            "errors": 0,
+            "in_flight": 0,
+            "connections_opened": 0,
+            "queued_ms_total": 0.0,
+            "connect_ms_total": 0.0,
+            "upload_ms_total": 0.0,
+            "model_ms_total": 0.0,
+            "total_ms_total": 0.0,
+            "warm_up_ms": None,
+            "last_call": None,
+        }
+
+    # CLIENT CONSTRUCTION
+
+    @property
+    def client(self) -> Client:
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._build_client()
+        return self._client
+
+    def _build_client(self) -> Client:
+        options = {}
+        if self.base_url:
+            options["base_url"] = self.base_url
+        if self.timeout_ms:
+            options["timeout"] = self.timeout_ms
+
+        # Older SDK releases do not accept httpx client arguments; pooling then
+        # falls back to the SDK defaults and phase timings to wall-clock only.
+        if "client_args" in types.HttpOptions.model_fields:
+            options["client_args"] = {
+                "limits": httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+                "event_hooks": {"request": [self._on_request]},
+            }
+
+        return Client(api_key=self.api_key, http_options=types.HttpOptions(**options))
+
+    # TIMING HOOKS
+
+    def _on_request(self, request: httpx.Request):
+        # Runs in the calling thread; httpcore reports connection phases to the trace.
+        request.extensions["trace"] = self._trace
+
+    def _trace(self, event_name: str, info: dict):
+        events = getattr(self._local, "events", None)
+        if events is not None:
+            events[event_name] = time.perf_counter()
+
+    @staticmethod
+    def _span(events: dict, start_suffix: str, end_suffix: str) -> float:
+        start = next((t for name, t in events.items() if name.endswith(start_suffix)), None)
+        end = next((t for name, t in events.items() if name.endswith(end_suffix)), None)
+        if start is None or end is None:
+            return 0.0
+        return (end - start) * 1000
+
+    def _timings(self, queued_ms: float, start: float, end: float) -> dict:
+        events = self._local.events
+        connect_ms = self._span(events, "connect_tcp.started", "start_tls.complete") or \
+            self._span(events, "connect_tcp.started", "connect_tcp.complete")
+        upload_ms = self._span(events, "send_request_headers.started", "send_request_body.complete")
+        model_ms = self._span(events, "send_request_body.complete", "receive_response_headers.complete")
+        total_ms = (end - start) * 1000
+        if not events:
+            model_ms = total_ms
+        return {
+            "queued_ms": round(queued_ms, 2),
+            "connect_ms": round(connect_ms, 2),
+            "upload_ms": round(upload_ms, 2),
+            "model_ms": round(model_ms, 2),
+            "total_ms": round(total_ms, 2),
+            "reused_connection": bool(events) and not any("connect_tcp" in name for name in events),
+        }
+
+    def _record(self, timings: dict | None, error: bool = False):
+        with self._stats_lock:
+            self._stats["calls"] += 1
+            if error:
+                self._stats["errors"] += 1
+                return
+            if not timings["reused_connection"] and timings["connect_ms"]:
+                self._stats["connections_opened"] += 1
+            for phase in ("queued", "connect", "upload", "model", "total"):
+                self._stats[f"{phase}_ms_total"] += timings[f"{phase}_ms"]
+            self._stats["last_call"] = timings
+
+    # PUBLIC API
+
+    def warm_up(self) -> dict:
+        """Builds the client and opens a pooled connection ahead of the first screen look."""
+        start = time.perf_counter()
+        try:
+            self.client.models.get(model=self.model)
+            status = "success"
+        except Exception as e:
+            logger.warning("Vision client warm-up failed: %s", e)
+            status = "error"
+        elapsed = round((time.perf_counter() - start) * 1000, 2)
+        with self._stats_lock:
+            self._stats["warm_up_ms"] = elapsed
+        return {"status": status, "warm_up_ms": elapsed}
+
+    def generate(self, parts: list[types.Part]) -> tuple[str, dict]:
+        """Sends one multimodal request and returns (text, per-phase timings in ms)."""
+        wait_start = time.perf_counter()
+        with self._semaphore:
+            queued_ms = (time.perf_counter() - wait_start) * 1000
+            with self._stats_lock:
+                self._stats["in_flight"] += 1
+            self._local.events = {}
+            start = time.perf_counter()
+            try:
+                response = self.client.models.generate_content(
+                    model=self.model,
+                    contents=[types.Content(role="user", parts=parts)],
+                )
+            except Exception:
+                self._record(None, error=True)
+                raise
+            finally:
+                with self._stats_lock:
+                    self._stats["in_flight"] -= 1
+
+            timings = self._timings(queued_ms, start, time.perf_counter())
+            self._record(timings)
+            return response.text, timings
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        ok_calls = stats["calls"] - stats["errors"]
+        for phase in ("queued", "connect", "upload", "model", "total"):
+            total = stats.pop(f"{phase}_ms_total")
+            stats[f"avg_{phase}_ms"] = round(total / ok_calls, 2) if ok_calls else 0.0
+        stats["model"] = self.model
+        stats["max_concurrency"] = self.max_concurrency
+        stats["pool_size"] = self.pool_size
+        return stats
+
+
+_vision_client = None
+_vision_client_lock = threading.Lock()
+
+
+def get_vision_client() -> VisionClient:
+    """
+    Returns the shared VisionClient, creating it from the environment on first use.
+
+    Environment:
+        GOOGLE_API_KEY (required), VISION_MODEL, VISION_BASE_URL,
+        VISION_MAX_CONCURRENCY, VISION_POOL_SIZE, VISION_TIMEOUT_MS.
+    """
+    global _vision_client
+    if _vision_client is None:
+        with _vision_client_lock:
+            if _vision_client is None:
+                api_key = os.environ.get("GOOGLE_API_KEY")
+                if not api_key:
+                    raise ValueError("GOOGLE_API_KEY not found in environment.")
+                timeout_ms = os.environ.get("VISION_TIMEOUT_MS")
+                _vision_client = VisionClient(
+                    api_key=api_key,
+                    model=os.environ.get("VISION_MODEL", DEFAULT_MODEL),
+                    base_url=os.environ.get("VISION_BASE_URL") or None,
+                    max_concurrency=int(os.environ.get("VISION_MAX_CONCURRENCY", "4")),
+                    pool_size=int(os.environ.get("VISION_POOL_SIZE", "8")),
+                    timeout_ms=int(timeout_ms) if timeout_ms else None,
+                )
+    return _vision_client
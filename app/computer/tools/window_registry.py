@@ -0,0 +1,312 @@
+# app/computer/tools/window_registry.py
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, asdict
+from difflib import SequenceMatcher
+
+WINDOW_CACHE_TTL = float(os.environ.get("WINDOW_CACHE_TTL", "1.0"))
+FUZZY_MIN_RATIO = 0.6
+
+
+@dataclass(frozen=True)
+class WindowInfo:
+    handle: int
+    title: str
+    pid: int
+    x: int
+    y: int
+    width: int
+    height: int
+    z_order: int          # 0 is the topmost window
+    minimized: bool
+    maximized: bool
+    focused: bool
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+# BACKENDS
+# A window backend exposes `enumerate() -> [WindowInfo, ...]` (visible titled top-level
+# windows, topmost first), `describe(handle)`, `is_window(handle)` and `title(handle)`.
+# It may also expose `watch(callback)`, calling `callback()` whenever windows appear,
+# close or change focus.
+
+class Win32WindowBackend:
+    """Enumerates windows with EnumWindows, which reports them in z-order."""
+
+    def __init__(self):
+        import win32gui
+        import win32process
+        self._win32gui = win32gui
+        self._win32process = win32process
+        self._hook_thread = None
+
+    def enumerate(self) -> list[WindowInfo]:
+        gui = self._win32gui
+        foreground = gui.GetForegroundWindow()
+        handles = []
+
+        def collect(hwnd, _):
+            if gui.IsWindowVisible(hwnd) and gui.GetWindowText(hwnd).strip():
+                handles.append(hwnd)
+            return True
+
+        gui.EnumWindows(collect, None)
+        windows = []
+        for z_order, hwnd in enumerate(handles):
+            try:
+                windows.append(self._describe(hwnd, z_order, foreground))
+            except Exception:
+                # Closed between EnumWindows and the per-window queries
+                continue
+        return windows
+
+    def describe(self, handle: int) -> WindowInfo:
+        """One window's current state without enumerating the others (z_order is -1)."""
+        return self._describe(handle, -1, self._win32gui.GetForegroundWindow())
+
+    def _describe(self, hwnd: int, z_order: int, foreground: int) -> WindowInfo:
+        gui = self._win32gui
+        left, top, right, bottom = gui.GetWindowRect(hwnd)
+        _, pid = self._win32process.GetWindowThreadProcessId(hwnd)
+        return WindowInfo(
+            handle=hwnd,
+            title=gui.GetWindowText(hwnd),
+            pid=pid,
+            x=left,
+            y=top,
+            width=right - left,
+            height=bottom - top,
+            z_order=z_order,
+            minimized=bool(gui.IsIconic(hwnd)),
+            maximized=bool(self._is_zoomed(hwnd)),
+            focused=hwnd == foreground,
+        )
+
+    @staticmethod
+    def _is_zoomed(hwnd: int) -> bool:
+        import ctypes
+        return ctypes.windll.user32.IsZoomed(hwnd)
+
+    def is_window(self, handle: int) -> bool:
+        return bool(self._win32gui.IsWindow(handle))
+
+    def title(self, handle: int) -> str:
+        return self._win32gui.GetWindowText(handle)
+
+    def watch(self, callback):
+        """Calls `callback` on foreground, create/destroy, show/hide, minimize and title events."""
+        if self._hook_thread is None:
+            self._hook_thread = threading.Thread(target=self._run_hooks, args=(callback,), name="window-events", daemon=True)
+            self._hook_thread.start()
+
+    def _run_hooks(self, callback):
+        import ctypes
+        from ctypes import wintypes
+        user32 = ctypes.windll.user32
+        WinEventProc = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD,
+        )
+        OBJID_WINDOW, CHILDID_SELF, GA_ROOT = 0, 0, 2
+        WINEVENT_OUTOFCONTEXT, WINEVENT_SKIPOWNPROCESS = 0x0000, 0x0002
+
+        def handler(hook, event, hwnd, id_object, id_child, thread, time_ms):
+            # Only top-level windows, not the controls inside them
+            if id_object == OBJID_WINDOW and id_child == CHILDID_SELF and hwnd and user32.GetAncestor(hwnd, GA_ROOT) == hwnd:
+                callback()
+
+        self._hook_proc = WinEventProc(handler)
+        event_ranges = [
+            (0x0003, 0x0003),   # EVENT_SYSTEM_FOREGROUND
+            (0x0016, 0x0017),   # EVENT_SYSTEM_MINIMIZESTART .. MINIMIZEEND
+            (0x8000, 0x8003),   # EVENT_OBJECT_CREATE, DESTROY, SHOW, HIDE
+            (0x800C, 0x800C),   # EVENT_OBJECT_NAMECHANGE
+        ]
+        for low, high in event_ranges:
+            user32.SetWinEventHook(low, high, 0, self._hook_proc, 0, 0, WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS)
+
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+
+
+# REGISTRY
+
+class WindowRegistry:
+    """
+    Shared view of the desktop's top-level windows built from one enumeration.
+
+    The snapshot is reused for `ttl` seconds or until invalidated: by the backend's
+    window events (focus change, create/close, minimize, title change) when it can
+    watch them, and by the window tools after they move, resize or close a window.
+    Title lookups are cached per query (title -> handle) until invalidated and
+    re-checked against that one window on a hit, so repeated calls for the same
+    window skip enumeration even after the snapshot expired.
+
+    Args:
+        backend: Window backend (see above).
+        ttl: Seconds a snapshot is reused without events.
+    """
+
+    def __init__(self, backend, ttl: float = WINDOW_CACHE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._windows = None
+        self._taken_at = 0.0
+        self._resolved = {}      # (query, regex, fuzzy) -> (handle, title when resolved)
+        self._metrics = {"enumerations": 0, "snapshot_hits": 0, "handle_hits": 0, "invalidations": 0}
+        watch = getattr(backend, "watch", None)
+        if watch is not None:
+            watch(self.invalidate)
+
+    def invalidate(self):
+        with self._lock:
+            self._windows = None
+            self._resolved.clear()
+            self._metrics["invalidations"] += 1
+
+    def snapshot(self, max_age: float | None = None) -> list[WindowInfo]:
+        """All visible titled windows, topmost first, at most `max_age` (default ttl) seconds old."""
+        max_age = self.ttl if max_age is None else max_age
+        with self._lock:
+            if self._windows is not None and time.monotonic() - self._taken_at <= max_age:
+                self._metrics["snapshot_hits"] += 1
+                return self._windows
+        windows = self.backend.enumerate()
+        with self._lock:
+            self._windows = windows
+            self._taken_at = time.monotonic()
+            self._metrics["enumerations"] += 1
+        return windows
+
+    def age(self) -> float | None:
+        return time.monotonic() - self._taken_at if self._windows is not None else None
+
+    @staticmethod
+    def _match(windows: list[WindowInfo], query: str, regex: bool, fuzzy: bool) -> WindowInfo | None:
+        if regex:
+            pattern = re.compile(query, re.IGNORECASE)
+            return next((w for w in windows if pattern.search(w.title)), None)
+
+        needle = query.lower()
+        exact = next((w for w in windows if w.title.lower() == needle), None)
+        if exact is not None:
+            return exact
+        # Same rule as pygetwindow's getWindowsWithTitle: case-insensitive substring, topmost first
+        contained = next((w for w in windows if needle in w.title.lower()), None)
+        if contained is not None:
+            return contained
+        if not fuzzy:
+            return None
+
+        best, best_ratio = None, FUZZY_MIN_RATIO
+        for w in windows:
+            ratio = SequenceMatcher(None, needle, w.title.lower()).ratio()
+            if ratio > best_ratio:
+                best, best_ratio = w, ratio
+        return best
+
+    def _unchanged(self, handle: int, title: str) -> bool:
+        try:
+            return self.backend.is_window(handle) and self.backend.title(handle) == title
+        except Exception:
+            return False
+
+    def find(self, query: str, regex: bool = False, fuzzy: bool = False) -> WindowInfo:
+        """
+        Finds a window by exact, substring or (regex=True) regular-expression title match.
+
+        Exact titles win over substrings and the topmost window wins within each
+        kind, as with pygetwindow. fuzzy=True also accepts the most similar title
+        when nothing contains the query; it can pick a different window ("Notepad"
+        finding "Notes"), so only read-only lookups that report the matched title
+        should use it.
+
+        Raises:
+            Exception: when no window matches, with the same message as before.
+        """
+        key = (query, regex, fuzzy)
+        cached = self._resolved.get(key)
+        if cached is not None and self._unchanged(*cached):
+            handle = cached[0]
+            self._metrics["handle_hits"] += 1
+            with self._lock:
+                fresh = self._windows is not None and time.monotonic() - self._taken_at <= self.ttl
+                windows = self._windows if fresh else None
+            match = next((w for w in windows if w.handle == handle), None) if windows else None
+            return match if match is not None else self.backend.describe(handle)
+        if cached is not None:
+            # The window closed or was renamed since it was resolved
+            self.invalidate()
+
+        windows = self.snapshot()
+        match = self._match(windows, query, regex, fuzzy)
+        if match is None:
+            raise Exception(f"No window matches '{query}'")
+        with self._lock:
+            self._resolved[key] = (match.handle, match.title)
+        return match
+
+    def find_all(self, queries: list[str], regex: bool = False) -> list[WindowInfo]:
+        """Resolves several titles against one snapshot (no fuzzy matching: callers move these windows)."""
+        return [self.find(query, regex, fuzzy=False) for query in queries]
+
+    def exists(self, query: str) -> bool:
+        """Substring check like pygetwindow's getWindowsWithTitle (no fuzzy matching)."""
+        try:
+            self.find(query, fuzzy=False)
+            return True
+        except Exception:
+            return False
+
+    def list_windows(self) -> list[tuple[int, str, int]]:
+        """Fresh (handle, title, pid) list; also serves as launch_app's window backend."""
+        return [(w.handle, w.title, w.pid) for w in self.snapshot(max_age=0)]
+
+    def stats(self) -> dict:
+        return {**self._metrics, "windows": len(self._windows or []), "cached_titles": len(self._resolved)}
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_window_registry() -> WindowRegistry:
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = WindowRegistry(Win32WindowBackend())
+        return _registry
+
+
+def get_windows_snapshot(include_minimized: bool = True) -> dict:
+    """
+    Lists every visible top-level window in one call.
+
+    Args:
+        include_minimized: Also list minimized windows.
+
+    Returns:
+        The focused window's handle and, topmost first, each window's handle,
+        title, process id, position, size, z-order and minimized/maximized/focused flags.
+    """
+    try:
+        registry = get_window_registry()
+        windows = registry.snapshot()
+        if not include_minimized:
+            windows = [w for w in windows if not w.minimized]
+        focused = next((w.handle for w in windows if w.focused), None)
+        return {
+            "status": "success",
+            "focused": focused,
+            "windows": [w.to_dict() for w in windows],
+            "age_ms": round((registry.age() or 0.0) * 1000, 1),
+        }
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
@@ -0,0 +1,35 @@
+# app/server/audio_protocol.py
+"""
+Binary websocket audio frames.
+
+Audio travels as binary websocket messages instead of JSON + base64:
+
+    byte 0     frame kind (KIND_AUDIO_PCM)
+    byte 1     flags (reserved, 0)
+    bytes 2-3  sequence number, uint16 little-endian (wraps)
+    bytes 4-   raw 16-bit little-endian mono PCM
+
+Text and control messages keep using the JSON text protocol.
+"""
+import struct
+
+HEADER = struct.Struct("<BBH")
+HEADER_SIZE = HEADER.size
+KIND_AUDIO_PCM = 0x01
+
+
+def pack_audio(seq: int, pcm: bytes) -> bytes:
+    return HEADER.pack(KIND_AUDIO_PCM, 0, seq & 0xFFFF) + pcm
+
+
+def unpack_frame(frame: bytes) -> tuple[int, int, int, bytes]:
+    """
+    Splits a binary frame into (kind, flags, seq, payload).
+
+    Raises:
+        ValueError: if the frame is shorter than the header.
+    """
+    if len(frame) < HEADER_SIZE:
+        raise ValueError(f"Binary frame too short: {len(frame)} bytes")
+    kind, flags, seq = HEADER.unpack_from(frame)
+    return kind, flags, seq, frame[HEADER_SIZE:]
@@ -1,12 +1,13 @@
 import asyncio
 import json
+import logging
 import os
 import base64
 from pathlib import Path
 from typing import AsyncIterable
 from dotenv import load_dotenv
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Query
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from google.adk.agents import LiveRequestQueue
 from google.adk.agents.run_config import RunConfig
@@ -17,36 +18,95 @@ from google.genai import types
 from google.genai.types import Modality
 import warnings
 from app.computer.agent import root_agent
-from app.computer.tools.vision import analyze_screen
-from app.computer.tools import control
+from app.computer.tools.vision import vision_cache
+from app.computer.tools.vision_client import get_vision_client
+from app.computer.tools.instrument import tool_metrics
+from app.computer.tools.screen_sampler import start_screen_sampler, stop_screen_sampler, get_screen_sampler
+from app.computer.tools.system_metrics import start_metrics_sampler, stop_metrics_sampler
+from app.computer.tools.settle import wait_for_settle
+from app.server.tool_executor import ToolExecutor, tool_registry
+from app.server.audio_protocol import KIND_AUDIO_PCM, pack_audio, unpack_frame
+from app.server.sessions import SessionManager, SessionLimitError
+from app.server.outbound import OutboundSender
+from app.server.text_stream import DeltaTracker
+from app.server.telemetry import ChunkSampler, TurnTracer, configure_logging, get_exporter, log_event
 
 warnings.filterwarnings("ignore", category=UserWarning, module="pydantic")
 load_dotenv()
+configure_logging()
+logger = logging.getLogger(__name__)
 
 APP_NAME = "Computer Use Live Agent"
 STATIC_DIR = Path("static")
 
 session_service = InMemorySessionService()
+runner = Runner(
+    app_name=APP_NAME,
+    agent=root_agent,
+    session_service=session_service,
+)
+session_manager = SessionManager(
+    runner,
+    APP_NAME,
+    max_live=int(os.environ.get("MAX_LIVE_SESSIONS", "8")),
+    idle_timeout=float(os.environ.get("SESSION_IDLE_TIMEOUT", "600")),
+    max_ended=int(os.environ.get("MAX_ENDED_SESSIONS", "32")),
+)
+tool_executor = ToolExecutor(tool_registry(root_agent.tools))
 app = FastAPI()
 
 if not STATIC_DIR.exists():
     STATIC_DIR.mkdir()
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
-async def start_agent_session(session_id: str, is_audio: bool = False):
-    """Starts the ADK Live Runner session."""
 
-    session = await session_service.create_session(
-        app_name=APP_NAME,
-        user_id=session_id,
-        session_id=session_id,
-    )
+@app.on_event("startup")
+async def warm_up_vision_client():
+    """Opens the pooled vision connection in the background so the first screen look is warm."""
+    try:
+        client = get_vision_client()
+    except Exception as e:
+        logger.warning("Vision client not warmed up: %s", e)
+        return
+    asyncio.create_task(asyncio.to_thread(client.warm_up))
+
+
+@app.on_event("startup")
+async def start_background_sampler():
+    """Starts the optional background screen sampler (SCREEN_SAMPLER_FPS > 0)."""
+    try:
+        start_screen_sampler()
+    except Exception as e:
+        logger.warning("Screen sampler not started: %s", e)
+
+
+@app.on_event("startup")
+async def start_system_metrics():
+    """Starts polling system metrics so CPU/RAM/battery tools answer from the latest sample."""
+    try:
+        start_metrics_sampler()
+    except Exception as e:
+        logger.warning("Metrics sampler not started: %s", e)
+
+
+@app.on_event("startup")
+async def start_session_reaper():
+    asyncio.create_task(session_manager.run_reaper())
 
-    runner = Runner(
-        app_name=APP_NAME,
-        agent=root_agent,
-        session_service=session_service,
-    )
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    await session_manager.close_all()
+    stop_screen_sampler()
+    stop_metrics_sampler()
+    tool_executor.shutdown()
+    exporter = get_exporter()
+    if exporter is not None:
+        exporter.shutdown()
+
+
+async def start_agent_session(session_id: str, is_audio: bool = False):
+    """Starts the ADK Live Runner session."""
 
     # Set response modality
     modality = "AUDIO" if is_audio else "TEXT"
@@ -68,113 +128,90 @@ async def start_agent_session(session_id: str, is_audio: bool = False):
 
     run_config = RunConfig(**config)
 
-    live_request_queue = LiveRequestQueue()
-
-    live_events = runner.run_live(
-        session=session,
-        live_request_queue=live_request_queue,
-        run_config=run_config,
-    )
-
-    return live_events, live_request_queue
+    # Shared runner; the manager bounds and tracks live sessions
+    return await session_manager.open(session_id, run_config)
 
 
 # AGENT ➜ CLIENT
 async def agent_to_client_messaging(
-    websocket: WebSocket,
+    outbound: OutboundSender,
     live_events: AsyncIterable[Event | None],
-    live_request_queue: LiveRequestQueue
+    live_request_queue: LiveRequestQueue,
+    session_id: str,
+    tracer: TurnTracer,
+    binary_audio: bool = False
 ):
-    current_turn_text = ""
+    text_tracker = DeltaTracker()
+    audio_seq = 0
+    audio_log = ChunkSampler(logger, "Agent audio out", session_id=session_id)
 
     try:
         async for event in live_events:
             if event is None:
                 continue
+            session_manager.touch(session_id)
 
             # TOOL CALLS
             if hasattr(event, "tool_calls") and event.tool_calls:
-                for tool_call in event.tool_calls:
-                    print(f"🛠️ Agent calling tool: {tool_call.name}")
-
-                    tool_response_data = {}
-
-                    # VISION / ANALYZE SCREEN
-                    if tool_call.name == "analyze_screen":
-                        # Notify frontend that we are looking
-                        await websocket.send_json({
-                            "mime_type": "text/plain",
-                            "data": "👀 Analyzing screen content...",
-                            "role": "system"
-                        })
-
+                tool_calls = event.tool_calls
+                for tool_call in tool_calls:
+                    log_event(logger, logging.INFO, "Agent calling tool", tool=tool_call.name, session_id=session_id)
+
+                # VISION / ANALYZE SCREEN
+                if any(tool_call.name == "analyze_screen" for tool_call in tool_calls):
+                    # Notify frontend that we are looking
+                    await outbound.send_notice("👀 Analyzing screen content...")
+
+                # CONTROL TOOLS (click, type, etc.)
+                async def on_tool_result(name: str, result: dict):
+                    if name == "analyze_screen" or "error" in result:
+                        return
+                    # Notify frontend that a tool was executed.
+                    await outbound.send_notice(f"⚡ Executed tool: {name}")
+
+                    if name in ["press_key", "click_mouse", "run_actions"]:
+                        # Wait until the screen stops changing instead of a fixed delay
                         try:
-                            # Run in thread because it calls Gemini API (blocking)
-                            result = await asyncio.to_thread(analyze_screen, **tool_call.args)
-                            tool_response_data = result
+                            settle = await asyncio.to_thread(wait_for_settle)
+                            result["settle_ms"] = settle["settle_ms"]
+                            result["settled"] = settle["settled"]
                         except Exception as e:
-                            print(f"❌ Error analyzing screen: {e}")
-                            tool_response_data = {"error": str(e)}
-
-                    # CONTROL TOOLS (click, type, etc.)
-                    elif hasattr(control, tool_call.name):
-                        func = getattr(control, tool_call.name)
-                        try:
-                            raw_result = func(**tool_call.args)
-
-                            tool_response_data = (
-                                raw_result if isinstance(raw_result, dict)
-                                else {"result": str(raw_result)}
-                            )
-
-                            # Notify frontend that a tool was executed.
-                            await websocket.send_json({
-                                "mime_type": "text/plain",
-                                "data": f"⚡ Executed tool: {tool_call.name}",
-                                "role": "system"
-                            })
-
-                            if tool_call.name in ["press_key", "click_mouse"]:
-                                await asyncio.sleep(0.5)
-
-                        except Exception as e:
-                            print(f"❌ Error executing tool: {e}")
-                            tool_response_data = {"error": str(e)}
-
-                    else:
-                        tool_response_data = {"error": f"Unknown tool: {tool_call.name}"}
-
-                    # SEND TOOL RESPONSE BACK TO AGENT
-                    tool_response = types.LiveClientToolResponse(
-                        function_responses=[
-                            types.FunctionResponse(
-                                name=tool_call.name,
-                                id=tool_call.id,
-                                response=tool_response_data,
-                            )
-                        ]
-                    )
-                    live_request_queue.send_tool_response(tool_response)
+                            logger.warning("Settle detection failed: %s", e)
+                            await asyncio.sleep(0.5)
+
+                # Read-only tools run concurrently, input-device tools stay in order
+                span = tracer.start_tools([tool_call.name for tool_call in tool_calls])
+                results = await tool_executor.run_batch(
+                    session_id,
+                    [(tool_call.name, tool_call.args) for tool_call in tool_calls],
+                    on_result=on_tool_result,
+                )
+                tracer.end_tools(span, errors=sum(1 for result in results if "error" in result))
+
+                # SEND ALL TOOL RESPONSES BACK TO AGENT IN ONE MESSAGE
+                tool_response = types.LiveClientToolResponse(
+                    function_responses=[
+                        types.FunctionResponse(
+                            name=tool_call.name,
+                            id=tool_call.id,
+                            response=result,
+                        )
+                        for tool_call, result in zip(tool_calls, results)
+                    ]
+                )
+                live_request_queue.send_tool_response(tool_response)
 
             # TEXT FROM AGENT
             if event.content and event.content.parts:
                 for part in event.content.parts:
                     if part.text:
-                        chunk = part.text
-                        # dedupe logic
-                        if chunk.startswith(current_turn_text):
-                            delta = chunk[len(current_turn_text):]
-                        else:
-                            delta = chunk
+                        # dedupe logic: handles cumulative and incremental parts
+                        delta = text_tracker.delta(part.text)
 
                         if delta:
-                            current_turn_text += delta
-
-                            await websocket.send_json({
-                                "mime_type": "text/plain",
-                                "data": delta,
-                                "role": "model"
-                            })
+                            tracer.model_text()
+                            # Adjacent deltas are merged while queued
+                            await outbound.send_text(delta)
 
                     # AUDIO FROM AGENT
                     is_audio = (
@@ -185,17 +222,24 @@ async def agent_to_client_messaging(
                     if is_audio:
                         audio_data = part.inline_data and part.inline_data.data
                         if audio_data:
-                            await websocket.send_json({
-                                "mime_type": "audio/pcm",
-                                "data": base64.b64encode(audio_data).decode("ascii"),
-                                "role": "model"
-                            })
-                            print(f"🔊 Agent (audio/pcm): {len(audio_data)} bytes")
+                            tracer.model_audio()
+                            if binary_audio:
+                                # Raw PCM behind a 4-byte header, no base64/JSON
+                                await outbound.send_audio(pack_audio(audio_seq, audio_data))
+                                audio_seq += 1
+                            else:
+                                await outbound.send_audio({
+                                    "mime_type": "audio/pcm",
+                                    "data": base64.b64encode(audio_data).decode("ascii"),
+                                    "role": "model"
+                                })
+                            audio_log.record(len(audio_data))
 
             # TURN COMPLETE
             if event.turn_complete:
-                current_turn_text = ""
-                await websocket.send_json({
+                text_tracker.reset()
+                tracer.turn_complete()
+                await outbound.send_json({
                     "mime_type": "text/plain",
                     "data": "",
                     "role": "model",
@@ -203,18 +247,43 @@ async def agent_to_client_messaging(
                 })
 
     except Exception as e:
-        print(f"Error in agent_to_client: {e}")
+        logger.exception("Error in agent_to_client: %s", e)
 
 
 # CLIENT ➜ AGENT
 async def client_to_agent_messaging(
     websocket: WebSocket,
-    live_request_queue: LiveRequestQueue
+    live_request_queue: LiveRequestQueue,
+    session_id: str,
+    tracer: TurnTracer
 ):
+    audio_log = ChunkSampler(logger, "User audio in", session_id=session_id)
     try:
         while True:
-            raw = await websocket.receive_text()
-            message = json.loads(raw)
+            received = await websocket.receive()
+            if received["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(received.get("code", 1000))
+            session_manager.touch(session_id)
+
+            # BINARY AUDIO FRAME
+            frame = received.get("bytes")
+            if frame is not None:
+                try:
+                    kind, _, _, audio_bytes = unpack_frame(frame)
+                except ValueError as e:
+                    logger.warning("Dropping malformed binary frame: %s", e)
+                    continue
+                if kind != KIND_AUDIO_PCM:
+                    logger.warning("Unsupported binary frame kind: %s", kind)
+                    continue
+                audio_log.record(len(audio_bytes))
+                tracer.user_input("audio", audio_bytes)
+                live_request_queue.send_realtime(
+                    types.Blob(data=audio_bytes, mime_type="audio/pcm")
+                )
+                continue
+
+            message = json.loads(received["text"])
 
             mime_type = message.get("mime_type")
             data = message.get("data")
@@ -222,7 +291,8 @@ async def client_to_agent_messaging(
 
             # TEXT MESSAGE
             if mime_type == "text/plain":
-                print(f"🟦 User (text): {data}")
+                log_event(logger, logging.INFO, "User text", session_id=session_id, chars=len(data))
+                tracer.user_input("text")
 
                 content = types.Content(
                     role=role,
@@ -235,7 +305,8 @@ async def client_to_agent_messaging(
             # AUDIO MESSAGE
             if mime_type == "audio/pcm":
                 audio_bytes = base64.b64decode(data)
-                print(f"🎤 User (audio/pcm): {len(audio_bytes)} bytes")
+                audio_log.record(len(audio_bytes))
+                tracer.user_input("audio", audio_bytes)
 
                 # Use send_realtime with Blob for audio chunks
                 live_request_queue.send_realtime(
@@ -243,13 +314,13 @@ async def client_to_agent_messaging(
                 )
                 continue
 
-            print("⚠ Unsupported MIME type:", message)
+            logger.warning("Unsupported MIME type: %s", mime_type)
 
     except WebSocketDisconnect:
-        print("Client disconnected")
+        logger.info("Client disconnected: %s", session_id)
 
     except Exception as e:
-        print("❌ Error in client_to_agent:", e)
+        logger.exception("Error in client_to_agent: %s", e)
 
 
 # ROUTES
@@ -258,31 +329,79 @@ async def root():
     return FileResponse(STATIC_DIR / "index.html")
 
 
+@app.get("/sessions/stats")
+async def sessions_stats():
+    return await session_manager.gauge()
+
+
+@app.get("/metrics")
+async def metrics():
+    """Per-tool call, error and latency metrics in the Prometheus text format."""
+    return PlainTextResponse(tool_metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/vision/stats")
+async def vision_stats():
+    try:
+        stats = {"client": get_vision_client().stats(), "cache": vision_cache.stats()}
+    except Exception as e:
+        stats = {"error": str(e), "cache": vision_cache.stats()}
+    sampler = get_screen_sampler()
+    if sampler is not None:
+        stats["sampler"] = sampler.stats()
+    return stats
+
+
 @app.websocket("/ws/{session_id}")
 async def websocket_endpoint(
     websocket: WebSocket,
     session_id: str,
-    is_audio: str = Query(...)
+    is_audio: str = Query(...),
+    audio_protocol: str = Query("json")
 ):
     await websocket.accept()
-    print(f"Client connected: {session_id}, audio mode: {is_audio}")
+    log_event(logger, logging.INFO, "Client connected", session_id=session_id, audio=is_audio, audio_protocol=audio_protocol)
 
     # FIX: await session startup with audio mode
-    live_events, live_request_queue = await start_agent_session(
-        session_id, is_audio == "true"
-    )
+    try:
+        live = await start_agent_session(session_id, is_audio == "true")
+    except SessionLimitError as e:
+        logger.warning("Rejecting %s: %s", session_id, e)
+        await websocket.close(code=1013, reason=str(e))
+        return
+
+    # Bounded outbound queue drained by its own writer task
+    outbound = OutboundSender(websocket)
+    outbound.start()
+    live.outbound = outbound
+
+    # Per-turn latency spans (exported only when TRACE_FILE is set)
+    tracer = TurnTracer(session_id)
 
     agent_task = asyncio.create_task(
-        agent_to_client_messaging(websocket, live_events, live_request_queue)
+        agent_to_client_messaging(
+            outbound, live.live_events, live.live_request_queue, session_id, tracer,
+            binary_audio=audio_protocol == "binary"
+        )
     )
     client_task = asyncio.create_task(
-        client_to_agent_messaging(websocket, live_request_queue)
+        client_to_agent_messaging(websocket, live.live_request_queue, session_id, tracer)
     )
+    live.tasks = [agent_task, client_task]
+    # Runs whether this endpoint, the idle reaper or a reconnect closes the session
+    live.on_close = lambda: tool_executor.release_session(session_id)
 
-    done, pending = await asyncio.wait(
-        [agent_task, client_task],
-        return_when=asyncio.FIRST_COMPLETED
-    )
-
-    for task in pending:
-        task.cancel()
+    try:
+        await asyncio.wait(
+            [agent_task, client_task],
+            return_when=asyncio.FIRST_COMPLETED
+        )
+    finally:
+        # Close the request queue, cancel the other task and retire the session,
+        # unless the reaper closed it or a reconnect with the same id replaced it
+        await session_manager.close(session_id, live)
+        await outbound.close()
+        try:
+            await websocket.close()
+        except Exception:
+            pass
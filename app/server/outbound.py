@@ -0,0 +1,177 @@
+# app/server/outbound.py
+import asyncio
+import logging
+import time
+from collections import deque
+from fastapi import WebSocket
+
+logger = logging.getLogger(__name__)
+
+TEXT = "text"
+NOTICE = "notice"
+AUDIO = "audio"
+CONTROL = "control"
+
+
+class _Item:
+    __slots__ = ("kind", "payload", "enqueued_at")
+
+    def __init__(self, kind: str, payload):
+        self.kind = kind
+        self.payload = payload
+        self.enqueued_at = time.monotonic()
+
+
+class OutboundSender:
+    """
+    Per-connection outbound queue drained by a single writer task.
+
+    Producers enqueue instead of awaiting websocket sends, so a slow browser no
+    longer stalls the live event loop. Adjacent model text deltas are merged while
+    they wait (the writer holds a fresh delta for `coalesce_window` seconds). System
+    notices are merged with a queued notice and dropped entirely once the queue is
+    above `pressure_ratio` of its size. Text and audio wait for space when the queue
+    is full (backpressure).
+
+    Args:
+        websocket: Accepted websocket.
+        max_size: Maximum queued messages.
+        coalesce_window: Seconds a text delta may wait for more deltas to merge into it.
+        pressure_ratio: Queue fill ratio above which notices are dropped.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        max_size: int = 256,
+        coalesce_window: float = 0.015,
+        pressure_ratio: float = 0.75,
+    ):
+        self.websocket = websocket
+        self.max_size = max_size
+        self.coalesce_window = coalesce_window
+        self.pressure_size = int(max_size * pressure_ratio)
+        self._queue = deque()
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._closed = False
+        self._writer = None
+        self._metrics = {
+            "sent": 0,
+            "coalesced": 0,
+            "notices_dropped": 0,
+            "notices_merged": 0,
+            "max_depth": 0,
+            "send_ms_total": 0.0,
+            "send_ms_max": 0.0,
+            "queue_wait_ms_total": 0.0,
+        }
+
+    # LIFECYCLE
+
+    def start(self):
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._run())
+
+    async def close(self, flush_timeout: float = 1.0):
+        """Sends what is still queued (up to `flush_timeout`) and stops the writer."""
+        if self._writer is not None and not self._writer.done() and self._queue:
+            try:
+                await asyncio.wait_for(self._drained(), flush_timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._closed = True
+        if self._writer is not None:
+            self._writer.cancel()
+            await asyncio.gather(self._writer, return_exceptions=True)
+
+    async def _drained(self):
+        while self._queue and not self._closed:
+            await asyncio.sleep(0.005)
+
+    # PRODUCERS
+
+    async def _put(self, item: _Item):
+        while len(self._queue) >= self.max_size and not self._closed:
+            self._space.clear()
+            await self._space.wait()
+        if self._closed:
+            return
+        self._queue.append(item)
+        self._metrics["max_depth"] = max(self._metrics["max_depth"], len(self._queue))
+        self._ready.set()
+
+    async def send_text(self, delta: str, role: str = "model"):
+        tail = self._queue[-1] if self._queue else None
+        if tail is not None and tail.kind == TEXT and tail.payload["role"] == role:
+            tail.payload["data"] += delta
+            self._metrics["coalesced"] += 1
+            return
+        await self._put(_Item(TEXT, {"mime_type": "text/plain", "data": delta, "role": role}))
+
+    async def send_notice(self, text: str):
+        if len(self._queue) >= self.pressure_size:
+            self._metrics["notices_dropped"] += 1
+            return
+        tail = self._queue[-1] if self._queue else None
+        if tail is not None and tail.kind == NOTICE:
+            tail.payload["data"] += f"\n{text}"
+            self._metrics["notices_merged"] += 1
+            return
+        await self._put(_Item(NOTICE, {"mime_type": "text/plain", "data": text, "role": "system"}))
+
+    async def send_audio(self, message):
+        """Queues an audio message: bytes are sent as a binary frame, dicts as JSON."""
+        await self._put(_Item(AUDIO, message))
+
+    async def send_json(self, message: dict):
+        await self._put(_Item(CONTROL, message))
+
+    # WRITER
+
+    async def _run(self):
+        try:
+            while True:
+                while not self._queue:
+                    self._ready.clear()
+                    await self._ready.wait()
+
+                head = self._queue[0]
+                if head.kind == TEXT:
+                    # Give following deltas a moment to merge into this one
+                    remaining = head.enqueued_at + self.coalesce_window - time.monotonic()
+                    if remaining > 0 and len(self._queue) == 1:
+                        await asyncio.sleep(remaining)
+
+                item = self._queue.popleft()
+                self._space.set()
+
+                start = time.monotonic()
+                if isinstance(item.payload, (bytes, bytearray)):
+                    await self.websocket.send_bytes(item.payload)
+                else:
+                    await self.websocket.send_json(item.payload)
+                end = time.monotonic()
+
+                send_ms = (end - start) * 1000
+                self._metrics["sent"] += 1
+                self._metrics["send_ms_total"] += send_ms
+                self._metrics["send_ms_max"] = max(self._metrics["send_ms_max"], send_ms)
+                self._metrics["queue_wait_ms_total"] += (start - item.enqueued_at) * 1000
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.info("Outbound writer stopped: %s", e)
+        finally:
+            self._closed = True
+            self._space.set()
+
+    def stats(self) -> dict:
+        metrics = dict(self._metrics)
+        sent = metrics["sent"]
+        metrics["depth"] = len(self._queue)
+        metrics["avg_send_ms"] = round(metrics.pop("send_ms_total") / sent, 3) if sent else 0.0
+        metrics["avg_queue_wait_ms"] = round(metrics.pop("queue_wait_ms_total") / sent, 3) if sent else 0.0
+        metrics["send_ms_max"] = round(metrics["send_ms_max"], 3)
+        return metrics
@@ -0,0 +1,198 @@
+# app/server/sessions.py
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from google.adk.agents import LiveRequestQueue
+from google.adk.agents.run_config import RunConfig
+from google.adk.runners import Runner
+
+logger = logging.getLogger(__name__)
+
+
+class SessionLimitError(Exception):
+    """Raised when the maximum number of concurrent live sessions is reached."""
+
+
+class LiveSession:
+    """State of one connected websocket's live agent session."""
+
+    def __init__(self, session_id: str, live_request_queue: LiveRequestQueue, live_events):
+        self.session_id = session_id
+        self.live_request_queue = live_request_queue
+        self.live_events = live_events
+        self.tasks = []
+        self.outbound = None
+        self.on_close = None       # called once when the session is closed, by whoever closes it
+        self.started_at = time.monotonic()
+        self.last_activity = self.started_at
+
+    def touch(self):
+        self.last_activity = time.monotonic()
+
+    def idle_for(self) -> float:
+        return time.monotonic() - self.last_activity
+
+
+class SessionManager:
+    """
+    Owns the live sessions of the server around one shared Runner.
+
+    Caps the number of concurrent live sessions, tears down the request queue and
+    tasks of a session when its client disconnects or idles out, and keeps only the
+    `max_ended` most recently ended sessions in the session service (LRU), deleting
+    older ones so memory stays bounded.
+
+    Args:
+        runner: Shared ADK Runner.
+        app_name: ADK app name.
+        max_live: Maximum concurrent live sessions.
+        idle_timeout: Seconds without activity after which a live session is closed.
+        idle_after: Seconds without activity after which a live session counts as idle.
+        max_ended: Ended sessions kept in the session service before eviction.
+    """
+
+    def __init__(
+        self,
+        runner: Runner,
+        app_name: str,
+        max_live: int = 8,
+        idle_timeout: float = 600.0,
+        idle_after: float = 30.0,
+        max_ended: int = 32,
+    ):
+        self.runner = runner
+        self.session_service = runner.session_service
+        self.app_name = app_name
+        self.max_live = max_live
+        self.idle_timeout = idle_timeout
+        self.idle_after = idle_after
+        self.max_ended = max_ended
+        self._live = {}
+        self._ended = OrderedDict()
+        self.evicted = 0
+        self.idle_closed = 0
+        self.rejected = 0
+
+    async def open(self, session_id: str, run_config: RunConfig) -> LiveSession:
+        """
+        Starts (or resumes) the ADK session for a websocket and begins the live run.
+
+        Raises:
+            SessionLimitError: when `max_live` sessions are already connected.
+        """
+        if session_id in self._live:
+            await self.close(session_id)
+        if len(self._live) >= self.max_live:
+            self.rejected += 1
+            raise SessionLimitError(f"Too many live sessions ({self.max_live})")
+
+        # A client reconnecting with a retained session id resumes it
+        self._ended.pop(session_id, None)
+        session = await self.session_service.get_session(
+            app_name=self.app_name, user_id=session_id, session_id=session_id
+        )
+        if session is None:
+            session = await self.session_service.create_session(
+                app_name=self.app_name, user_id=session_id, session_id=session_id
+            )
+
+        live_request_queue = LiveRequestQueue()
+        live_events = self.runner.run_live(
+            session=session,
+            live_request_queue=live_request_queue,
+            run_config=run_config,
+        )
+        live = LiveSession(session_id, live_request_queue, live_events)
+        self._live[session_id] = live
+        return live
+
+    def touch(self, session_id: str):
+        live = self._live.get(session_id)
+        if live is not None:
+            live.touch()
+
+    async def close(self, session_id: str, live: LiveSession | None = None) -> bool:
+        """
+        Closes the request queue, cancels the session's tasks and retires it to the ended LRU.
+
+        Passing the connection's own `live` session only closes that one: a client that
+        reconnected with the same id has replaced it, and the old connection's teardown
+        must leave the new session alone. Returns whether a session was closed.
+        """
+        current = self._live.get(session_id)
+        if current is None or (live is not None and current is not live):
+            return False
+        live = self._live.pop(session_id)
+        live.live_request_queue.close()
+        this_task = asyncio.current_task()
+        tasks = [task for task in live.tasks if task is not this_task and not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        aclose = getattr(live.live_events, "aclose", None)
+        if aclose is not None:
+            try:
+                await aclose()
+            except Exception as e:
+                logger.warning("Error closing live events for %s: %s", session_id, e)
+        if live.on_close is not None:
+            try:
+                live.on_close()
+            except Exception as e:
+                logger.warning("Error in close callback for %s: %s", session_id, e)
+
+        self._ended[session_id] = time.monotonic()
+        self._ended.move_to_end(session_id)
+        while len(self._ended) > self.max_ended:
+            evicted_id, _ = self._ended.popitem(last=False)
+            await self.session_service.delete_session(
+                app_name=self.app_name, user_id=evicted_id, session_id=evicted_id
+            )
+            self.evicted += 1
+        return True
+
+    async def close_idle(self):
+        for session_id, live in list(self._live.items()):
+            if live.idle_for() > self.idle_timeout:
+                logger.info("Closing idle session %s", session_id)
+                self.idle_closed += 1
+                await self.close(session_id)
+
+    async def run_reaper(self, interval: float = 30.0):
+        """Periodically closes live sessions that have been idle longer than idle_timeout."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.close_idle()
+            except Exception as e:
+                logger.exception("Session reaper error: %s", e)
+
+    async def close_all(self):
+        for session_id in list(self._live):
+            await self.close(session_id)
+
+    async def gauge(self) -> dict:
+        """Live/idle/ended session counts and the approximate bytes held by stored sessions."""
+        idle = sum(1 for live in self._live.values() if live.idle_for() > self.idle_after)
+        bytes_held = 0
+        for session_id in list(self._live) + list(self._ended):
+            session = await self.session_service.get_session(
+                app_name=self.app_name, user_id=session_id, session_id=session_id
+            )
+            if session is not None:
+                bytes_held += len(session.model_dump_json())
+        return {
+            "live": len(self._live) - idle,
+            "idle": idle,
+            "ended_retained": len(self._ended),
+            "max_live": self.max_live,
+            "bytes_held": bytes_held,
+            "evicted": self.evicted,
+            "idle_closed": self.idle_closed,
+            "rejected": self.rejected,
+            "outbound": {
+                session_id: live.outbound.stats()
+                for session_id, live in self._live.items() if live.outbound is not None
+            },
+        }
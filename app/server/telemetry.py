@@ -0,0 +1,282 @@
+# app/server/telemetry.py
+import json
+import logging
+import os
+import queue
+import secrets
+import threading
+import time
+import numpy as np
+
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text")          # "text" or "json"
+CHUNK_LOG_EVERY = int(os.environ.get("CHUNK_LOG_EVERY", "200"))
+TRACE_FILE = os.environ.get("TRACE_FILE", "")              # empty disables span export
+VAD_RMS_THRESHOLD = float(os.environ.get("VAD_RMS_THRESHOLD", "500"))  # 16-bit PCM RMS counted as speech
+
+
+# LOGGING
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and any `fields` extra."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        return line
+
+
+def configure_logging():
+    """Sets up the app's root logger once (level from LOG_LEVEL, format from LOG_FORMAT)."""
+    root = logging.getLogger("app")
+    if root.handlers:
+        return
+    handler = logging.StreamHandler()
+    if LOG_FORMAT == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(TextFormatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    root.addHandler(handler)
+    root.setLevel(LOG_LEVEL)
+    root.propagate = False
+
+
+def log_event(logger: logging.Logger, level: int, message: str, **fields):
+    """Logs `message` with structured key/value fields, skipping all work if the level is off."""
+    if logger.isEnabledFor(level):
+        logger.log(level, message, extra={"fields": fields})
+
+
+class ChunkSampler:
+    """
+    Counts per-chunk events (audio in/out) and logs one summary every `every` chunks.
+
+    Replaces a print per chunk: the hot path only bumps two integers.
+    """
+
+    def __init__(self, logger: logging.Logger, name: str, every: int = CHUNK_LOG_EVERY, **fields):
+        self.logger = logger
+        self.name = name
+        self.every = max(1, every)
+        self.fields = fields
+        self.count = 0
+        self.bytes = 0
+        self._window_start = time.monotonic()
+
+    def record(self, nbytes: int):
+        self.count += 1
+        self.bytes += nbytes
+        if self.count % self.every == 0 and self.logger.isEnabledFor(logging.DEBUG):
+            now = time.monotonic()
+            elapsed = now - self._window_start
+            self._window_start = now
+            log_event(
+                self.logger, logging.DEBUG, self.name,
+                chunks=self.count, bytes=self.bytes,
+                chunks_per_s=round(self.every / elapsed, 1) if elapsed else None,
+                **self.fields,
+            )
+
+
+# TRACING
+
+class Span:
+    """A timed operation in OpenTelemetry's shape (trace/span ids, ns timestamps, attributes, events)."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "events")
+
+    def __init__(self, name: str, trace_id: str | None = None, parent_id: str | None = None, **attributes):
+        self.name = name
+        self.trace_id = trace_id or secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes
+        self.events = []
+
+    def add_event(self, name: str, timestamp_ns: int | None = None, **attributes):
+        self.events.append({"name": name, "timeUnixNano": timestamp_ns or time.time_ns(), "attributes": attributes})
+
+    def end(self, **attributes):
+        self.attributes.update(attributes)
+        self.end_ns = time.time_ns()
+
+    def to_dict(self) -> dict:
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "attributes": self.attributes,
+            "events": self.events,
+        }
+
+
+class FileSpanExporter:
+    """Appends finished spans as JSON lines to a local file from a background thread."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span):
+        self._queue.put(span.to_dict())
+
+    def _run(self):
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                record = self._queue.get()
+                if record is None:
+                    return
+                f.write(json.dumps(record, default=str) + "\n")
+                if self._queue.empty():
+                    f.flush()
+
+    def shutdown(self):
+        self._queue.put(None)
+        self._thread.join(timeout=2)
+
+
+_exporter = FileSpanExporter(TRACE_FILE) if TRACE_FILE else None
+
+
+def get_exporter() -> FileSpanExporter | None:
+    return _exporter
+
+
+def is_voiced(pcm: bytes, threshold: float = VAD_RMS_THRESHOLD) -> bool:
+    """Energy-based voice activity check for a chunk of 16-bit little-endian PCM."""
+    samples = np.frombuffer(pcm[:len(pcm) - len(pcm) % 2], dtype="<i2").astype(np.float32)
+    return samples.size > 0 and float(np.sqrt(np.mean(samples * samples))) >= threshold
+
+
+class TurnTracer:
+    """
+    One span per conversational turn with child spans for tool batches.
+
+    Marks, as span events: user_input_end, first_model_token, first_audio_out and
+    turn_complete. The derived latencies are stored as span attributes.
+
+    user_input_end is an explicit end of utterance: a text message, or for
+    microphone audio the last voiced chunk once speech is followed by silence
+    (an energy VAD over the chunks). Audio chunks keep streaming while the model
+    answers, so the last chunk received says nothing about when the user stopped
+    talking. Turns without an end of utterance before the first model output (the
+    user still talking) get no time_to_first_* attributes.
+    """
+
+    def __init__(self, session_id: str, exporter: FileSpanExporter | None = None):
+        self.session_id = session_id
+        self.exporter = exporter if exporter is not None else _exporter
+        self.turn = None
+        self._utterance_end_ns = None
+        self._last_voice_ns = None
+        self._speaking = False
+        self._first_token_ns = None
+        self._first_audio_ns = None
+        self._tool_ms = 0.0
+
+    def _ensure_turn(self) -> Span:
+        if self.turn is None:
+            self.turn = Span("turn", session_id=self.session_id)
+            self._first_token_ns = self._first_audio_ns = None
+            self._tool_ms = 0.0
+        return self.turn
+
+    def user_input(self, kind: str, audio: bytes | None = None):
+        """Called for every inbound user message, with the PCM bytes for audio chunks."""
+        if self.exporter is None:
+            return
+        # Only input before the model answers belongs to this turn's request
+        if self.turn is not None and self._first_token_ns is not None:
+            return
+        self._ensure_turn()
+        self.turn.attributes["input_kind"] = kind
+        now = time.time_ns()
+        if kind == "text":
+            # A text message is a complete utterance
+            self._utterance_end_ns = now
+            self._speaking = False
+        elif audio is not None:
+            if is_voiced(audio):
+                # Still talking: an earlier pause was not the end of the utterance
+                self._speaking = True
+                self._last_voice_ns = now
+                self._utterance_end_ns = None
+            elif self._speaking:
+                self._speaking = False
+                self._utterance_end_ns = self._last_voice_ns
+
+    def _mark_user_end(self):
+        if self._utterance_end_ns is not None and not any(e["name"] == "user_input_end" for e in self.turn.events):
+            self.turn.add_event("user_input_end", self._utterance_end_ns)
+
+    def model_text(self):
+        if self.exporter is None or self._first_token_ns is not None:
+            return
+        self._ensure_turn()
+        self._mark_user_end()
+        self._first_token_ns = time.time_ns()
+        self.turn.add_event("first_model_token", self._first_token_ns)
+
+    def model_audio(self):
+        if self.exporter is None or self._first_audio_ns is not None:
+            return
+        self._ensure_turn()
+        self._mark_user_end()
+        self._first_audio_ns = time.time_ns()
+        if self._first_token_ns is None:
+            self._first_token_ns = self._first_audio_ns
+        self.turn.add_event("first_audio_out", self._first_audio_ns)
+
+    def start_tools(self, names: list[str]) -> Span | None:
+        if self.exporter is None:
+            return None
+        turn = self._ensure_turn()
+        self._mark_user_end()
+        return Span("tool_calls", trace_id=turn.trace_id, parent_id=turn.span_id,
+                    session_id=self.session_id, tools=names)
+
+    def end_tools(self, span: Span | None, **attributes):
+        if span is None:
+            return
+        span.end(**attributes)
+        self._tool_ms += (span.end_ns - span.start_ns) / 1e6
+        self.exporter.export(span)
+
+    def turn_complete(self):
+        if self.exporter is None or self.turn is None:
+            return
+        turn = self.turn
+        turn.add_event("turn_complete")
+        user_ns = self._utterance_end_ns
+        if user_ns is not None and self._first_token_ns is not None:
+            turn.attributes["time_to_first_token_ms"] = round((self._first_token_ns - user_ns) / 1e6, 1)
+        if user_ns is not None and self._first_audio_ns is not None:
+            turn.attributes["time_to_first_audio_ms"] = round((self._first_audio_ns - user_ns) / 1e6, 1)
+        turn.end(tool_ms=round(self._tool_ms, 1))
+        self.exporter.export(turn)
+        self.turn = None
+        self._utterance_end_ns = self._last_voice_ns = None
+        self._speaking = False
@@ -0,0 +1,51 @@
+# app/server/text_stream.py
+import hashlib
+
+
+class DeltaTracker:
+    """
+    Turns streamed model text parts into the new text to show, without keeping the turn's text.
+
+    Live models send either incremental parts ("Hel", "lo") or cumulative ones
+    ("Hel", "Hello"). Only the emitted length, a short tail of the emitted text and
+    a running digest are kept. A part counts as cumulative when it is at least as
+    long as what was emitted and holds the remembered tail at the emitted offset. That
+    check is O(tail) per part, where the old startswith + string append grew with the
+    turn length.
+
+    Args:
+        tail_size: Characters of emitted text kept for the cumulative check.
+        verify: Also compare a digest of the whole prefix (O(part) per part, exact).
+    """
+
+    def __init__(self, tail_size: int = 64, verify: bool = False):
+        self.tail_size = tail_size
+        self.verify = verify
+        self.reset()
+
+    def reset(self):
+        """Starts a new turn."""
+        self.emitted = 0
+        self._tail = ""
+        self._digest = hashlib.blake2b(digest_size=16) if self.verify else None
+
+    def _is_cumulative(self, chunk: str) -> bool:
+        if self.emitted == 0 or len(chunk) < self.emitted:
+            return False
+        tail = self._tail
+        if chunk[self.emitted - len(tail):self.emitted] != tail:
+            return False
+        if self._digest is not None:
+            prefix = hashlib.blake2b(chunk[:self.emitted].encode("utf-8"), digest_size=16)
+            return prefix.digest() == self._digest.digest()
+        return True
+
+    def delta(self, chunk: str) -> str:
+        """Returns the part of `chunk` that has not been emitted yet this turn."""
+        delta = chunk[self.emitted:] if self._is_cumulative(chunk) else chunk
+        if delta:
+            self.emitted += len(delta)
+            self._tail = (self._tail + delta)[-self.tail_size:]
+            if self._digest is not None:
+                self._digest.update(delta.encode("utf-8"))
+        return delta
@@ -0,0 +1,247 @@
+# app/server/tool_executor.py
+import asyncio
+import logging
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Execution classes
+FAST = "fast"          # quick native lookups, run inline on the event loop
+BLOCKING = "blocking"  # CPU work or sleeps, run on the blocking thread pool
+IO = "io"              # network / disk / process calls, run on the IO thread pool
+INPUT = "input"        # keyboard, mouse and focus changes, serialized on one input-device worker
+
+TOOL_CLASSES = {
+    # Keyboard / mouse
+    "type_text": INPUT, "type_human": INPUT, "press_key": INPUT, "click_mouse": INPUT,
+    "hotkey": INPUT, "scroll": INPUT, "move_cursor_smooth": INPUT, "run_actions": INPUT,
+
+    # Window control that moves focus or sends hotkeys
+    "focus_window": INPUT, "minimize_window": INPUT, "maximize_window": INPUT,
+    "restore_window": INPUT, "move_window": INPUT, "resize_window": INPUT,
+    "close_window": INPUT, "snap_left": INPUT, "snap_right": INPUT, "snap_top": INPUT,
+    "snap_bottom": INPUT, "tile_two_windows": INPUT, "tile_four_windows": INPUT,
+    "arrange_windows": INPUT, "unfocus_all": INPUT, "minimize_all": INPUT, "restore_all": INPUT,
+
+    # Clipboard and media keys
+    "copy_text": INPUT, "paste_text": INPUT, "volume_up": INPUT, "volume_down": INPUT,
+    "play_pause": INPUT, "next_track": INPUT, "prev_track": INPUT,
+
+    # Quick lookups
+    "list_windows": FAST, "window_exists": FAST, "get_active_window": FAST, "get_windows_snapshot": FAST,
+    "get_window_info": FAST, "get_ram_usage": FAST, "get_battery": FAST, "get_uptime": FAST,
+    "get_cpu_usage": FAST, "get_system_metrics": FAST,
+
+    # Audio / display devices (COM objects live on the input-device thread)
+    "set_volume": INPUT, "get_volume": INPUT, "mute": INPUT, "unmute": INPUT,
+    "set_brightness": INPUT, "increase_brightness": INPUT, "decrease_brightness": INPUT,
+
+    # Network, disk and processes
+    "analyze_screen": IO, "list_folder": IO, "create_folder": IO, "delete_file": IO,
+    "delete_folder": IO, "rename_file": IO, "move_file": IO, "read_file": IO,
+    "write_file": IO, "search_files": IO, "bulk_copy": IO, "bulk_move": IO, "bulk_delete": IO,
+    "list_processes": IO, "kill_process": IO, "is_installed": IO,
+    "open_window": IO, "open_chrome_guest": IO, "open_chrome_profile": IO, "launch_app": IO,
+}
+
+# Tools that only observe state; consecutive ones in a batch run concurrently
+READ_ONLY_TOOLS = frozenset({
+    "analyze_screen", "list_windows", "window_exists", "get_active_window", "get_window_info",
+    "get_windows_snapshot",
+    "get_ram_usage", "get_battery", "get_uptime", "get_cpu_usage", "get_system_metrics", "get_volume",
+    "list_folder", "read_file", "search_files", "list_processes", "is_installed",
+})
+
+
+def plan_batch(names: list[str], read_only: frozenset = READ_ONLY_TOOLS) -> list[list[int]]:
+    """
+    Groups the calls of one model event into waves that run one after another.
+
+    Consecutive read-only calls share a wave and run concurrently; every other call
+    gets a wave of its own, so input-device actions keep their order and a read that
+    follows an action observes its effect.
+    """
+    waves = []
+    for index, name in enumerate(names):
+        if name in read_only and waves and waves[-1][0] is True:
+            waves[-1][1].append(index)
+        else:
+            waves.append((name in read_only, [index]))
+    return [indexes for _, indexes in waves]
+
+
+def tool_registry(tools: list) -> dict:
+    """Maps tool name -> callable for the plain function tools registered on an agent."""
+    return {t.__name__: t for t in tools if callable(t) and hasattr(t, "__name__")}
+
+
+class InputDeviceWorker:
+    """
+    Single thread that owns the keyboard, mouse and audio/display device handles.
+
+    Jobs are queued per session and served round-robin, one job per session per
+    turn, so a session queuing a long typing script cannot starve another session's
+    single click.
+    """
+
+    def __init__(self):
+        self._queues = OrderedDict()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="tool-input", daemon=True)
+        self._thread.start()
+
+    def submit(self, session_id: str, func, *args, **kwargs) -> Future:
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Input device worker is shut down")
+            self._queues.setdefault(session_id, deque()).append((future, func, args, kwargs))
+            self._cond.notify()
+        return future
+
+    def pending(self) -> int:
+        with self._cond:
+            return sum(len(q) for q in self._queues.values())
+
+    def _next_job(self):
+        with self._cond:
+            while not self._queues and not self._closed:
+                self._cond.wait()
+            if not self._queues:
+                return None
+            session_id, queue = self._queues.popitem(last=False)
+            job = queue.popleft()
+            if queue:
+                # Back of the line: other sessions go first
+                self._queues[session_id] = queue
+            return job
+
+    def _run(self):
+        try:
+            import pythoncom
+            pythoncom.CoInitialize()
+        except ImportError:
+            pass
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            future, func, args, kwargs = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class ToolExecutor:
+    """
+    Dispatches tool calls to the executor that matches their execution class.
+
+    FAST tools run inline, BLOCKING and IO tools run on separate thread pools and
+    INPUT tools run on the shared InputDeviceWorker. Each session may only hold
+    `per_session_limit` pool threads at once, so one session's slow tools cannot
+    occupy every worker.
+
+    Args:
+        tools: Mapping of tool name -> callable.
+        classes: Mapping of tool name -> execution class; unknown tools are BLOCKING.
+        io_workers: Size of the IO thread pool.
+        blocking_workers: Size of the blocking thread pool.
+        per_session_limit: Maximum pool threads one session may use concurrently.
+    """
+
+    def __init__(
+        self,
+        tools: dict,
+        classes: dict = TOOL_CLASSES,
+        io_workers: int = 8,
+        blocking_workers: int = 4,
+        per_session_limit: int = 4,
+    ):
+        self.tools = tools
+        self.classes = classes
+        self.per_session_limit = per_session_limit
+        self._pools = {
+            IO: ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="tool-io"),
+            BLOCKING: ThreadPoolExecutor(max_workers=blocking_workers, thread_name_prefix="tool-blocking"),
+        }
+        self._input = InputDeviceWorker()
+        self._session_slots = {}
+
+    def classify(self, name: str) -> str:
+        return self.classes.get(name, BLOCKING)
+
+    def _slots(self, session_id: str) -> asyncio.Semaphore:
+        if session_id not in self._session_slots:
+            self._session_slots[session_id] = asyncio.Semaphore(self.per_session_limit)
+        return self._session_slots[session_id]
+
+    def release_session(self, session_id: str):
+        self._session_slots.pop(session_id, None)
+
+    async def _call(self, session_id: str, name: str, func, args: dict):
+        kind = self.classify(name)
+        if kind == FAST:
+            return func(**args)
+        if kind == INPUT:
+            return await asyncio.wrap_future(self._input.submit(session_id, func, **args))
+        loop = asyncio.get_running_loop()
+        async with self._slots(session_id):
+            return await loop.run_in_executor(self._pools[kind], lambda: func(**args))
+
+    async def run(self, session_id: str, name: str, args: dict | None = None) -> dict:
+        """Runs one tool and returns its response payload; errors are returned, not raised."""
+        func = self.tools.get(name)
+        if func is None:
+            return {"error": f"Unknown tool: {name}"}
+        try:
+            raw_result = await self._call(session_id, name, func, args or {})
+        except Exception as e:
+            logger.exception("Error executing tool %s: %s", name, e)
+            return {"error": str(e)}
+        return raw_result if isinstance(raw_result, dict) else {"result": str(raw_result)}
+
+    async def run_batch(self, session_id: str, calls: list[tuple[str, dict | None]], on_result=None) -> list[dict]:
+        """
+        Runs all tool calls of one model event following plan_batch.
+
+        Args:
+            calls: (name, args) pairs in the order the model issued them.
+            on_result: Optional coroutine `on_result(name, result)` awaited as each call
+                       finishes, before the next wave starts.
+
+        Returns:
+            Response payloads in call order.
+        """
+        results = [None] * len(calls)
+
+        async def run_one(index: int):
+            name, args = calls[index]
+            results[index] = await self.run(session_id, name, args)
+            if on_result is not None:
+                await on_result(name, results[index])
+
+        for wave in plan_batch([name for name, _ in calls]):
+            await asyncio.gather(*(run_one(i) for i in wave))
+        return results
+
+    def stats(self) -> dict:
+        return {
+            "input_pending": self._input.pending(),
+            "sessions": len(self._session_slots),
+        }
+
+    def shutdown(self):
+        self._input.shutdown()
+        for pool in self._pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,96 @@
+"""
+Benchmark of is_installed lookups on a synthetic Start Menu tree.
+
+Compares the previous os.walk + substring scan per call with AppIndex: cold
+build, warm lookups, a lookup after one shortcut was added, and a reload of
+the persisted index. Runs on any OS: it only imports app_index, which needs no
+Windows packages.
+
+    python -m benchmarks.bench_app_index --apps 2000 --lookups 200
+"""
+import argparse
+import os
+import random
+import string
+import tempfile
+import time
+
+from app.computer.tools.app_index import AppIndex
+
+
+def make_tree(root: str, apps: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    names = []
+    folders = [root] + [os.path.join(root, f"Vendor {i}") for i in range(max(1, apps // 20))]
+    for folder in folders:
+        os.makedirs(folder, exist_ok=True)
+    for i in range(apps):
+        words = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9))) for _ in range(rng.randint(1, 3))]
+        name = " ".join(w.capitalize() for w in words) + f" {i}"
+        with open(os.path.join(rng.choice(folders), name + ".lnk"), "wb"):
+            pass
+        names.append(name)
+    return names
+
+
+def previous_is_installed(roots: list[str], app_name: str) -> bool:
+    apps = set()
+    for path in roots:
+        if os.path.exists(path):
+            for root, dirs, files in os.walk(path):
+                for f in files:
+                    if f.endswith(".lnk"):
+                        apps.add(os.path.splitext(f)[0].lower())
+    app_name = app_name.lower()
+    return any(app_name in a for a in list(apps))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apps", type=int, default=2000)
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "Programs")
+        names = make_tree(root, args.apps)
+        queries = [random.Random(i).choice(names).lower() for i in range(args.lookups)]
+        index_path = os.path.join(tmp, "app_index.json")
+
+        start = time.perf_counter()
+        found = sum(previous_is_installed([root], q) for q in queries)
+        walk_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+        start = time.perf_counter()
+        index = AppIndex([root], index_path=index_path, check_interval=0)
+        index.refresh()
+        build_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        hits = sum(bool(index.search(q)) and index.search(q)[0]["score"] >= 0.7 for q in queries)
+        lookup_ms = (time.perf_counter() - start) * 1000 / (2 * len(queries))
+
+        with open(os.path.join(root, "Brand New App.lnk"), "wb"):
+            pass
+        start = time.perf_counter()
+        added = index.search("brand new app")
+        change_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        reloaded = AppIndex([root], index_path=index_path, check_interval=0)
+        reloaded.refresh()
+        reload_ms = (time.perf_counter() - start) * 1000
+
+        typo = index.search(queries[0][:-3] + "x" + queries[0][-2:])
+
+        print(f"shortcuts:                     {args.apps}")
+        print(f"os.walk per is_installed:      {walk_ms:8.2f} ms  ({found}/{len(queries)} found)")
+        print(f"index cold build:              {build_ms:8.2f} ms")
+        print(f"index lookup (mtime checked):  {lookup_ms:8.3f} ms  ({hits}/{len(queries)} found)")
+        print(f"lookup after adding a shortcut:{change_ms:8.2f} ms  (found: {bool(added) and added[0]['name']})")
+        print(f"reload from persisted index:   {reload_ms:8.2f} ms  (dirs listed: {reloaded.stats()['dirs_listed']})")
+        print(f"typo lookup top match:         {typo[0]['name'] if typo else None}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark of the server-side cost of the two websocket audio protocols.
+
+Simulates one session streaming microphone audio (16 kHz) to the server and
+model audio (24 kHz) back, and measures for each protocol how many messages
+per second that produces and how much server CPU time it costs per second of
+audio:
+
+  json    128-sample chunks in, JSON + base64 both ways (previous protocol)
+  binary  512-sample frames in, 4-byte header + raw PCM both ways
+
+    python -m benchmarks.bench_audio_protocol --seconds 60
+"""
+import argparse
+import base64
+import json
+import os
+import time
+
+from app.server.audio_protocol import pack_audio, unpack_frame
+
+MIC_RATE = 16000
+SPEAKER_RATE = 24000
+BYTES_PER_SAMPLE = 2
+
+
+def client_messages(protocol: str, seconds: float) -> list:
+    """Pre-builds what the browser would send, so only server work is timed."""
+    samples = 128 if protocol == "json" else 512
+    count = int(seconds * MIC_RATE / samples)
+    pcm = os.urandom(samples * BYTES_PER_SAMPLE)
+    if protocol == "json":
+        text = json.dumps({"mime_type": "audio/pcm", "data": base64.b64encode(pcm).decode("ascii")})
+        return [text] * count
+    return [pack_audio(seq, pcm) for seq in range(count)]
+
+
+def server_inbound(protocol: str, messages: list) -> int:
+    total = 0
+    if protocol == "json":
+        for raw in messages:
+            message = json.loads(raw)
+            total += len(base64.b64decode(message["data"]))
+    else:
+        for frame in messages:
+            total += len(unpack_frame(frame)[3])
+    return total
+
+
+def server_outbound(protocol: str, seconds: float, part_ms: int = 40) -> int:
+    part = os.urandom(SPEAKER_RATE * part_ms // 1000 * BYTES_PER_SAMPLE)
+    count = int(seconds * 1000 / part_ms)
+    sent = 0
+    for seq in range(count):
+        if protocol == "json":
+            payload = json.dumps({
+                "mime_type": "audio/pcm",
+                "data": base64.b64encode(part).decode("ascii"),
+                "role": "model",
+            })
+        else:
+            payload = pack_audio(seq, part)
+        sent += len(payload)
+    return sent
+
+
+def measure(protocol: str, seconds: float) -> dict:
+    messages = client_messages(protocol, seconds)
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    server_inbound(protocol, messages)
+    cpu1 = time.process_time()
+    wire_out = server_outbound(protocol, seconds)
+    cpu2, wall2 = time.process_time(), time.perf_counter()
+    wire_in = sum(len(m) for m in messages)
+    return {
+        "msgs_per_sec": len(messages) / seconds,
+        "in_cpu_ms_per_s": (cpu1 - cpu0) * 1000 / seconds,
+        "out_cpu_ms_per_s": (cpu2 - cpu1) * 1000 / seconds,
+        "wire_kib_per_s": (wire_in + wire_out) / 1024 / seconds,
+        "throughput_msgs_per_cpu_s": len(messages) / max(cpu1 - cpu0, 1e-9),
+        "wall_s": wall2 - wall0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=60.0, help="seconds of simulated audio per session")
+    args = parser.parse_args()
+
+    print(f"{'protocol':<10}{'msgs/s':>10}{'in CPU ms/s':>14}{'out CPU ms/s':>14}{'wire KiB/s':>12}{'max msgs/CPU-s':>16}")
+    for protocol in ("json", "binary"):
+        r = measure(protocol, args.seconds)
+        print(f"{protocol:<10}{r['msgs_per_sec']:>10.1f}{r['in_cpu_ms_per_s']:>14.3f}{r['out_cpu_ms_per_s']:>14.3f}"
+              f"{r['wire_kib_per_s']:>12.1f}{r['throughput_msgs_per_cpu_s']:>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
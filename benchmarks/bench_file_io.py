@@ -0,0 +1,87 @@
+"""
+Benchmark of read_file/write_file on a large synthetic log file.
+
+Compares the previous whole-file read (and whole-file rewrite for an append)
+with the ranged reads and append/patch writes of file_io. Peak Python memory
+is measured with tracemalloc; memory-mapped pages are not Python allocations.
+
+    python -m benchmarks.bench_file_io --mb 256
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from app.computer.tools.file_io import read_range, write_range
+
+
+def make_log(path: str, mb: int) -> int:
+    line = "2025-01-01T00:00:00.000Z INFO worker-{:04d} processed request id={:08d} in 12.5ms\n"
+    block = "".join(line.format(i % 64, i) for i in range(10_000)).encode()
+    with open(path, "wb") as f:
+        for _ in range(max(1, mb * 1024 * 1024 // len(block))):
+            f.write(block)
+    return os.path.getsize(path)
+
+
+def measure(func) -> tuple[float, float, object]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024), result
+
+
+def previous_read(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return {"status": "success", "content": f.read()}
+
+
+def previous_append(path: str, text: str):
+    with open(path, "r", encoding="utf-8") as f:
+        content = f.read()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content + text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=int, default=256, help="size of the synthetic file in MiB")
+    parser.add_argument("--skip-previous", action="store_true", help="skip the whole-file baselines")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "app.log")
+        size = make_log(path, args.mb)
+        lines = size // 80
+        print(f"file: {size / 1024 / 1024:.0f} MiB, ~{lines:,} lines\n")
+        print(f"{'operation':<34}{'ms':>10}{'peak MiB':>11}{'returned':>12}")
+
+        cases = []
+        if not args.skip_previous:
+            cases += [
+                ("previous read_file (whole file)", lambda: previous_read(path)),
+                ("previous append (read + rewrite)", lambda: previous_append(path, "appended\n")),
+            ]
+        cases += [
+            ("read head=50", lambda: read_range(path, head=50)),
+            ("read tail=50", lambda: read_range(path, tail=50)),
+            ("read lines in the middle (100)", lambda: read_range(path, start_line=lines // 2, end_line=lines // 2 + 99)),
+            ("read 64 KiB at the middle offset", lambda: read_range(path, offset=size // 2, length=65536)),
+            ("read whole file (capped)", lambda: read_range(path)),
+            ("append 1 line", lambda: write_range(path, "appended\n", mode="append")),
+            ("patch 8 bytes in place", lambda: write_range(path, "PATCHED!", mode="patch", offset=size // 2)),
+        ]
+        for name, func in cases:
+            elapsed, peak, result = measure(func)
+            content = result.get("content") if isinstance(result, dict) else None
+            returned = f"{len(content) / 1024:.0f} KiB" if content is not None else "-"
+            print(f"{name:<34}{elapsed:>10.1f}{peak:>11.1f}{returned:>12}")
+            del result, content
+
+
+if __name__ == "__main__":
+    main()
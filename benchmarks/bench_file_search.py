@@ -0,0 +1,101 @@
+"""
+Benchmark of search_files on a generated tree of small text files.
+
+Compares a single-threaded os.walk + read baseline with the parallel scandir
+walker, without an index, building the trigram index from scratch, searching
+with an up-to-date index, and searching after a few files changed.
+
+    python -m benchmarks.bench_file_search --files 100000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from app.computer.tools.file_search import FileSearcher, TrigramIndex
+
+WORDS = (
+    "alpha beta gamma delta epsilon config server client request response handler cache "
+    "index query result error warning module import return value window process thread"
+).split()
+
+
+def make_tree(root: str, files: int, per_dir: int, needles: int, seed: int = 7) -> int:
+    rng = random.Random(seed)
+    hits = set(rng.sample(range(files), needles))
+    for i in range(files):
+        directory = os.path.join(root, f"d{i // (per_dir * 10):03d}", f"s{i // per_dir:05d}")
+        if i % per_dir == 0:
+            os.makedirs(directory, exist_ok=True)
+        lines = [" ".join(rng.choices(WORDS, k=8)) for _ in range(rng.randint(5, 30))]
+        if i in hits:
+            lines.insert(rng.randrange(len(lines)), "TODO: fix the zanzibar_frobnicator timeout")
+        with open(os.path.join(directory, f"file{i:06d}.txt"), "w") as f:
+            f.write("\n".join(lines) + "\n")
+    return len(hits)
+
+
+def baseline(root: str, query: str) -> int:
+    needle, found = query.lower(), 0
+    for dirpath, _, names in os.walk(root):
+        for name in names:
+            with open(os.path.join(dirpath, name), "r", errors="replace") as f:
+                if needle in f.read().lower():
+                    found += 1
+    return found
+
+
+def timed(func) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=100_000, help="number of files to generate")
+    parser.add_argument("--per-dir", type=int, default=100, help="files per directory")
+    parser.add_argument("--needles", type=int, default=25, help="files containing the query")
+    parser.add_argument("--workers", type=int, default=8, help="thread pool size")
+    parser.add_argument("--changed", type=int, default=100, help="files modified before the incremental search")
+    args = parser.parse_args()
+    query = "zanzibar_frobnicator"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "tree")
+        elapsed, expected = timed(lambda: make_tree(root, args.files, args.per_dir, args.needles))
+        print(f"generated {args.files:,} files in {elapsed / 1000:.1f} s, {expected} contain the query\n")
+
+        searcher = FileSearcher(workers=args.workers, max_files=args.files + 1)
+        index = TrigramIndex(os.path.join(tmp, "index.sqlite"))
+        print(f"{'operation':<36}{'ms':>10}{'read':>10}{'hits':>7}")
+
+        elapsed, found = timed(lambda: baseline(root, query))
+        print(f"{'os.walk + read (1 thread)':<36}{elapsed:>10.0f}{args.files:>10}{found:>7}")
+
+        elapsed, (files, _) = timed(lambda: searcher.walk(root))
+        print(f"{'parallel walk only':<36}{elapsed:>10.0f}{'-':>10}{'-':>7}")
+
+        cases = [
+            ("search, no index", None),
+            ("search, building index", index),
+            ("search, index up to date", index),
+        ]
+        for name, idx in cases:
+            elapsed, result = timed(lambda: searcher.search(root, query, max_results=1000, index=idx))
+            print(f"{name:<36}{elapsed:>10.0f}{result['stats']['files_read']:>10}{result['total_matches']:>7}")
+
+        for path, _, _ in random.Random(1).sample(files, args.changed):
+            with open(path, "a") as f:
+                f.write("changed\n")
+        elapsed, result = timed(lambda: searcher.search(root, query, max_results=1000, index=index))
+        name = f"search, {args.changed} files changed"
+        print(f"{name:<36}{elapsed:>10.0f}{result['stats']['files_read']:>10}{result['total_matches']:>7}")
+
+        index.close()
+        print(f"\nindex size: {os.path.getsize(os.path.join(tmp, 'index.sqlite')) / 1024 / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
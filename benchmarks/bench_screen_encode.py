@@ -0,0 +1,105 @@
+"""
+Micro-benchmark for the screenshot encoding pipeline used by analyze_screen.
+
+Renders synthetic desktop-like screenshots (windows, text lines, gradients),
+then reports capture, resize and encode time plus payload size for each
+encoding setting.
+
+    python -m benchmarks.bench_screen_encode --runs 20
+    python -m benchmarks.bench_screen_encode --real   # capture with pyautogui
+"""
+import argparse
+import random
+import statistics
+import time
+from PIL import Image, ImageDraw
+
+from app.computer.tools.screen_encode import EncodeSettings, downscale, encode
+
+SETTINGS = [
+    EncodeSettings(format="PNG", resample="lanczos"),
+    EncodeSettings(format="PNG", resample="bilinear"),
+    EncodeSettings(format="JPEG", quality=85, resample="bilinear"),
+    EncodeSettings(format="JPEG", quality=70, resample="bilinear"),
+    EncodeSettings(format="JPEG", quality=70, resample="nearest"),
+    EncodeSettings(format="WEBP", quality=60, resample="bilinear"),
+    EncodeSettings(format="ADAPTIVE", resample="bilinear", byte_budget=100_000),
+    EncodeSettings(format="JPEG", quality=70, resample="bilinear", max_dimension=768),
+]
+
+
+def synthetic_screenshot(width: int = 2560, height: int = 1440, seed: int = 0) -> Image.Image:
+    rng = random.Random(seed)
+    image = Image.new("RGB", (width, height))
+    draw = ImageDraw.Draw(image)
+    for y in range(0, height, 4):
+        shade = 40 + y * 80 // height
+        draw.rectangle((0, y, width, y + 4), fill=(shade, shade + 20, shade + 60))
+    for _ in range(6):
+        x0, y0 = rng.randrange(0, width - 400), rng.randrange(0, height - 300)
+        x1, y1 = x0 + rng.randrange(400, 1200), y0 + rng.randrange(300, 800)
+        draw.rectangle((x0, y0, x1, y1), fill=(245, 245, 245), outline=(90, 90, 90))
+        draw.rectangle((x0, y0, x1, y0 + 30), fill=(rng.randrange(255), 120, 200))
+        for line_y in range(y0 + 45, y1 - 20, 18):
+            words = " ".join("".join(chr(rng.randrange(97, 123)) for _ in range(rng.randrange(2, 9)))
+                             for _ in range(rng.randrange(3, 14)))
+            draw.text((x0 + 12, line_y), words, fill=(20, 20, 20))
+    draw.rectangle((0, height - 48, width, height), fill=(30, 30, 30))
+    return image
+
+
+_frames = {}
+
+
+def capture(real: bool, seed: int) -> Image.Image:
+    if real:
+        import pyautogui
+        return pyautogui.screenshot()
+    # Synthetic frames are rendered once; "capture" is then a frame-buffer copy
+    if seed not in _frames:
+        _frames[seed] = synthetic_screenshot(seed=seed)
+    return _frames[seed].copy()
+
+
+def run(settings: EncodeSettings, runs: int, real: bool) -> dict:
+    capture_ms, resize_ms, encode_ms, sizes, chosen = [], [], [], [], None
+    for i in range(runs):
+        t0 = time.perf_counter()
+        frame = capture(real, seed=i % 4)
+        t1 = time.perf_counter()
+        downscale(frame, settings)
+        t2 = time.perf_counter()
+        data, _, chosen = encode(frame, settings)
+        t3 = time.perf_counter()
+        capture_ms.append((t1 - t0) * 1000)
+        resize_ms.append((t2 - t1) * 1000)
+        encode_ms.append((t3 - t2) * 1000)
+        sizes.append(len(data))
+    return {
+        "capture_ms": statistics.median(capture_ms),
+        "resize_ms": statistics.median(resize_ms),
+        "encode_ms": statistics.median(encode_ms),
+        "kib": statistics.median(sizes) / 1024,
+        "chosen": f"{chosen.format}/{chosen.quality}" if settings.format == "ADAPTIVE" else "",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--real", action="store_true", help="capture the real screen with pyautogui")
+    args = parser.parse_args()
+    if not args.real:
+        for seed in range(4):
+            capture(False, seed)
+
+    print(f"{'setting':<34}{'capture':>10}{'resize':>10}{'encode':>10}{'KiB':>10}  chosen")
+    for settings in SETTINGS:
+        label = f"{settings.format} q{settings.quality} {settings.resample} {settings.max_dimension}px"
+        r = run(settings, args.runs, args.real)
+        print(f"{label:<34}{r['capture_ms']:>9.1f}ms{r['resize_ms']:>8.1f}ms{r['encode_ms']:>8.1f}ms"
+              f"{r['kib']:>10.1f}  {r['chosen']}")
+
+
+if __name__ == "__main__":
+    main()
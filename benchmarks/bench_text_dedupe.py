@@ -0,0 +1,87 @@
+"""
+Benchmark of agent -> client text de-duplication on long streamed turns.
+
+Compares the previous per-turn string accumulation (startswith + +=) with
+DeltaTracker for incremental and cumulative chunk styles, and checks that
+both produce the same deltas.
+
+    python -m benchmarks.bench_text_dedupe --kib 4 16 64
+"""
+import argparse
+import random
+import string
+import time
+
+from app.server.text_stream import DeltaTracker
+
+
+def make_turn(kib: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    alphabet = string.ascii_lowercase + "     .,"
+    text = "".join(rng.choice(alphabet) for _ in range(kib * 1024))
+    pieces, i = [], 0
+    while i < len(text):
+        n = rng.randint(4, 24)
+        pieces.append(text[i:i + n])
+        i += n
+    return pieces
+
+
+def cumulative(pieces: list[str]) -> list[str]:
+    chunks, text = [], ""
+    for piece in pieces:
+        text += piece
+        chunks.append(text)
+    return chunks
+
+
+def previous_dedupe(chunks: list[str]) -> list[str]:
+    current_turn_text = ""
+    out = []
+    for chunk in chunks:
+        if chunk.startswith(current_turn_text):
+            delta = chunk[len(current_turn_text):]
+        else:
+            delta = chunk
+        if delta:
+            current_turn_text += delta
+            out.append(delta)
+    return out
+
+
+def tracker_dedupe(chunks: list[str]) -> list[str]:
+    tracker = DeltaTracker()
+    out = []
+    for chunk in chunks:
+        delta = tracker.delta(chunk)
+        if delta:
+            out.append(delta)
+    return out
+
+
+def timed(func, chunks, repeat: int) -> tuple[float, list[str]]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(chunks)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--kib", type=int, nargs="+", default=[4, 16, 64], help="turn sizes in KiB")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'turn':>8}{'style':>13}{'parts':>8}{'previous ms':>14}{'tracker ms':>13}{'same':>6}")
+    for kib in args.kib:
+        pieces = make_turn(kib)
+        for style, chunks in (("incremental", pieces), ("cumulative", cumulative(pieces))):
+            old_ms, old = timed(previous_dedupe, chunks, args.repeat)
+            new_ms, new = timed(tracker_dedupe, chunks, args.repeat)
+            print(f"{kib:>6}KiB{style:>13}{len(chunks):>8}{old_ms:>14.2f}{new_ms:>13.2f}{str(old == new):>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,11 @@ function newSessionId() {
 
 let websocket = null;
 let is_audio = false;
+let audioSeq = 0; // Sequence number for outgoing binary audio frames
+
+// Binary audio frame: [kind u8][flags u8][seq u16 LE][16-bit PCM...]
+const AUDIO_HEADER_SIZE = 4;
+const KIND_AUDIO_PCM = 0x01;
 let currentMessageId = null; // Track the current message ID during a conversation turn
 
 // Get DOM elements
@@ -31,9 +36,12 @@ const recordingContainer = document.getElementById("recording-container");
 function connectWebsocket() {
   // Connect websocket
   const sessionId = newSessionId();
-  const wsUrl = "ws://" + window.location.host + "/ws/" + sessionId + "?is_audio=" + is_audio;
+  const wsUrl =
+    "ws://" + window.location.host + "/ws/" + sessionId +
+    "?is_audio=" + is_audio + "&audio_protocol=binary";
   console.log("🔄 Connecting with session:", sessionId);
   websocket = new WebSocket(wsUrl);
+  websocket.binaryType = "arraybuffer";
 
   // Handle connection open
   websocket.onopen = function () {
@@ -49,6 +57,12 @@ function connectWebsocket() {
 
   // Handle incoming messages
   websocket.onmessage = function (event) {
+    // Binary messages carry raw PCM audio
+    if (event.data instanceof ArrayBuffer) {
+      handleAudioFrame(event.data);
+      return;
+    }
+
     // Parse the incoming message
     const message_from_server = JSON.parse(event.data);
     console.log("[AGENT TO CLIENT] ", message_from_server);
@@ -76,21 +90,7 @@ function connectWebsocket() {
 
     // If it's audio, play it
     if (message_from_server.mime_type === "audio/pcm" && audioPlayerNode) {
-      audioPlayerNode.port.postMessage(base64ToArray(message_from_server.data));
-
-      // If we have an existing message element for this turn, add audio icon if needed
-      if (currentMessageId) {
-        const messageElem = document.getElementById(currentMessageId);
-        if (
-          messageElem &&
-          !messageElem.querySelector(".audio-icon") &&
-          is_audio
-        ) {
-          const audioIcon = document.createElement("span");
-          audioIcon.className = "audio-icon";
-          messageElem.prepend(audioIcon);
-        }
-      }
+      playAudio(base64ToArray(message_from_server.data));
     }
 
     // Handle text messages
@@ -199,6 +199,38 @@ function addSubmitHandler() {
   };
 }
 
+// Handle a binary audio frame from the server
+function handleAudioFrame(buffer) {
+  const header = new DataView(buffer, 0, AUDIO_HEADER_SIZE);
+  if (header.getUint8(0) !== KIND_AUDIO_PCM) {
+    console.log("Unsupported binary frame kind:", header.getUint8(0));
+    return;
+  }
+  typingIndicator.classList.add("visible");
+  if (audioPlayerNode) {
+    playAudio(buffer.slice(AUDIO_HEADER_SIZE));
+  }
+}
+
+// Play PCM audio and mark the current message as spoken
+function playAudio(pcmBuffer) {
+  audioPlayerNode.port.postMessage(pcmBuffer, [pcmBuffer]);
+
+  // If we have an existing message element for this turn, add audio icon if needed
+  if (currentMessageId) {
+    const messageElem = document.getElementById(currentMessageId);
+    if (
+      messageElem &&
+      !messageElem.querySelector(".audio-icon") &&
+      is_audio
+    ) {
+      const audioIcon = document.createElement("span");
+      audioIcon.className = "audio-icon";
+      messageElem.prepend(audioIcon);
+    }
+  }
+}
+
 // Send a message to the server as a JSON string
 function sendMessage(message) {
   if (websocket && websocket.readyState == WebSocket.OPEN) {
@@ -317,11 +349,8 @@ function audioRecorderHandler(pcmData) {
   // Only send data if we're still recording
   if (!isRecording) return;
 
-  // Send the pcm data as base64
-  sendMessage({
-    mime_type: "audio/pcm",
-    data: arrayBufferToBase64(pcmData),
-  });
+  // Send the pcm data as a binary frame
+  sendAudioFrame(pcmData);
 
   // Log every few samples to avoid flooding the console
   if (Math.random() < 0.01) {
@@ -330,13 +359,15 @@ function audioRecorderHandler(pcmData) {
   }
 }
 
-// Encode an array buffer with Base64
-function arrayBufferToBase64(buffer) {
-  let binary = "";
-  const bytes = new Uint8Array(buffer);
-  const len = bytes.byteLength;
-  for (let i = 0; i < len; i++) {
-    binary += String.fromCharCode(bytes[i]);
-  }
-  return window.btoa(binary);
+// Send PCM data as a binary frame with a 4-byte header
+function sendAudioFrame(pcmData) {
+  if (!websocket || websocket.readyState !== WebSocket.OPEN) return;
+  const frame = new Uint8Array(AUDIO_HEADER_SIZE + pcmData.byteLength);
+  const header = new DataView(frame.buffer, 0, AUDIO_HEADER_SIZE);
+  header.setUint8(0, KIND_AUDIO_PCM);
+  header.setUint8(1, 0);
+  header.setUint16(2, audioSeq, true);
+  audioSeq = (audioSeq + 1) & 0xffff;
+  frame.set(new Uint8Array(pcmData), AUDIO_HEADER_SIZE);
+  websocket.send(frame.buffer);
 }
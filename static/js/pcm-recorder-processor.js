@@ -1,15 +1,36 @@
 class PCMProcessor extends AudioWorkletProcessor {
-  constructor() {
+  constructor(options) {
     super();
+
+    // Accumulate render quanta (128 samples) into larger frames before posting.
+    // 512 samples = 32 ms at 16 kHz.
+    const frameSize =
+      (options && options.processorOptions && options.processorOptions.frameSize) || 512;
+    this.frame = new Float32Array(frameSize);
+    this.offset = 0;
   }
 
   process(inputs, outputs, parameters) {
     if (inputs.length > 0 && inputs[0].length > 0) {
       // Use the first channel
       const inputChannel = inputs[0][0];
-      // Copy the buffer to avoid issues with recycled memory
-      const inputCopy = new Float32Array(inputChannel);
-      this.port.postMessage(inputCopy);
+      let read = 0;
+      while (read < inputChannel.length) {
+        const count = Math.min(
+          inputChannel.length - read,
+          this.frame.length - this.offset
+        );
+        this.frame.set(inputChannel.subarray(read, read + count), this.offset);
+        this.offset += count;
+        read += count;
+
+        if (this.offset === this.frame.length) {
+          // Transfer the full frame and start a fresh one
+          this.port.postMessage(this.frame, [this.frame.buffer]);
+          this.frame = new Float32Array(this.frame.length);
+          this.offset = 0;
+        }
+      }
     }
     return true;
   }
@@ -0,0 +1,64 @@
+import os
+
+from app.computer.tools.bulk_ops import bulk_delete, bulk_move, expand
+
+
+def make_tree(root):
+    os.makedirs(root / "src" / "sub")
+    (root / "src" / "a.txt").write_text("a")
+    (root / "src" / "sub" / "b.txt").write_text("b")
+    return root / "src"
+
+
+def test_recursive_glob_selects_contents_not_the_folder(tmp_path):
+    src = make_tree(tmp_path)
+    paths = expand([str(src / "**")])
+    assert str(src) not in paths
+    assert sorted(paths) == sorted([str(src / "a.txt"), str(src / "sub")])
+
+
+def test_delete_recursive_glob_keeps_the_folder(tmp_path):
+    src = make_tree(tmp_path)
+    result = bulk_delete([str(src / "**")])
+    assert result["status"] == "success"
+    assert result["failed"] == 0
+    assert src.is_dir()
+    assert os.listdir(src) == []
+
+
+def test_move_recursive_glob_moves_contents(tmp_path):
+    src = make_tree(tmp_path)
+    result = bulk_move([str(src / "**")], str(tmp_path / "dst"))
+    assert result["succeeded"] == 2
+    assert src.is_dir()
+    assert sorted(os.listdir(tmp_path / "dst")) == ["a.txt", "sub"]
+
+
+def test_nested_path_dropped_when_a_sibling_sorts_between(tmp_path):
+    src = tmp_path / "src"
+    os.makedirs(src / "b")
+    os.makedirs(src / "b-c")
+    (src / "b" / "x").write_text("x")
+    paths = expand([str(src / "b"), str(src / "b-c"), str(src / "b" / "x")])
+    assert paths == [str(src / "b"), str(src / "b-c")]
+
+
+def test_move_into_own_subfolder_is_rejected(tmp_path):
+    src = make_tree(tmp_path)
+    result = bulk_move([str(src)], str(src / "sub"))
+    assert result["failed"] == 1
+    assert "into itself" in result["errors"][0]["error"]
+    assert (src / "a.txt").exists()
+
+
+def test_overwrite_target_holding_another_source_is_rejected(tmp_path):
+    os.makedirs(tmp_path / "a" / "x")
+    os.makedirs(tmp_path / "z" / "x")
+    (tmp_path / "z" / "x" / "f.txt").write_text("f")
+    sources = [str(tmp_path / "a" / "x"), str(tmp_path / "z" / "x" / "f.txt")]
+    dry = bulk_move(sources, str(tmp_path / "z"), overwrite=True, dry_run=True)
+    assert [e["error"] for e in dry["errors"]] == ["Target overlaps another source"]
+    result = bulk_move(sources, str(tmp_path / "z"), overwrite=True)
+    assert result["failed"] == 1
+    assert (tmp_path / "z" / "f.txt").read_text() == "f"
+    assert (tmp_path / "a" / "x").is_dir()
@@ -0,0 +1,72 @@
+from app.computer.tools.launch import start_app, wait_for_window
+
+
+class FakeProcesses:
+    def __init__(self, pid=100, children=()):
+        self.pid = pid
+        self.children = set(children)
+        self.spawned = []
+
+    def spawn(self, path):
+        self.spawned.append(path)
+        return self.pid
+
+    def related_pids(self, pid):
+        return {pid} | self.children if pid is not None else set()
+
+
+class FakeWindows:
+    """Lists `initial` windows, plus `later` once it has been listed `appear_after` times."""
+
+    def __init__(self, initial=(), later=(), appear_after=0):
+        self.initial = list(initial)
+        self.later = list(later)
+        self.appear_after = appear_after
+        self.calls = 0
+
+    def list_windows(self):
+        self.calls += 1
+        return self.initial + (self.later if self.calls > self.appear_after else [])
+
+
+def make_app(tmp_path, name="Notepad.exe"):
+    path = tmp_path / name
+    path.write_text("")
+    return str(path)
+
+
+def test_window_of_a_child_process_wins_over_a_title_match():
+    windows = FakeWindows(later=[(1, "Notepad", 999), (2, "Untitled", 101)], appear_after=2)
+    window, polls = wait_for_window(windows, FakeProcesses(children=[101]), 100, "Notepad", set(), timeout=1.0, initial_delay=0.001)
+    assert window == (2, "Untitled", 101)
+    assert polls == 3
+
+
+def test_start_app_reports_the_new_window(tmp_path):
+    path = make_app(tmp_path)
+    processes = FakeProcesses()
+    windows = FakeWindows(initial=[(1, "Other", 5)], later=[(7, "Untitled - Notepad", 100)], appear_after=2)
+    result = start_app(path, processes, windows, timeout=1.0)
+    assert processes.spawned == [path]
+    assert result["status"] == "success"
+    assert result["window_found"] is True
+    assert result["window"] == {"handle": 7, "title": "Untitled - Notepad", "new": True}
+    assert "time_to_window_ms" in result
+
+
+def test_start_app_falls_back_to_an_open_window(tmp_path):
+    path = make_app(tmp_path)
+    windows = FakeWindows(initial=[(3, "Notepad", 42)])
+    result = start_app(path, FakeProcesses(), windows, timeout=0.05)
+    assert result["status"] == "success"
+    assert result["window_found"] is True
+    assert result["window"]["new"] is False
+
+
+def test_start_app_without_a_window_is_an_error(tmp_path):
+    path = make_app(tmp_path)
+    result = start_app(path, FakeProcesses(), FakeWindows(initial=[(1, "Other", 5)]), timeout=0.05)
+    assert result["status"] == "error"
+    assert result["window_found"] is False
+    assert result["window"] is None
+    assert result["pid"] == 100
@@ -0,0 +1,68 @@
+import pytest
+
+from app.computer.tools.layout import InMemoryWindowManager, Rect, apply_layout, layout_rects
+
+AREA = Rect(0, 0, 1920, 1080)
+
+
+def test_quadrants_are_in_reading_order():
+    assert layout_rects("quadrants", AREA, 4) == [
+        Rect(0, 0, 960, 540),
+        Rect(960, 0, 960, 540),
+        Rect(0, 540, 960, 540),
+        Rect(960, 540, 960, 540),
+    ]
+
+
+def test_halves_with_one_window_uses_the_left_half():
+    assert layout_rects("halves", AREA, 1) == [Rect(0, 0, 960, 1080)]
+
+
+def test_grid_widens_the_last_row():
+    assert layout_rects("grid", AREA, 3) == [
+        Rect(0, 0, 960, 540),
+        Rect(960, 0, 960, 540),
+        Rect(0, 540, 1920, 540),
+    ]
+
+
+def test_gap_surrounds_and_separates_cells():
+    assert layout_rects("columns", Rect(0, 0, 100, 50), 2, gap=10) == [
+        Rect(10, 10, 35, 30),
+        Rect(55, 10, 35, 30),
+    ]
+
+
+def test_too_many_windows_for_a_layout_is_rejected():
+    with pytest.raises(ValueError, match="2 cell"):
+        layout_rects("halves", AREA, 3)
+    with pytest.raises(ValueError, match="Unknown layout"):
+        layout_rects("tiles", AREA, 1)
+
+
+def test_apply_layout_moves_all_windows_in_one_batch():
+    manager = InMemoryWindowManager([AREA], {1: Rect(5, 5, 100, 100), 2: Rect(50, 50, 100, 100)})
+    placed = apply_layout(manager, [2, 1], "halves")
+    assert manager.batches == 1
+    assert manager.windows[2] == Rect(0, 0, 960, 1080)
+    assert manager.windows[1] == Rect(960, 0, 960, 1080)
+    assert all(p["exact"] for p in placed)
+
+
+def test_apply_layout_reports_windows_held_at_their_minimum_size():
+    manager = InMemoryWindowManager([AREA], {1: Rect(0, 0, 100, 100)}, min_sizes={1: (1000, 0)})
+    placed = apply_layout(manager, [1], "left")
+    assert placed[0]["target"]["width"] == 960
+    assert placed[0]["achieved"]["width"] == 1000
+    assert not placed[0]["exact"]
+
+
+def test_apply_layout_uses_the_first_windows_monitor():
+    second = Rect(1920, 0, 1280, 1024)
+    manager = InMemoryWindowManager([AREA, second], {1: Rect(2000, 100, 400, 300)})
+    apply_layout(manager, [1], "full")
+    assert manager.windows[1] == second
+    with pytest.raises(ValueError, match="Monitor 5"):
+        apply_layout(manager, [1], "full", monitor=5)
+    with pytest.raises(ValueError, match="No windows"):
+        apply_layout(manager, [], "full")
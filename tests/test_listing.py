@@ -0,0 +1,32 @@
+import pytest
+
+from app.computer.tools.listing import DirectoryLister
+
+
+def make_files(root, count):
+    for i in range(count):
+        (root / f"f{i:02}.txt").write_text("x")
+
+
+def page_through(lister, path, limit):
+    names, cursor = [], ""
+    while True:
+        page = lister.list(str(path), limit=limit, cursor=cursor)
+        names += [e["path"] for e in page["entries"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            return names
+
+
+@pytest.mark.parametrize("limit", [-3, 0])
+def test_non_positive_limit_pages_one_entry_at_a_time(tmp_path, limit):
+    make_files(tmp_path, 5)
+    lister = DirectoryLister()
+    assert lister.list(str(tmp_path), limit=limit)["count"] == 1
+    assert page_through(lister, tmp_path, limit) == [f"f{i:02}.txt" for i in range(5)]
+
+
+def test_pages_cover_every_entry_once(tmp_path):
+    make_files(tmp_path, 25)
+    names = page_through(DirectoryLister(), tmp_path, 10)
+    assert names == sorted(names) and len(set(names)) == 25
@@ -0,0 +1,61 @@
+import pytest
+
+from app.computer.tools.text_entry import HUMAN, KEYS, PASTE, RecordingBackend, TextEntry
+
+
+def make_entry(backend, **kwargs):
+    slept = []
+    entry = TextEntry(backend, sleep=slept.append, **kwargs)
+    return entry, slept
+
+
+def test_auto_types_short_text_and_pastes_long_text():
+    entry, _ = make_entry(RecordingBackend(), paste_threshold=10)
+    assert entry.choose_mode("short") == KEYS
+    assert entry.choose_mode("x" * 10) == PASTE
+    assert entry.choose_mode("short", HUMAN) == HUMAN
+    with pytest.raises(ValueError):
+        entry.choose_mode("short", "fast")
+
+
+def test_keys_sends_text_in_chunks():
+    backend = RecordingBackend()
+    entry, _ = make_entry(backend, chunk_size=4)
+    result = entry.enter("hello world", KEYS)
+    assert result["mode"] == KEYS
+    assert [payload for _, kind, payload in backend.events] == ["hell", "o wo", "rld"]
+
+
+def test_paste_restores_the_previous_clipboard():
+    backend = RecordingBackend(clipboard="saved")
+    entry, slept = make_entry(backend, restore_delay=0.2)
+    result = entry.enter("pasted text", PASTE)
+    assert result["mode"] == PASTE
+    assert backend.typed() == "pasted text"
+    assert backend.clipboard == "saved"
+    assert slept == [0.2]
+
+
+def test_non_ascii_is_pasted_on_an_ascii_only_backend():
+    backend = RecordingBackend(ascii_only=True)
+    entry, _ = make_entry(backend)
+    assert entry.enter("café", KEYS)["mode"] == PASTE
+    assert entry.enter("naïve", HUMAN)["mode"] == PASTE
+    assert backend.typed() == "cafénaïve"
+    assert not any(kind == "text" for _, kind, _ in backend.events)
+
+
+def test_human_mode_stays_within_its_budget():
+    backend = RecordingBackend()
+    entry, slept = make_entry(backend)
+    text = "The quick brown fox jumps over the lazy dog. " * 4
+    assert entry.enter(text, HUMAN, budget=2.0, seed=1)["mode"] == HUMAN
+    assert backend.typed() == text
+    assert sum(slept) == pytest.approx(2.0)
+    assert all(pause >= 0 for pause in slept)
+
+
+def test_human_budget_is_capped_per_character():
+    entry, slept = make_entry(RecordingBackend())
+    entry.enter("hi there", HUMAN, budget=10.0, seed=2)
+    assert sum(slept) == pytest.approx(0.06 * len("hi there"))